@@ -1,41 +1,433 @@
+import numpy as np
+
 from src.map.pheromone_matrix import PheromoneMatrix
-from src.algorithm.colony import Colony
-from src.map.graph import Graph
+from src.algorithm.colony import Colony, nearest_neighbour_tour, top_tours
+from src.algorithm.parallel_colony import ParallelColony
+from src.algorithm.choice_info import ChoiceInfo
+from src.algorithm.local_search import improve_tours
+from src.algorithm.timing import PhaseTimers
+from src.algorithm.stagnation import lambda_branching, tour_diversity
+from src.map.graph import Graph, MATRIX_FREE_THRESHOLD
 
 
 class AcoEngine:
-    def __init__(self, alpha, beta, evaporation_rate, num_vertices, num_ants, graph = None):
+    def __init__(self, alpha, beta, evaporation_rate, num_vertices, num_ants, graph = None, candidate_list_size = 15, construction = "batch", workers = 1, local_search = None, local_search_neighbours = 10, variant = "as", mmas_p_best = 0.05, mmas_global_best_every = 5, mmas_stagnation_limit = 100, acs_q0 = 0.9, acs_xi = 0.1, symmetric = False, bounds = None, seed = None, timing = False, timers = None, stagnation_policy = None, stagnation_limit = None, stagnation_branching = None, stagnation_diversity = None, branching_lambda = 0.05, top_k = 9, matrix_free = None, matrix_free_threshold = MATRIX_FREE_THRESHOLD, distance_cache = None):
 
         self.alpha = alpha
         self.beta = beta
         self.evaporation_rate = evaporation_rate
         self.num_ants = num_ants
+        self.candidate_list_size = candidate_list_size
+        # "batch" advances all ants together; "ants" runs the per-Ant reference path
+        self.construction = construction
+        self.workers = workers
+        # None, "all" (every tour) or "best" (iteration-best tour only)
+        self.local_search = local_search
+        self.local_search_neighbours = local_search_neighbours
+        self._neighbour_lists = None
+        self._neighbour_key = None
+
+        # "as" - every ant deposits 1/d per edge; "mmas" - MAX-MIN: best tour only, bounded pheromones;
+        # "acs" - Ant Colony System: greedy choice with probability q0, local decay, global-best update only
+        self.variant = variant
+        if variant == "acs" and (construction != "batch" or workers > 1):
+            raise ValueError("ACS local updates need the serial batched construction")
+        self.mmas_p_best = mmas_p_best
+        self.mmas_global_best_every = mmas_global_best_every
+        self.mmas_stagnation_limit = mmas_stagnation_limit
+        self.tau_min = 0.0
+        self.tau_max = float('inf')
+        self.acs_q0 = acs_q0
+        self.acs_xi = acs_xi
+        self.tau0 = 1.0
+
+        self.iteration = 0
+        self.iterations_since_improvement = 0
+        # the same count for the stagnation policy, which MAX-MIN's own trail restarts leave alone
+        self.idle_iterations = 0
+        # the iteration's top_k shortest (tour, length) pairs, shortest first - published once for the UI panels
+        self.top_k = top_k
+        self.top_tours = []
+
+        # convergence signals, refreshed every iteration
+        self.convergence = {"branching": None, "diversity": None, "idle_iterations": 0}
+        self.branching_lambda = branching_lambda
+        # when any configured signal crosses its threshold (idle iterations >= limit, branching or
+        # diversity <= threshold): None - only report; "stop" - set stopped; "reinitialize" - reset the
+        # pheromones, keep the best tour; "restart" - begin a fresh run, the old best kept in best_before_restart
+        self.stagnation_policy = stagnation_policy
+        self.stagnation_limit = stagnation_limit
+        self.stagnation_branching = stagnation_branching
+        self.stagnation_diversity = stagnation_diversity
+        self.stagnation_events = 0
+        self.stopped = False
+        self.best_before_restart = None
+
+        # per-phase timers (construction, local_search, evaporation, deposit, stats, ...); off unless timing=True.
+        # Passing an existing PhaseTimers carries its subscribers over to a rebuilt engine
+        self.timers = timers if timers is not None else PhaseTimers(enabled=timing)
 
-        self.pheromone_matrix = PheromoneMatrix(num_vertices, evaporation_rate)
+        # condensed upper-triangle storage for distances and pheromones (half the memory, one trail per edge)
+        self.symmetric = symmetric
 
-        self.colony = Colony(num_ants)
+        # matrix-free: distances computed on demand and trails kept for candidate edges only, so memory
+        # grows with n * candidate_list_size rather than n^2. None switches it on from matrix_free_threshold
+        # vertices when the run can use it (candidate lists, a single worker)
+        size = graph.num_vertices if graph is not None else num_vertices
+        if matrix_free is None:
+            matrix_free = size >= matrix_free_threshold and candidate_list_size is not None and workers == 1
+        if matrix_free and (candidate_list_size is None or workers > 1):
+            raise ValueError("matrix-free mode needs candidate lists and a single worker")
+        self.matrix_free = matrix_free
+
+        # one seed drives both the random layout and the ants, for reproducible batch runs
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+
+        if workers > 1:
+            self.colony = ParallelColony(num_ants, workers, rng)
+        else:
+            self.colony = Colony(num_ants, rng)
+        self.choice_info = ChoiceInfo()
 
         if graph is None:
-            self.graph = Graph(num_vertices)
+            # distance_cache (a DistanceCache) maps distances and neighbour lists computed by earlier runs
+            self.graph = Graph(num_vertices, symmetric, bounds, rng, matrix_free, distance_cache)
+            self.graph.set_candidate_list_size(candidate_list_size)
         else:
             self.graph = graph
+            self.graph.symmetric = symmetric
+            self.graph.matrix_free = matrix_free
+            if distance_cache is not None:
+                self.graph.distance_cache = distance_cache
+            self.graph.candidate_list_size = candidate_list_size
             self.graph.rebuild()
 
+        # 2-opt reverses tour segments, which changes their length unless d is symmetric
+        if local_search and not self.graph.is_symmetric():
+            raise ValueError("local search needs a symmetric distance matrix")
+
+        if matrix_free:
+            self.pheromone_matrix = PheromoneMatrix(
+                self.graph.num_vertices, evaporation_rate, symmetric=symmetric, candidates=self.graph.candidate_lists
+            )
+        else:
+            self.pheromone_matrix = PheromoneMatrix(self.graph.num_vertices, evaporation_rate, symmetric=symmetric)
+
+        if self.variant == "mmas":
+            self.init_mmas()
+        elif self.variant == "acs":
+            self.init_acs()
 
 
     def run_iteration(self):
+        timers = self.timers
+        started = t = timers.start()
+
         self.pheromone_matrix.reset_pending()
+        self.pheromone_matrix.evaporation_rate = self.evaporation_rate
+
+        # rebuilt only when alpha/beta (e.g. sidebar sliders) or the pheromones changed since last iteration
+        choice_info = self.choice_info.get(self.graph, self.pheromone_matrix, self.alpha, self.beta)
+        t = timers.lap("choice_info", t)
+
+        tours, lengths, deltas = self.construct(choice_info)
+        t = timers.lap("construction", t)
+
+        if self.local_search and tours.size:
+            self.improve(tours, lengths)
+            # improved tours walk different edges, so their deposits are rederived
+            deltas = None
+            t = timers.lap("local_search", t)
+
+        previous_best = self.graph.best_path_length
+        self.colony.record_paths(self.graph, tours, lengths)
+        self.top_tours = top_tours(tours, lengths, self.top_k)
+
+        self.iteration += 1
+        if self.graph.best_path_length < previous_best:
+            self.iterations_since_improvement = 0
+            self.idle_iterations = 0
+        else:
+            self.iterations_since_improvement += 1
+            self.idle_iterations += 1
+        t = timers.lap("stats", t)
+
+        if self.variant == "mmas":
+            self.update_mmas(tours, lengths)
+        elif self.variant == "acs":
+            self.update_acs()
+        else:
+            self.pheromone_matrix.evaporate()
+            t = timers.lap("evaporation", t)
+            self.colony.deposit_tours(self.graph, self.pheromone_matrix, tours, deltas)
+            self.pheromone_matrix.deposit_pending()
+            timers.lap("deposit", t)
+
+        t = timers.start()
+        stagnated = self.check_convergence(tours)
+        timers.lap("convergence", t)
+
+        t = timers.start()
+        stats = self.length_stats(lengths)
+        stats.update(self.convergence, stagnated=stagnated)
+        timers.lap("stats", t)
+
+        timers.lap("iteration", started)
+        timers.end_iteration(self.iteration)
+
+        return stats
+
+    def check_convergence(self, tours):
+        """Refresh the convergence signals and apply the stagnation policy; True when it triggered."""
+        neighbour_lists = self.get_neighbour_lists()
+        self.convergence = {
+            "branching": lambda_branching(
+                self.pheromone_matrix.raw, neighbour_lists, self.branching_lambda, self.pheromone_matrix.raw_floor
+            ),
+            "diversity": tour_diversity(tours, self.graph.num_vertices),
+            "idle_iterations": self.idle_iterations,
+        }
+
+        if not self.is_stagnating():
+            return False
+
+        self.stagnation_events += 1
+        if self.stagnation_policy == "stop":
+            self.stopped = True
+        elif self.stagnation_policy == "reinitialize":
+            self.reinitialize_pheromones()
+        elif self.stagnation_policy == "restart":
+            self.restart()
+
+        return True
+
+    def is_stagnating(self):
+        signals = self.convergence
+        return (
+            (self.stagnation_limit is not None and signals["idle_iterations"] >= self.stagnation_limit)
+            or (self.stagnation_branching is not None and signals["branching"] <= self.stagnation_branching)
+            or (self.stagnation_diversity is not None and signals["diversity"] <= self.stagnation_diversity)
+        )
+
+    def reinitialize_pheromones(self):
+        """Reset every trail to the variant's initial level; the best tour is kept."""
+        self.pheromone_matrix.reset(self.initial_level())
+        self.iterations_since_improvement = 0
+        self.idle_iterations = 0
+
+    def restart(self):
+        """Start a fresh run on the same graph, keeping the best tour so far in best_before_restart."""
+        if self.graph.best_path is not None and (
+            self.best_before_restart is None or self.graph.best_path_length < self.best_before_restart[1]
+        ):
+            self.best_before_restart = (list(self.graph.best_path), self.graph.best_path_length)
+
+        self.graph.best_path = None
+        self.graph.best_path_length = float('inf')
+        self.top_tours = []
+        self.iteration = 0
+        self.iterations_since_improvement = 0
+        self.idle_iterations = 0
+
+        if self.variant == "mmas":
+            self.init_mmas()
+        elif self.variant == "acs":
+            self.init_acs()
+        else:
+            self.pheromone_matrix.reset(1.0)
+
+    def construct(self, choice_info):
+        if self.variant == "acs":
+            return self.colony.construct_batched(self.graph, choice_info, self.acs_q0, self.acs_local_update)
+
+        if self.construction == "batch":
+            return self.colony.construct_batched(self.graph, choice_info)
+
+        all_paths = self.colony.find_paths(
+            self.graph, self.pheromone_matrix, self.alpha, self.beta, choice_info, deposit=False
+        )
+        tours = np.array([path for path, _ in all_paths], dtype=np.intp).reshape(len(all_paths), -1)
+        lengths = np.array([length for _, length in all_paths], dtype=np.float64)
 
-        all_paths = self.colony.find_paths(self.graph, self.pheromone_matrix, self.alpha, self.beta)
+        return tours, lengths, None
 
-        self.pheromone_matrix.apply_pending()
+    def improve(self, tours, lengths):
+        """2-opt the iteration's tours in place (all of them, or only the iteration-best)."""
+        if self.local_search == "best":
+            indices = [int(np.argmin(lengths))]
+        else:
+            indices = None
+
+        improve_tours(tours, lengths, self.graph.distance_matrix, self.get_neighbour_lists(), indices)
+
+    def init_mmas(self):
+        """Start every edge at tau_max estimated from a nearest-neighbour tour."""
+        if self.graph.num_vertices < 2:
+            return
+
+        tour = nearest_neighbour_tour(self.graph.distance_matrix, index=self.graph.spatial_index())
+        length = float(self.graph.distance_matrix[tour[:-1], tour[1:]].sum())
+
+        self.tau_min, self.tau_max = self.mmas_bounds(length)
+        self.pheromone_matrix.reset(self.tau_max)
+        self.pheromone_matrix.set_bounds(self.tau_min, self.tau_max)
+
+    def mmas_bounds(self, best_length):
+        rho = max(1.0 - self.evaporation_rate, 1e-6)
+        tau_max = 1.0 / (rho * max(best_length, 1e-12))
+
+        n = self.graph.num_vertices
+        avg = n / 2.0
+        p_dec = self.mmas_p_best ** (1.0 / max(n, 1))
+
+        if avg > 1.0:
+            tau_min = tau_max * (1.0 - p_dec) / ((avg - 1.0) * p_dec)
+        else:
+            tau_min = tau_max / (2.0 * max(n, 1))
+
+        return min(tau_min, tau_max), tau_max
+
+    def update_mmas(self, tours, lengths):
+        """Evaporate, deposit 1/L along a single best tour, all within [tau_min, tau_max]."""
+        t = self.timers.start()
+        # the matrix applies the bounds lazily: evaporation stops at tau_min, deposits are capped at tau_max
+        self.tau_min, self.tau_max = self.mmas_bounds(self.graph.best_path_length)
+        self.pheromone_matrix.set_bounds(self.tau_min, self.tau_max)
+        t = self.timers.lap("bounds", t)
+
+        self.pheromone_matrix.evaporate()
+        t = self.timers.lap("evaporation", t)
+
+        best_tour = None
+        if self.graph.best_path is not None and (self.iteration % self.mmas_global_best_every == 0 or not len(lengths)):
+            best_tour = np.asarray(self.graph.best_path, dtype=np.intp)
+            best_length = self.graph.best_path_length
+        elif len(lengths):
+            index = int(np.argmin(lengths))
+            best_tour, best_length = tours[index], float(lengths[index])
+
+        if best_tour is not None and best_tour.size > 1:
+            rows, cols = best_tour[:-1], best_tour[1:]
+            self.pheromone_matrix.add_pending_edges(rows, cols, np.full(len(rows), 1.0 / max(best_length, 1e-12)))
+
+        self.pheromone_matrix.deposit_pending()
+        self.timers.lap("deposit", t)
+
+        if self.iterations_since_improvement >= self.mmas_stagnation_limit:
+            # stagnated - restart the trails at the upper bound
+            self.pheromone_matrix.reset(self.tau_max)
+            self.iterations_since_improvement = 0
+
+    def init_acs(self):
+        """Start every edge at tau0 = 1 / (n * L_nn)."""
+        if self.graph.num_vertices < 2:
+            return
+
+        tour = nearest_neighbour_tour(self.graph.distance_matrix, index=self.graph.spatial_index())
+        length = float(self.graph.distance_matrix[tour[:-1], tour[1:]].sum())
+
+        self.tau0 = 1.0 / (self.graph.num_vertices * max(length, 1e-12))
+        self.pheromone_matrix.reset(self.tau0)
 
-        self.get_stats(all_paths)
+    def acs_local_update(self, rows, cols):
+        """Decay the edges just walked towards tau0 so the following ants diversify."""
+        self.pheromone_matrix.local_update(rows, cols, self.acs_xi, self.tau0)
+        self.choice_info.get(self.graph, self.pheromone_matrix, self.alpha, self.beta)
+
+    def update_acs(self):
+        """Global update on the global-best tour only - O(n) cells, no evaporation sweep."""
+        if self.graph.best_path is None or len(self.graph.best_path) < 2:
+            return
+
+        t = self.timers.start()
+        best_tour = np.asarray(self.graph.best_path, dtype=np.intp)
+        rows, cols = best_tour[:-1], best_tour[1:]
+        rho = 1.0 - self.evaporation_rate
+
+        self.pheromone_matrix.global_update(rows, cols, rho, 1.0 / max(self.graph.best_path_length, 1e-12))
+        self.choice_info.get(self.graph, self.pheromone_matrix, self.alpha, self.beta)
+        self.timers.lap("deposit", t)
+
+    def add_vertices(self, xs, ys):
+        """
+        Insert vertices into the running search: O(n) per vertex, learned trails and the repaired
+        best tour are kept. Each new row is seeded from its nearest existing vertex's trails.
+        """
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        if xs.shape != ys.shape:
+            raise ValueError("xs and ys must have the same length")
+
+        # one at a time, so candidate-edge trails follow each update of the candidate lists
+        indices = []
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            index = self.graph.add_vertex(x, y)
+            self.pheromone_matrix.add_vertex(self.seed_levels(index), self.graph.candidate_lists)
+            indices.append(index)
+        # the iteration's tours no longer cover every vertex
+        self.top_tours = []
+
+        return np.array(indices, dtype=np.intp)
+
+    def remove_vertices(self, indices):
+        """Swap-remove vertices from the running search (see Graph.remove_vertex), keeping every other trail."""
+        n = self.graph.num_vertices
+        indices = np.asarray(indices, dtype=np.intp).ravel()
+        if indices.size and (indices.min() < -n or indices.max() >= n):
+            raise IndexError("vertex index out of range")
+
+        for index in sorted(set((indices % max(n, 1)).tolist()), reverse=True):
+            self.graph.remove_vertex(index)
+            self.pheromone_matrix.remove_vertex(index, self.graph.candidate_lists)
+        self.top_tours = []
+
+    def seed_levels(self, index):
+        """Initial trails for a new vertex: a copy of its nearest neighbour's row, the edge between them at that row's peak."""
+        pm = self.pheromone_matrix
+        count = pm.vertex_count
+        if count == 0:
+            return np.zeros(0)
+
+        nearest = int(np.argmin(self.graph.distance_matrix[index][:count]))
+        levels = np.maximum(np.array(pm.raw[nearest], dtype=np.float64) * pm.scale, pm.tau_min)
+        levels[nearest] = levels.max()
+
+        if levels[nearest] <= 0.0:
+            # nothing learned to copy (e.g. a single-vertex board)
+            levels[:] = self.initial_level()
+
+        return levels
+
+    def initial_level(self):
+        if self.variant == "mmas" and np.isfinite(self.tau_max):
+            return self.tau_max
+        if self.variant == "acs":
+            return self.tau0
+        return 1.0
+
+    def get_neighbour_lists(self):
+        if self.graph.candidate_lists is not None:
+            return self.graph.candidate_lists
+
+        key = (id(self.graph), self.graph.version, self.local_search_neighbours)
+        if key != self._neighbour_key:
+            self._neighbour_lists = self.graph.nearest_neighbours(self.local_search_neighbours)
+            self._neighbour_key = key
+
+        return self._neighbour_lists
+
+    def close(self):
+        """Release worker processes and shared memory held by the colony."""
+        self.colony.close()
 
     def get_stats(self, all_paths):
-        lengths = [length for (_, length) in all_paths] if all_paths else []
-        avg_length = sum(lengths) / len(lengths) if lengths else 0.0
-        min_length = min(lengths) if lengths else float('inf')
+        return self.length_stats([length for (_, length) in all_paths] if all_paths else [])
+
+    def length_stats(self, lengths):
+        lengths = np.asarray(lengths, dtype=np.float64)
+        avg_length = float(lengths.mean()) if lengths.size else 0.0
+        min_length = float(lengths.min()) if lengths.size else float('inf')
 
         return {
             "avg_length": avg_length,
@@ -43,4 +435,3 @@ class AcoEngine:
             "best_length": self.graph.best_path_length,
             "paths_count": len(lengths)
         }
-
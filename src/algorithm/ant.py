@@ -1,23 +1,33 @@
-import random
+import numpy as np
+
+from src.algorithm.choice_info import ChoiceInfo
+
 
 class Ant:
     def __init__(self):
         pass
 
-    def find_tour(self, graph, pheromone_matrix, alpha, beta):
+    def find_tour(self, graph, pheromone_matrix, alpha, beta, choice_info=None, deposit=True, rng=None):
         self.graph = graph
         self.pheromone_matrix = pheromone_matrix
         self.alpha = alpha
         self.beta = beta
+        # engine pipelines that improve tours first deposit afterwards themselves
+        self.deposit = deposit
+
+        # shared tau^alpha * eta^beta table; built here only when the ant runs on its own
+        if choice_info is None:
+            choice_info = ChoiceInfo.compute(graph, pheromone_matrix, alpha, beta)
+        self.choice_info = choice_info
+
+        # the colony's generator, so seeded runs repeat
+        self.rng = rng if rng is not None else np.random.default_rng()
 
         self.path = []
 
-        self.visited = []
+        self.visited = np.zeros(graph.num_vertices, dtype=bool)
 
-        for _ in range(graph.num_vertices):
-            self.visited.append(False)
-        
-        current_vertice = random.randint(0, graph.num_vertices - 1)
+        current_vertice = int(self.rng.integers(graph.num_vertices))
 
         self.path.append(current_vertice)
 
@@ -25,11 +35,7 @@ class Ant:
 
         self.iterate_through_vertices(current_vertice)
 
-        length = 0.0
-        for i in range(len(self.path) - 1):
-            vertice_a = self.path[i]
-            vertice_b = self.path[i+1]
-            length += self.graph.distance_matrix[vertice_a][vertice_b]
+        length = float(self.graph.distance_matrix[self.path[:-1], self.path[1:]].sum())
 
         return self.path, length
 
@@ -37,8 +43,9 @@ class Ant:
         while len(self.path) < self.graph.num_vertices:
             next_vertice = self.choose_next_vertice(current_vertice)
 
-            delta = self.graph.get_edge_grade(current_vertice, next_vertice)
-            self.pheromone_matrix.add_pending(current_vertice, next_vertice, delta)
+            if self.deposit:
+                delta = self.graph.get_edge_grade(current_vertice, next_vertice)
+                self.pheromone_matrix.add_pending(current_vertice, next_vertice, delta)
 
             self.path.append(next_vertice)
             self.visited[next_vertice] = True
@@ -46,31 +53,39 @@ class Ant:
             current_vertice = next_vertice
 
         self.path.append(self.path[0])
-        delta = self.graph.get_edge_grade(current_vertice, self.path[0])
-        self.pheromone_matrix.add_pending(current_vertice, self.path[0], delta)
+        if self.deposit:
+            delta = self.graph.get_edge_grade(current_vertice, self.path[0])
+            self.pheromone_matrix.add_pending(current_vertice, self.path[0], delta)
 
     def choose_next_vertice(self, current_vertice):
-        probabilities = {}
-        total_prob = 0.0
+        candidate_lists = self.graph.candidate_lists
+
+        if candidate_lists is None:
+            return self._roulette(np.flatnonzero(~self.visited), current_vertice)
 
-        for next_vertice in range(self.graph.num_vertices):
-            if not self.visited[next_vertice]:
-                distance = self.graph.distance_matrix[current_vertice][next_vertice]
+        candidates = candidate_lists[current_vertice]
+        candidates = candidates[~self.visited[candidates]]
 
-                pheromone_level = self.pheromone_matrix.current[current_vertice][next_vertice] ** self.alpha
+        if len(candidates):
+            return self._roulette(candidates, current_vertice)
 
-                path_grade = (1.0 / distance) ** self.beta
-                probability = pheromone_level * path_grade
+        # every nearest neighbour is already used - take the best remaining vertex
+        return int(np.argmax(np.where(self.visited, -np.inf, self.choice_info[current_vertice])))
 
-                probabilities[next_vertice] = probability
+    def _roulette(self, candidates, current_vertice):
+        probabilities = self.choice_info[current_vertice][candidates]
+        cumulative_prob = np.cumsum(probabilities)
+        total_prob = cumulative_prob[-1]
 
-                total_prob += probability
+        if total_prob <= 0.0:
+            # every remaining edge has vanished pheromone/heuristic - pick uniformly
+            return int(self.rng.choice(candidates))
 
-        r = random.uniform(0.0, total_prob)
-        cumulative_prob = 0.0
+        r = self.rng.random() * total_prob
+        index = int(np.searchsorted(cumulative_prob, r, side="right"))
 
-        for vertice, prob in probabilities.items():
-            cumulative_prob += prob
+        # guard against r rounding up to total_prob
+        if index >= len(probabilities):
+            index = int(np.flatnonzero(probabilities)[-1])
 
-            if r <= cumulative_prob:
-                return vertice
+        return int(candidates[index])
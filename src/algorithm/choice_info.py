@@ -0,0 +1,66 @@
+import numpy as np
+
+from src.map.symmetric_matrix import SymmetricMatrix
+from src.map.candidate_matrix import CandidateMatrix
+
+
+class ChoiceInfo:
+    """
+    Caches the tau^alpha * eta^beta table shared by all ants of an iteration.
+    The table is rebuilt only when alpha, beta or the graph change; pheromone updates that touched
+    only some edges are patched in place.
+
+    Entries are built from the unscaled pheromone values, i.e. off from the true levels by the
+    matrix's common lazy-evaporation factor - which cancels out of every roulette and argmax - and
+    raised to the matrix's lazy floor (raw_floor) where it has one.
+    """
+    def __init__(self):
+        self.table = None
+        self._key = None
+        self._pheromone_version = None
+
+    def get(self, graph, pheromone_matrix, alpha, beta):
+        key = (id(graph), graph.version, id(pheromone_matrix), alpha, beta)
+
+        if self.table is not None and key == self._key:
+            changes = pheromone_matrix.changes_since(self._pheromone_version)
+            if changes is not None:
+                self._patch(graph, pheromone_matrix, alpha, beta, *changes)
+                self._pheromone_version = pheromone_matrix.version
+                return self.table
+
+        self.table = self.compute(graph, pheromone_matrix, alpha, beta)
+        self._key = key
+        self._pheromone_version = pheromone_matrix.version
+
+        return self.table
+
+    def _patch(self, graph, pheromone_matrix, alpha, beta, rows, cols):
+        if not len(rows):
+            return
+
+        raw = np.maximum(pheromone_matrix.raw[rows, cols], pheromone_matrix.raw_floor)
+        self.table[rows, cols] = (raw ** alpha) * graph.get_heuristic(beta)[rows, cols]
+
+    @staticmethod
+    def compute(graph, pheromone_matrix, alpha, beta):
+        raw = pheromone_matrix.raw
+        floor = pheromone_matrix.raw_floor
+        heuristic = graph.get_heuristic(beta)
+
+        if isinstance(raw, CandidateMatrix):
+            # candidate edges stored, the rest computed per row from the unstored trail level
+            rows = np.arange(raw.n)[:, None]
+            data = (np.maximum(raw.data, floor, dtype=np.float64) ** alpha) * heuristic[rows, raw.lists]
+            return CandidateMatrix(raw.lists, data, max(raw.fill, floor) ** alpha, base=heuristic, symmetric=raw.symmetric)
+
+        if isinstance(raw, SymmetricMatrix):
+            return SymmetricMatrix(raw.n, data=(np.maximum(raw.data, floor, dtype=np.float64) ** alpha) * heuristic.data)
+
+        # the diagonal's heuristic is 0, so flooring it is harmless
+        return (np.maximum(raw, floor, dtype=np.float64) ** alpha) * heuristic
+
+    def invalidate(self):
+        self.table = None
+        self._key = None
+        self._pheromone_version = None
@@ -1,23 +1,238 @@
-from src.algorithm.ant import Ant  
+import numpy as np
+
+from src.algorithm.ant import Ant
+from src.algorithm.choice_info import ChoiceInfo
 
 class Colony:
-    def __init__(self, num_ants):
+    def __init__(self, num_ants, rng=None):
 
         self.num_ants = num_ants
         self.ants = [Ant() for _ in range(num_ants)]
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def find_paths(self, graph, pheromone_matrix, alpha, beta, choice_info=None, deposit=True):
+        if choice_info is None:
+            choice_info = ChoiceInfo.compute(graph, pheromone_matrix, alpha, beta)
 
-    def find_paths(self, graph, pheromone_matrix, alpha, beta):
         all_paths = []
         for ant in self.ants:
-            path, length = ant.find_tour(graph, pheromone_matrix, alpha, beta)
+            path, length = ant.find_tour(graph, pheromone_matrix, alpha, beta, choice_info, deposit, self.rng)
             all_paths.append((path, length))
 
             # Update best path if this ant found a better one
-            if length < graph.best_path_length:
+            if length < graph.best_path_length and graph.num_vertices >= 2:
                 graph.best_path_length = length
                 graph.best_path = path
 
         graph.last_iteration_paths = list(all_paths)
-        
+
 
         return all_paths
+
+    def find_paths_batched(self, graph, pheromone_matrix, alpha, beta, choice_info=None):
+        """
+        Build every ant's tour at once, one vectorized step per tour position.
+        Returns an (m, n+1) int array of closed tours and the (m,) vector of their lengths.
+        """
+        if choice_info is None:
+            choice_info = ChoiceInfo.compute(graph, pheromone_matrix, alpha, beta)
+
+        tours, lengths, deltas = self.construct_batched(graph, choice_info)
+
+        self.deposit_tours(graph, pheromone_matrix, tours, deltas)
+        self.record_paths(graph, tours, lengths)
+
+        return tours, lengths
+
+    def construct_batched(self, graph, choice_info, q0=0.0, on_step=None):
+        """
+        Build the tours without touching pheromones or best-path state.
+        Returns tours, lengths and per-edge deposits (None when they are derived from the graph).
+        """
+        tours, lengths = construct_tours(
+            choice_info, graph.distance_matrix, graph.candidate_lists, self.num_ants, self.rng, q0, on_step
+        )
+
+        return tours, lengths, None
+
+    def deposit_tours(self, graph, pheromone_matrix, tours, deltas=None):
+        """Deposit on every walked edge; defaults to the 1/d edge grade."""
+        if not tours.size:
+            return
+
+        rows, cols = tours[:, :-1].ravel(), tours[:, 1:].ravel()
+        if deltas is None:
+            deltas = graph.heuristic_matrix[rows, cols]
+
+        pheromone_matrix.add_pending_edges(rows, cols, np.ravel(deltas))
+
+    def record_paths(self, graph, tours, lengths):
+        # a tour over fewer than 2 vertices has length 0 - kept as best, nothing could replace it
+        if len(lengths) and graph.num_vertices >= 2:
+            best = int(np.argmin(lengths))
+            if lengths[best] < graph.best_path_length:
+                graph.best_path_length = float(lengths[best])
+                graph.best_path = tours[best].tolist()
+
+        graph.record_iteration(tours, lengths)
+
+    def close(self):
+        pass
+
+
+def top_tours(tours, lengths, k):
+    """The k shortest (tour, length) pairs as lists, shortest first; argpartition keeps it O(m + k log k)."""
+    lengths = np.asarray(lengths)
+    k = min(k, len(lengths))
+    if k <= 0:
+        return []
+
+    best = np.argpartition(lengths, k - 1)[:k] if k < len(lengths) else np.arange(len(lengths))
+    best = best[np.argsort(lengths[best], kind="stable")]
+    return list(zip(tours[best].tolist(), lengths[best].tolist()))
+
+
+def construct_tours(choice_info, distance_matrix, candidate_lists, num_ants, rng, q0=0.0, on_step=None):
+    """
+    q0 - probability of the greedy (argmax) choice instead of the roulette (ACS pseudo-random-proportional rule).
+    on_step(from_vertices, to_vertices) - called after every step, e.g. for ACS local pheromone updates.
+    """
+    n = len(distance_matrix)
+    tours = np.empty((num_ants, n + 1), dtype=np.intp)
+
+    if n == 0 or num_ants == 0:
+        return tours[:, :0], np.zeros(num_ants)
+
+    rows = np.arange(num_ants)
+    visited = np.zeros((num_ants, n), dtype=bool)
+
+    current = rng.integers(0, n, size=num_ants)
+    tours[:, 0] = current
+    visited[rows, current] = True
+
+    use_candidates = candidate_lists is not None and candidate_lists.shape[1] > 0
+
+    for step in range(1, n):
+        if use_candidates:
+            candidates = candidate_lists[current]
+            open_mask = ~visited[rows[:, None], candidates]
+            has_open = open_mask.any(axis=1)
+
+            next_vertices = np.empty(num_ants, dtype=np.intp)
+
+            sampled = np.flatnonzero(has_open)
+            if len(sampled):
+                weights = choice_info[current[sampled, None], candidates[sampled]]
+                picks = _choose_rows(weights, open_mask[sampled], rng, q0)
+                next_vertices[sampled] = candidates[sampled, picks]
+
+            # every nearest neighbour is already used - take the best remaining vertex
+            exhausted = np.flatnonzero(~has_open)
+            if len(exhausted):
+                fallback = np.where(visited[exhausted], -np.inf, choice_info[current[exhausted]])
+                next_vertices[exhausted] = np.argmax(fallback, axis=1)
+        else:
+            next_vertices = _choose_rows(choice_info[current], ~visited, rng, q0)
+
+        tours[:, step] = next_vertices
+        visited[rows, next_vertices] = True
+
+        if on_step is not None:
+            on_step(current, next_vertices)
+
+        current = next_vertices
+
+    tours[:, n] = tours[:, 0]
+
+    if on_step is not None and n > 1:
+        on_step(current, tours[:, 0])
+    lengths = distance_matrix[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+
+    return tours, lengths
+
+
+def _choose_rows(weights, open_mask, rng, q0):
+    if q0 <= 0.0:
+        return _roulette_rows(weights, open_mask, rng)
+
+    picks = np.empty(len(weights), dtype=np.intp)
+    greedy = rng.random(len(weights)) < q0
+
+    if greedy.any():
+        picks[greedy] = np.argmax(np.where(open_mask[greedy], weights[greedy], -np.inf), axis=1)
+
+    sampled = ~greedy
+    if sampled.any():
+        picks[sampled] = _roulette_rows(weights[sampled], open_mask[sampled], rng)
+
+    return picks
+
+
+def _roulette_rows(weights, open_mask, rng):
+    """Row-wise roulette over weights restricted to open_mask; returns one column index per row."""
+    weights = np.where(open_mask, weights, 0.0)
+    totals = weights.sum(axis=1)
+
+    # rows whose open entries all carry zero weight - pick uniformly among them
+    dead = totals <= 0.0
+    if dead.any():
+        weights[dead] = open_mask[dead]
+        totals[dead] = weights[dead].sum(axis=1)
+
+    cumulative = np.cumsum(weights, axis=1)
+    r = rng.random(len(weights)) * totals
+    picks = (cumulative <= r[:, None]).sum(axis=1)
+
+    # guard against r rounding up to the row total
+    overflow = picks >= weights.shape[1]
+    if overflow.any():
+        last_positive = weights.shape[1] - 1 - np.argmax(weights[overflow, ::-1] > 0, axis=1)
+        picks[overflow] = last_positive
+
+    return picks
+
+
+def nearest_neighbour_tour(distance_matrix, start=0, index=None):
+    """
+    Greedy closed tour that always moves to the closest unvisited vertex. With a spatial index
+    (Graph.spatial_index()) the closest vertex comes from k-nearest queries instead of a full
+    distance row.
+    """
+    n = len(distance_matrix) if index is None else len(index)
+    tour = np.empty(n + 1, dtype=np.intp)
+
+    if n == 0:
+        return tour[:0]
+
+    visited = np.zeros(n, dtype=bool)
+    current = start
+
+    for step in range(n):
+        tour[step] = current
+        visited[current] = True
+        if step < n - 1 and index is not None:
+            current = _nearest_unvisited(index, current, visited)
+        elif step < n - 1:
+            current = int(np.argmin(np.where(visited, np.inf, distance_matrix[current])))
+
+    tour[n] = start
+
+    return tour
+
+
+def _nearest_unvisited(index, current, visited, k=8, max_k=256):
+    x, y = index.xs[current], index.ys[current]
+
+    while k <= max_k:
+        nearest = index.query(x, y, k, exclude=current)
+        unvisited = nearest[~visited[nearest]]
+        if unvisited.size:
+            return int(unvisited[0])
+        if len(nearest) < k:
+            break
+        k *= 4
+
+    # every nearby vertex is taken: scan the remaining ones directly
+    remaining = np.flatnonzero(~visited)
+    d2 = (index.xs[remaining] - x) ** 2 + (index.ys[remaining] - y) ** 2
+    return int(remaining[np.argmin(d2)])
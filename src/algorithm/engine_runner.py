@@ -0,0 +1,323 @@
+import queue
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+from src.map.graph import to_canvas
+
+# strongest edges kept in a snapshot's pheromone summary; None keeps every edge
+EDGE_LIMIT = 20000
+
+
+def _frozen(array):
+    array = np.array(array)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True)
+class PheromoneSummary:
+    """The strongest undirected edges (rows[k], cols[k]) with their levels, weakest first, plus the range over all edges."""
+    rows: np.ndarray
+    cols: np.ndarray
+    levels: np.ndarray
+    min_level: float
+    max_level: float
+    version: int
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Read-only state of an EngineRunner's engine after a command or iteration. Everything is
+    copied out of the engine, so the render thread can hold on to it while the worker runs on.
+    """
+    iteration: int
+    # bumped by resets and edits; (epoch, iteration) identifies the tours a snapshot shows
+    epoch: int
+    running: bool
+    stopped: bool
+    xs: np.ndarray
+    ys: np.ndarray
+    best_path: tuple
+    best_length: float
+    top_paths: tuple
+    pheromones: PheromoneSummary
+    stats: MappingProxyType
+    alpha: float
+    beta: float
+    evaporation_rate: float
+    num_ants: int
+    # Graph.display: maps xs/ys (the instance's own units) onto the canvas, None if they already are canvas coordinates
+    display: tuple = None
+
+    @property
+    def num_vertices(self):
+        return len(self.xs)
+
+    def canvas_points(self):
+        return to_canvas(self.display, self.xs, self.ys)
+
+
+def summarize_pheromones(pheromone_matrix, edge_limit=EDGE_LIMIT):
+    rows, cols, levels = pheromone_matrix.edge_levels()
+
+    if levels.size:
+        min_level, max_level = float(levels.min()), float(levels.max())
+    else:
+        min_level = max_level = 0.0
+
+    if edge_limit is not None and levels.size > edge_limit:
+        keep = np.argpartition(levels, levels.size - edge_limit)[levels.size - edge_limit:]
+    else:
+        keep = np.arange(levels.size)
+    # weakest first, so the strongest trails end up drawn on top
+    keep = keep[np.argsort(levels[keep], kind="stable")]
+
+    return PheromoneSummary(
+        _frozen(rows[keep]), _frozen(cols[keep]), _frozen(levels[keep]),
+        min_level, max_level, pheromone_matrix.version
+    )
+
+
+def take_snapshot(engine, iteration=0, epoch=0, running=False, stats=None, top_k=9, edge_limit=EDGE_LIMIT, pheromones=None, top_paths=None):
+    """
+    pheromones: a summary of engine.pheromone_matrix at its current version, and top_paths: the
+    engine's current top tours as tuples, both reused instead of recomputed when given.
+    """
+    graph = engine.graph
+    if pheromones is None:
+        pheromones = summarize_pheromones(engine.pheromone_matrix, edge_limit)
+    if top_paths is None:
+        # ranked once per iteration by the engine
+        top_paths = tuple((tuple(path), length) for path, length in engine.top_tours[:top_k])
+
+    return Snapshot(
+        iteration=iteration,
+        epoch=epoch,
+        running=running,
+        stopped=engine.stopped,
+        xs=_frozen(graph.xs),
+        ys=_frozen(graph.ys),
+        best_path=tuple(graph.best_path) if graph.best_path else None,
+        best_length=graph.best_path_length,
+        top_paths=top_paths,
+        pheromones=pheromones,
+        stats=MappingProxyType(dict(stats or {})),
+        alpha=engine.alpha,
+        beta=engine.beta,
+        evaporation_rate=engine.evaporation_rate,
+        num_ants=engine.num_ants,
+        display=graph.display
+    )
+
+
+class EngineRunner:
+    """
+    Runs an AcoEngine on a worker thread. Callers never touch the engine directly: commands
+    (start, stop, step, reset, configure, call, ...) are queued and executed between iterations,
+    and every command and iteration publishes a fresh Snapshot, read through .snapshot.
+
+    Iterations are paced at iterations_per_second without catching up: an iteration slower
+    than the interval just lowers the achieved rate instead of queueing a backlog.
+    """
+    def __init__(self, engine, iterations_per_second=10, top_k=9, edge_limit=EDGE_LIMIT, publish_interval=1.0 / 60, clock=time.perf_counter):
+        self.engine = engine
+        self.iterations_per_second = iterations_per_second
+        self.top_k = top_k
+        self.edge_limit = edge_limit
+        # while running, snapshots are taken at most this often (commands always publish one)
+        self.publish_interval = publish_interval
+        self.clock = clock
+
+        self.commands = queue.Queue()
+        self.running = False
+        self.iteration = 0
+        self.epoch = 0
+        self.last_stats = {}
+        self._closed = False
+        self._thread = None
+        self._next_due = 0.0
+        self._last_publish = float("-inf")
+        self._summary_key = None
+        self._top_source = None
+        self.snapshot = None
+        self.publish()
+
+    # --- caller side ---
+
+    def start_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="aco-engine", daemon=True)
+            self._thread.start()
+
+    def send(self, command, *args):
+        self.commands.put((command, args))
+
+    def start(self):
+        self.send("start")
+
+    def stop(self):
+        self.send("stop")
+
+    def step(self):
+        self.send("step")
+
+    def reset(self, build):
+        """build(old_engine) -> new engine, run on the worker; the old engine is closed afterwards."""
+        self.send("reset", build)
+
+    def configure(self, **params):
+        """Set engine attributes (alpha, beta, evaporation_rate, ...) between iterations."""
+        self.send("configure", params)
+
+    def call(self, fn):
+        """Run fn(engine) on the worker, e.g. vertex edits."""
+        self.send("call", fn)
+
+    def set_speed(self, iterations_per_second):
+        self.send("speed", iterations_per_second)
+
+    def flush(self, timeout=None):
+        """Block until every queued command has run (or timeout seconds passed); True if drained."""
+        if self._thread is None:
+            self.process_commands()
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.commands.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout=5.0):
+        self.send("close")
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self.process_commands()
+
+    # --- worker side ---
+
+    def can_run(self):
+        return self.engine.graph.num_vertices >= 2 and not self.engine.stopped
+
+    def process_commands(self, timeout=0.0):
+        """Execute queued commands, waiting up to timeout (None: forever) for the first; number run."""
+        count = 0
+        try:
+            while not self._closed:
+                try:
+                    if count == 0 and timeout != 0.0:
+                        command, args = self.commands.get(timeout=timeout)
+                    else:
+                        command, args = self.commands.get_nowait()
+                except queue.Empty:
+                    break
+
+                count += 1
+                self._execute(command, args)
+
+            if count:
+                self.publish()
+        finally:
+            # marked done only once published, so flush() returns with the snapshot up to date
+            for _ in range(count):
+                self.commands.task_done()
+        return count
+
+    def _execute(self, command, args):
+        if command == "start":
+            self.running = self.can_run()
+            self._next_due = self.clock()
+        elif command == "stop":
+            self.running = False
+        elif command == "step":
+            if self.can_run():
+                self.iterate()
+        elif command == "reset":
+            old = self.engine
+            self.engine = args[0](old)
+            if self.engine is not old:
+                old.close()
+            self.running = False
+            self.iteration = 0
+            self.epoch += 1
+            self.last_stats = {}
+        elif command == "configure":
+            for name, value in args[0].items():
+                setattr(self.engine, name, value)
+        elif command == "call":
+            args[0](self.engine)
+            self.epoch += 1
+        elif command == "speed":
+            self.iterations_per_second = args[0]
+        elif command == "close":
+            self.running = False
+            self._closed = True
+            self.engine.close()
+        else:
+            raise ValueError(f"unknown command {command!r}")
+
+    def iterate(self):
+        self.last_stats = self.engine.run_iteration()
+        self.iteration += 1
+
+        if self.engine.stopped:
+            # the engine's stagnation policy ended the run
+            self.running = False
+
+    def publish(self):
+        # the pheromone summary is the expensive part; reuse it while the matrix has not changed
+        pm = self.engine.pheromone_matrix
+        key = (id(pm), pm.version, pm.vertex_count)
+        pheromones = self.snapshot.pheromones if key == self._summary_key else None
+        # the engine replaces its top_tours list every iteration, so an unchanged list keeps its tuples
+        top_paths = self.snapshot.top_paths if self.engine.top_tours is self._top_source else None
+
+        self.snapshot = take_snapshot(
+            self.engine, self.iteration, self.epoch, self.running, self.last_stats,
+            self.top_k, self.edge_limit, pheromones, top_paths
+        )
+        self._summary_key = key
+        self._top_source = self.engine.top_tours
+        self._last_publish = self.clock()
+
+    def tick(self):
+        """One pass of the worker loop: pending commands, then at most one iteration when due."""
+        if self.running:
+            timeout = max(0.0, self._next_due - self.clock())
+        else:
+            timeout = None if self._thread is not None else 0.0
+        self.process_commands(timeout)
+
+        if not self.running or self._closed or self.clock() < self._next_due:
+            return
+
+        if not self.can_run():
+            self.running = False
+            self.publish()
+            return
+
+        self.iterate()
+        now = self.clock()
+        # no catch-up: the next iteration is due one interval after this one was due, or now if already late
+        self._next_due = max(self._next_due + 1.0 / max(1, self.iterations_per_second), now)
+
+        if not self.running or now - self._last_publish >= self.publish_interval:
+            self.publish()
+
+    def _loop(self):
+        while not self._closed:
+            try:
+                self.tick()
+            except Exception:
+                # keep the worker alive for further commands; the failed run is paused
+                traceback.print_exc()
+                self.running = False
@@ -0,0 +1,110 @@
+from collections import deque
+
+import numpy as np
+
+
+def two_opt(tour, distance_matrix, neighbour_lists):
+    """
+    Improve a closed tour with 2-opt moves restricted to neighbour lists.
+    Don't-look bits keep a city out of the work queue until one of its tour edges changes,
+    so a pass is close to linear in n. Returns the improved closed tour and its length.
+    """
+    order = [int(v) for v in tour[:-1]]
+    n = len(order)
+
+    if n < 4:
+        tour = np.asarray(tour, dtype=np.intp)
+        return tour, float(distance_matrix[tour[:-1], tour[1:]].sum())
+
+    d = distance_matrix
+    neighbours = neighbour_lists.tolist()
+
+    pos = [0] * n
+    for i, v in enumerate(order):
+        pos[v] = i
+
+    # a city is in the queue exactly when its don't-look bit is off
+    active = deque(order)
+    queued = [True] * n
+
+    while active:
+        a = active.popleft()
+        queued[a] = False
+
+        improved = True
+        while improved:
+            improved = False
+            i = pos[a]
+
+            for forward in (True, False):
+                a_next = order[(i + 1) % n] if forward else order[i - 1]
+                d_a = d[a, a_next]
+
+                for c in neighbours[a]:
+                    d_ac = d[a, c]
+                    # neighbour lists are sorted, so no later c can give a gain either
+                    if d_ac >= d_a:
+                        break
+
+                    j = pos[c]
+                    c_next = order[(j + 1) % n] if forward else order[j - 1]
+                    if c == a_next or c_next == a:
+                        continue
+
+                    gain = d_a + d[c, c_next] - d_ac - d[a_next, c_next]
+                    if gain <= 1e-10:
+                        continue
+
+                    # forward: a a_next .. c c_next -> a c .. a_next c_next
+                    # backward: c_next c .. a_next a -> c_next a_next .. c a
+                    if forward:
+                        _reverse(order, pos, i + 1, j)
+                    else:
+                        _reverse(order, pos, j, i - 1)
+
+                    for v in (a, a_next, c, c_next):
+                        if not queued[v]:
+                            queued[v] = True
+                            active.append(v)
+
+                    improved = True
+                    break
+
+                if improved:
+                    break
+
+    order.append(order[0])
+    tour = np.array(order, dtype=np.intp)
+
+    return tour, float(d[tour[:-1], tour[1:]].sum())
+
+
+def _reverse(order, pos, start, end):
+    """Reverse the cyclic segment order[start..end]; flips the shorter side of the cycle."""
+    n = len(order)
+    start %= n
+    end %= n
+
+    length = (end - start) % n + 1
+    if 2 * length > n:
+        start, end = (end + 1) % n, (start - 1) % n
+        length = n - length
+
+    for _ in range(length // 2):
+        a, b = order[start], order[end]
+        order[start], order[end] = b, a
+        pos[b] = start
+        pos[a] = end
+        start = (start + 1) % n
+        end = (end - 1) % n
+
+
+def improve_tours(tours, lengths, distance_matrix, neighbour_lists, indices=None):
+    """Run two_opt on the given rows of an (m, n+1) tour array (all rows by default), in place."""
+    if indices is None:
+        indices = range(len(tours))
+
+    for index in indices:
+        tours[index], lengths[index] = two_opt(tours[index], distance_matrix, neighbour_lists)
+
+    return tours, lengths
@@ -0,0 +1,162 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.algorithm.colony import Colony, construct_tours
+from src.map.symmetric_matrix import SymmetricMatrix
+
+
+class SharedArray:
+    """An ndarray living in a multiprocessing.shared_memory block."""
+    def __init__(self, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+        self.spec = (self.shm.name, tuple(shape), dtype.str)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        self.shm.unlink()
+
+
+class MappedFile:
+    """A Graph.distance_file the workers memory-map read-only themselves, instead of a shared-memory copy."""
+    def __init__(self, path):
+        self.array = np.load(path, mmap_mode="r")
+        self.spec = (path, self.array.shape, self.array.dtype.str)
+
+    def close(self):
+        self.array = None
+
+
+class ParallelColony(Colony):
+    """
+    Colony that splits the ants of an iteration across a process pool.
+    Distances, candidate lists and the pheromone-derived choice table live in shared memory,
+    so a task only ships block names and a seed; workers send back tours, lengths and deposits.
+    """
+    def __init__(self, num_ants, workers, rng=None):
+        super().__init__(num_ants, rng)
+
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+        self._blocks = {}
+        self._graph_key = None
+
+    def construct_batched(self, graph, choice_info):
+        self._share_graph(graph)
+        np.copyto(self._blocks["choice"].array, _storage(choice_info))
+
+        specs = {name: block.spec for name, block in self._blocks.items()}
+        chunks = [len(c) for c in np.array_split(np.arange(self.num_ants), self.workers) if len(c)]
+        seeds = self.rng.integers(0, 2**63 - 1, size=len(chunks))
+
+        futures = [
+            self.pool.submit(_construct_chunk, specs, graph.num_vertices, chunk, int(seed))
+            for chunk, seed in zip(chunks, seeds)
+        ]
+        results = [future.result() for future in futures]
+
+        n = graph.num_vertices
+        if results:
+            tours = np.concatenate([tours for tours, _, _ in results])
+            lengths = np.concatenate([lengths for _, lengths, _ in results])
+            deltas = np.concatenate([deltas for _, _, deltas in results])
+        else:
+            tours, lengths, deltas = np.empty((0, n + 1), dtype=np.intp), np.zeros(0), np.zeros((0, n))
+
+        return tours, lengths, deltas
+
+    def _share_graph(self, graph):
+        key = (id(graph), graph.version)
+        if key == self._graph_key:
+            return
+
+        self._release_blocks()
+
+        # symmetric graphs ship their condensed arrays; workers rewrap them as SymmetricMatrix
+        distances = _storage(graph.distance_matrix)
+        if graph.distance_file is not None:
+            self._blocks["distance"] = MappedFile(graph.distance_file)
+        else:
+            self._blocks["distance"] = SharedArray(distances.shape, np.float64)
+            np.copyto(self._blocks["distance"].array, distances)
+        self._blocks["choice"] = SharedArray(distances.shape, np.float64)
+
+        if graph.candidate_lists is not None:
+            self._blocks["candidates"] = SharedArray(graph.candidate_lists.shape, np.intp)
+            np.copyto(self._blocks["candidates"].array, graph.candidate_lists)
+
+        self._graph_key = key
+
+    def _release_blocks(self):
+        for block in self._blocks.values():
+            block.close()
+        self._blocks = {}
+        self._graph_key = None
+
+    def close(self):
+        self.pool.shutdown()
+        self._release_blocks()
+
+
+def _storage(matrix):
+    return matrix.data if isinstance(matrix, SymmetricMatrix) else matrix
+
+
+def _unwrap(array, n):
+    return SymmetricMatrix(n, data=array) if array.ndim == 1 else array
+
+
+# worker side: blocks stay attached between tasks and are swapped when the parent re-shares the graph
+_attached = {}
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    entry = _attached.get(name)
+
+    if entry is None and name.endswith(".npy"):
+        # a MappedFile: shared-memory names never carry the suffix
+        entry = (None, np.load(name, mmap_mode="r").view(np.ndarray))
+        _attached[name] = entry
+    elif entry is None:
+        shm = shared_memory.SharedMemory(name=name)
+        entry = (shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf))
+        _attached[name] = entry
+
+    return entry[1]
+
+
+def _detach_stale(specs):
+    live = {spec[0] for spec in specs.values()}
+    for name in list(_attached):
+        if name not in live:
+            shm, _ = _attached.pop(name)
+            if shm is not None:
+                shm.close()
+
+
+def _construct_chunk(specs, n, num_ants, seed):
+    _detach_stale(specs)
+
+    distance_matrix = _unwrap(_attach(specs["distance"]), n)
+    choice_info = _unwrap(_attach(specs["choice"]), n)
+    candidate_lists = _attach(specs["candidates"]) if "candidates" in specs else None
+
+    tours, lengths = construct_tours(
+        choice_info, distance_matrix, candidate_lists, num_ants, np.random.default_rng(seed)
+    )
+
+    # same 1/d edge grade the serial colony deposits
+    walked = distance_matrix[tours[:, :-1], tours[:, 1:]]
+    deltas = np.zeros_like(walked)
+    np.divide(1.0, walked, out=deltas, where=walked > 0)
+
+    return tours, lengths, deltas
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+def lambda_branching(pheromones, neighbour_lists, lam=0.05, floor=0.0):
+    """
+    Mean lambda-branching factor over the vertices' neighbour lists: for vertex i, the number of
+    listed edges with tau >= min_i + lam * (max_i - min_i). Edges are read undirected, as
+    max(tau[i, j], tau[j, i]), so a tour's deposits count at both of its ends whichever way the
+    matrix stores them: close to 2 once the colony has converged onto one tour, with dense,
+    condensed or candidate storage alike; the full list size while trails are still uniform.
+    Costs O(n * k) - scale factors shared by all cells cancel out, so raw levels can be passed
+    together with the matrix's raw_floor.
+    """
+    n, k = neighbour_lists.shape
+    if n == 0 or k == 0:
+        return 0.0
+
+    rows = np.broadcast_to(np.arange(n)[:, None], neighbour_lists.shape)
+    levels = np.maximum(pheromones[rows, neighbour_lists], pheromones[neighbour_lists, rows])
+    levels = np.maximum(levels, floor, dtype=np.float64)
+    lo = levels.min(axis=1, keepdims=True)
+    hi = levels.max(axis=1, keepdims=True)
+
+    return float((levels >= lo + lam * (hi - lo)).sum(axis=1).mean())
+
+
+def tour_diversity(tours, n):
+    """
+    Share of the iteration's undirected edges that are not repeats: 0 when every ant walked the
+    same tour, approaching 1 when no two ants share an edge. 1.0 for fewer than two tours.
+    """
+    m = len(tours)
+    if m < 2 or n < 2:
+        return 1.0
+
+    a, b = tours[:, :-1].ravel(), tours[:, 1:].ravel()
+    keys = np.minimum(a, b) * n + np.maximum(a, b)
+    distinct = np.unique(keys).size
+
+    return float((distinct - n) / (n * (m - 1)))
@@ -0,0 +1,158 @@
+import time
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate in constant memory (the P-square algorithm of Jain & Chlamtac):
+    five markers track the minimum, p/2, p, (1+p)/2 and the maximum of everything observed.
+    """
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        heights = self.heights
+
+        if len(heights) < 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        if x < heights[0]:
+            heights[0] = x
+            k = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= heights[k + 1]:
+                k += 1
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # nudge the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = height
+                positions[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self):
+        heights = self.heights
+        if not heights:
+            return 0.0
+        if len(heights) < 5:
+            # exact while fewer than five samples were seen
+            return heights[min(len(heights) - 1, int(round(self.p * (len(heights) - 1))))]
+        return heights[2]
+
+
+class StreamingStats:
+    """count / total / mean / max plus p50 and p95 estimates of a stream of durations (seconds)."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.p50.add(seconds)
+        self.p95.add(seconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary(self):
+        """Aggregates in milliseconds."""
+        return {
+            "count": self.count,
+            "total_ms": 1000.0 * self.total,
+            "mean_ms": 1000.0 * self.mean,
+            "p50_ms": 1000.0 * self.p50.value(),
+            "p95_ms": 1000.0 * self.p95.value(),
+            "max_ms": 1000.0 * self.max,
+        }
+
+
+class PhaseTimers:
+    """
+    Per-phase timers for AcoEngine iterations. The engine brackets each phase with
+
+        t = timers.start()
+        ...
+        t = timers.lap("construction", t)
+
+    and calls end_iteration() once per iteration, which hands that iteration's
+    {phase: seconds} to every subscriber. While disabled, start() returns None and lap()
+    returns straight away, so the instrumentation costs a couple of calls per phase.
+    """
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.stats = {}
+        self.current = {}
+        self._subscribers = []
+
+    def start(self):
+        return self.clock() if self.enabled else None
+
+    def lap(self, phase, started):
+        if started is None:
+            return None
+
+        now = self.clock()
+        self.current[phase] = self.current.get(phase, 0.0) + now - started
+        return now
+
+    def end_iteration(self, iteration):
+        if not self.enabled:
+            return
+
+        timings = self.current
+        self.current = {}
+
+        for phase, seconds in timings.items():
+            stats = self.stats.get(phase)
+            if stats is None:
+                stats = self.stats[phase] = StreamingStats()
+            stats.add(seconds)
+
+        for callback in self._subscribers:
+            callback(iteration, timings)
+
+    def subscribe(self, callback):
+        """callback(iteration, {phase: seconds}) after every timed iteration; returns an unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def summary(self):
+        return {phase: stats.summary() for phase, stats in self.stats.items()}
+
+    def reset(self):
+        self.stats = {}
+        self.current = {}
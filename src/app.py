@@ -1,6 +1,5 @@
 import pygame
 import pygame_gui
-import time
 from src.ui.sidebar import Sidebar
 from src.ui.side_panels import SidePanels
 from src.ui.main_panel import MainPanel
@@ -8,9 +7,11 @@ from src.ui.event_handler import EventHandler
 from src.ui.renderer import Renderer
 
 from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.engine_runner import EngineRunner
+from src.algorithm.timing import PhaseTimers
 from src.ui.file_manager import FileManager
 
-from src.config import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.config import SCREEN_WIDTH, SCREEN_HEIGHT, CENTER_WIDTH
 
 class App:
     def __init__(self):
@@ -25,12 +26,6 @@ class App:
         self.clock = pygame.time.Clock()
         self.running = True
 
-        # simulation controls
-        self.iteration_accumulator = 0.0
-        self.iteration_count = 0
-        self.simulation_running = False
-        self.iterations_per_second = 10
-
         # UI initialization
         self.ui_manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.sidebar = Sidebar(self.ui_manager)
@@ -42,27 +37,32 @@ class App:
         self.renderer = Renderer(self)
         self.view_mode = "standard"
         
-        # algorithm
-        self.aco_engine = AcoEngine(
-            alpha=1.0,
-            beta=1.0,
-            evaporation_rate=0.1,
-            num_vertices = 20,
-            num_ants = 50
+        # algorithm: the engine lives on the runner's worker thread; the UI only sends commands
+        # and draws the latest published snapshot
+        self.timers = PhaseTimers(enabled=True)
+        self.timers.subscribe(self.log_iteration)
+        self.runner = EngineRunner(
+            AcoEngine(
+                alpha=1.0,
+                beta=1.0,
+                evaporation_rate=0.1,
+                num_vertices = 20,
+                num_ants = 50,
+                bounds = (CENTER_WIDTH - 20, SCREEN_HEIGHT - 20),
+                timers = self.timers
+            ),
+            iterations_per_second = 10
         )
+        self.snapshot = self.runner.snapshot
+        self.runner.start_thread()
 
         # file manager
         self.file_manager = FileManager(
             ui_manager=self.ui_manager, 
-            graph=self.aco_engine.graph,
-            on_vertices_loaded=self.event_handler.reset_simulation
+            get_vertices=lambda: (self.snapshot.xs, self.snapshot.ys),
+            on_file_picked=self.event_handler.load_file
         )
 
-        # Performance monitoring
-        self.execution_times = []
-
-
-
     def run(self):
         """main loop"""
         while self.running:
@@ -70,26 +70,23 @@ class App:
             self.event_handler.process()
             self.update(time_delta)
             self.renderer.draw()
+        self.runner.close()
         pygame.quit()
 
 
+    def log_iteration(self, iteration, timings):
+        """Timer subscriber (called on the worker thread): per-iteration time and the running mean kept by the streaming stats."""
+        average = self.timers.stats["iteration"].mean
+        print(f"Iteration {iteration}: {timings['iteration'] * 1000:.2f}ms, Avg: {average * 1000:.2f}ms")
+
     def update(self, time_delta):
-        if self.simulation_running:
-            self.iteration_accumulator += time_delta
-            interval = 1.0 / max(1, self.iterations_per_second)
-            while self.iteration_accumulator >= interval:
-                start_time = time.perf_counter()
-                stats = self.aco_engine.run_iteration()
-                end_time = time.perf_counter()
-                
-                execution_time_ms = (end_time - start_time) * 1000
-                self.execution_times.append(execution_time_ms)
-                
-                # Oblicz średnią wszystkich dotychczasowych czasów
-                avg_time = sum(self.execution_times) / len(self.execution_times)
-                
-                print(f"Iteration {self.iteration_count}: {execution_time_ms:.2f}ms, Avg: {avg_time:.2f}ms")
-                
-                self.iteration_accumulator -= interval
-                self.iteration_count += 1
-        self.ui_manager.update(time_delta)
\ No newline at end of file
+        previous, self.snapshot = self.snapshot, self.runner.snapshot
+
+        if self.snapshot.num_vertices != previous.num_vertices:
+            # vertex edits and resets land asynchronously
+            self.sidebar.vertices_input.set_text(str(self.snapshot.num_vertices))
+        if self.snapshot.stopped and not previous.stopped:
+            # the engine's stagnation policy ended the run
+            print(f"Converged after {self.snapshot.iteration} iterations")
+
+        self.ui_manager.update(time_delta)
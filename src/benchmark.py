@@ -0,0 +1,295 @@
+"""
+Engine throughput benchmark over fixed-seed instances.
+
+    python -m src.benchmark --output baseline.json
+    python -m src.benchmark --compare baseline.json
+
+Generated instances (uniform, clustered) run at every --sizes value; the CSVs in data/ run at
+their own size. Each case reports iterations/sec, mean ms per phase, peak traced memory and the
+best length after a fixed iteration budget; phase times come from AcoEngine.timers.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.algorithm.aco_engine import AcoEngine
+from src.map.graph import DEFAULT_BOUNDS, Graph
+from src.map.vertex_io import load_points
+
+DEFAULT_SIZES = [20, 100, 500, 2000]
+DEFAULT_ANTS = [10, 50]
+# options that change a case's results, with the values build_engine falls back to
+CASE_OPTIONS = {
+    "alpha": 1.0,
+    "beta": 2.0,
+    "evaporation_rate": 0.9,
+    "variant": "as",
+    "local_search": None,
+    "symmetric": False,
+}
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def uniform_points(n, seed, bounds=DEFAULT_BOUNDS):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0, bounds[0], n), rng.uniform(0, bounds[1], n)
+
+
+def clustered_points(n, seed, bounds=DEFAULT_BOUNDS, clusters=8, spread=0.04):
+    """Gaussian blobs around a few uniform centres, clipped to the bounds."""
+    rng = np.random.default_rng(seed)
+    centres = rng.uniform(0, 1, (clusters, 2)) * bounds
+    members = rng.integers(0, clusters, n)
+
+    points = centres[members] + rng.normal(0, spread, (n, 2)) * bounds
+    points = np.clip(points, 0, np.asarray(bounds) - 1)
+    return points[:, 0], points[:, 1]
+
+
+GENERATORS = {
+    "uniform": uniform_points,
+    "clustered": clustered_points,
+}
+
+
+def data_instances(directory=DATA_DIR):
+    """(name, xs, ys) for every readable CSV in directory with at least 2 points."""
+    for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+        try:
+            xs, ys = load_points(path)
+        except (OSError, ValueError):
+            continue
+        if len(xs) >= 2:
+            yield os.path.basename(path), xs, ys
+
+
+def instances(names, sizes, seed):
+    for name in names:
+        if name == "data":
+            for filename, xs, ys in data_instances():
+                yield f"data/{filename}", xs, ys
+        else:
+            for n in sizes:
+                xs, ys = GENERATORS[name](n, seed)
+                yield name, xs, ys
+
+
+def case_options(options):
+    return {name: options.get(name, default) for name, default in CASE_OPTIONS.items()}
+
+
+def build_engine(xs, ys, num_ants, seed, options, timing=False):
+    options = case_options(options)
+    graph = Graph(0, options["symmetric"])
+    graph.set_vertices(xs, ys)
+
+    return AcoEngine(
+        num_vertices=len(xs),
+        num_ants=num_ants,
+        graph=graph,
+        seed=seed,
+        timing=timing,
+        **options
+    )
+
+
+def run_case(instance, xs, ys, num_ants, iterations, seed, options):
+    # warm-up: a discarded build and iteration, so first-call costs (imports, allocator growth,
+    # caches) do not land in whichever case happens to run first
+    engine = build_engine(xs, ys, num_ants, seed, options)
+    engine.run_iteration()
+    engine.close()
+
+    # timed pass: no tracing overhead
+    engine = build_engine(xs, ys, num_ants, seed, options, timing=True)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        engine.run_iteration()
+    seconds = time.perf_counter() - start
+    best_length = engine.graph.best_path_length
+    phases = engine.timers.summary()
+    engine.close()
+
+    # memory pass: engine setup plus a few iterations under tracemalloc
+    tracemalloc.start()
+    try:
+        engine = build_engine(xs, ys, num_ants, seed, options)
+        for _ in range(min(iterations, 3)):
+            engine.run_iteration()
+        engine.close()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "instance": instance,
+        "n": len(xs),
+        "ants": num_ants,
+        **case_options(options),
+        "seed": seed,
+        "iterations": iterations,
+        "seconds": seconds,
+        "iterations_per_sec": iterations / seconds if seconds > 0 else float("inf"),
+        "phase_ms": {phase: stats["total_ms"] / iterations for phase, stats in sorted(phases.items()) if phase != "iteration"},
+        "iteration_p95_ms": phases["iteration"]["p95_ms"] if "iteration" in phases else 0.0,
+        "peak_memory_mb": peak / 2**20,
+        "best_length": best_length,
+    }
+
+
+def run_suite(names, sizes, ants, iterations, seed, options, log=None):
+    # a repeated size or ant count would run the same case twice under one key
+    for label, values in (("size", sizes), ("ant count", ants)):
+        if len(set(values)) != len(values):
+            raise ValueError(f"duplicate {label} in {list(values)}")
+
+    results = []
+    for instance, xs, ys in instances(names, sizes, seed):
+        for num_ants in ants:
+            result = run_case(instance, xs, ys, num_ants, iterations, seed, options)
+            results.append(result)
+            if log:
+                log(format_result(result))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "seed": seed,
+            "options": options,
+        },
+        "results": results,
+    }
+
+
+def case_key(result):
+    # reports from before an option was recorded ran with its default
+    options = tuple(result.get(name, default) for name, default in CASE_OPTIONS.items())
+    return (result["instance"], result["n"], result["ants"], result.get("seed"), result.get("iterations")) + options
+
+
+def index_cases(results):
+    """results keyed by case_key; a repeated case is an error rather than silently replacing the first."""
+    cases = {}
+    for result in results:
+        key = case_key(result)
+        if key in cases:
+            raise ValueError(f"duplicate benchmark case {format_case(key)}")
+        cases[key] = result
+    return cases
+
+
+def format_case(key):
+    return "/".join(str(part) for part in key)
+
+
+def unmatched_cases(report, baseline):
+    """(missing, new): cases only the baseline ran and cases only the report ran, as case strings."""
+    previous = index_cases(baseline["results"])
+    current = index_cases(report["results"])
+
+    missing = [format_case(key) for key in previous if key not in current]
+    new = [format_case(key) for key in current if key not in previous]
+    return missing, new
+
+
+def compare(report, baseline, threshold=0.1):
+    """
+    Regressions of report against baseline for cases present in both: throughput down, peak memory
+    up or best length worse by more than threshold (a fraction). unmatched_cases lists the rest.
+    """
+    previous = index_cases(baseline["results"])
+    regressions = []
+
+    for key, result in index_cases(report["results"]).items():
+        base = previous.get(key)
+        if base is None:
+            continue
+
+        checks = [
+            ("iterations_per_sec", result["iterations_per_sec"] < base["iterations_per_sec"] * (1.0 - threshold)),
+            ("peak_memory_mb", result["peak_memory_mb"] > base["peak_memory_mb"] * (1.0 + threshold)),
+            ("best_length", result["best_length"] > base["best_length"] * (1.0 + threshold)),
+        ]
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append({
+                    "case": format_case(key),
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": result[metric],
+                })
+
+    return regressions
+
+
+def format_result(result):
+    phases = ", ".join(f"{phase} {ms:.2f}" for phase, ms in result["phase_ms"].items())
+    return (f"{result['instance']:>20} n={result['n']:<5} ants={result['ants']:<4} "
+            f"{result['iterations_per_sec']:8.1f} it/s  peak {result['peak_memory_mb']:7.1f} MB  "
+            f"best {result['best_length']:10.1f}  [ms: {phases}]")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark", description="Benchmark AcoEngine throughput.")
+    parser.add_argument("--instances", nargs="+", choices=sorted(GENERATORS) + ["data"], default=["uniform", "clustered", "data"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--ants", nargs="+", type=int, default=DEFAULT_ANTS)
+    parser.add_argument("--iterations", type=int, default=20, help="iteration budget per case (default: 20)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--variant", choices=["as", "mmas", "acs"], default="as")
+    parser.add_argument("--local-search", choices=["all", "best"], default=None)
+    parser.add_argument("--symmetric", action="store_true")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative change before flagging (default: 0.1)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {"variant": args.variant, "local_search": args.local_search, "symmetric": args.symmetric}
+    try:
+        report = run_suite(args.instances, args.sizes, args.ants, args.iterations, args.seed, options, log=print)
+    except ValueError as error:
+        build_parser().error(str(error))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        regressions = compare(report, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} {regression['metric']}: "
+                  f"{regression['baseline']:.3f} -> {regression['current']:.3f}")
+
+        # a dropped or renamed case must not pass as "no regressions"
+        missing, new = unmatched_cases(report, baseline)
+        for case in missing:
+            print(f"MISSING {case}: in the baseline but not run")
+        for case in new:
+            print(f"NEW {case}: not in the baseline")
+
+        if regressions or missing:
+            return 1
+        print("no regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,3 @@
-import pygame
-
 # Layout constants
 LEFT_PANEL_WIDTH = 200
 CENTER_WIDTH = 800
@@ -13,6 +11,8 @@ TOP_PATH_COLORS = [(255, 100, 100), (255, 180, 80), (80, 180, 255)]
 BEST_COLOR = (0, 255, 0)
 PURPLE = (150, 80, 200)
 
-if not pygame.font.get_init():
-    pygame.font.init()
-SMALL_FONT = pygame.font.SysFont(None, 16)
\ No newline at end of file
+# pheromone edges drawn in the main panel: only the strongest K (None draws every edge)
+PHEROMONE_EDGE_LIMIT = 5000
+
+# also keep loaded/exported CSV coordinates in <file>.npy, memory-mapped on the next load
+VERTEX_SIDECARS = False
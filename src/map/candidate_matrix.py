@@ -0,0 +1,141 @@
+import numpy as np
+
+
+class CandidateMatrix:
+    """
+    n x n matrix that stores values for the candidate edges only: data[i, p] belongs to the edge
+    (i, lists[i, p]). Every other cell reads fill, times base[i, j] when a base matrix is given
+    (a choice table: fill = tau^alpha of an unstored trail, base = eta^beta); the diagonal reads 0.
+    Memory is O(n k) for (n, k) lists.
+
+    symmetric: (i, j) and (j, i) are one edge - writes go to the copy in each row that lists the
+    other vertex, and a read falls back to the mirrored copy when its own row does not list it.
+    Supports the indexing forms of SymmetricMatrix.
+    """
+    def __init__(self, lists, data=None, fill=0.0, base=None, symmetric=False, dtype=np.float64):
+        self.lists = lists
+        self.data = data if data is not None else np.full(lists.shape, fill, dtype=dtype)
+        self.fill = fill
+        self.base = base
+        self.symmetric = symmetric
+
+    @property
+    def n(self):
+        return len(self.lists)
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def size(self):
+        return self.n * self.n
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self.take(*key)
+
+        if np.ndim(key) == 0:
+            return self.rows(np.array([int(key)]))[0]
+
+        return self.rows(key)
+
+    def __setitem__(self, key, values):
+        rows, cols = key
+        rows, cols, values = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp), np.asarray(values)
+        )
+        for r, c in self._copies(rows, cols):
+            slots = self.slots(r, c)
+            stored = slots >= 0
+            self.data[r[stored], slots[stored]] = values[stored]
+
+    def add_at(self, rows, cols, values):
+        """Unbuffered add to the stored copies of each edge; edges outside the lists are dropped."""
+        rows, cols, values = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp), np.asarray(values)
+        )
+        for r, c in self._copies(rows, cols):
+            slots = self.slots(r, c)
+            stored = slots >= 0
+            np.add.at(self.data, (r[stored], slots[stored]), values[stored])
+
+    def _copies(self, rows, cols):
+        return ((rows, cols), (cols, rows)) if self.symmetric else ((rows, cols),)
+
+    def slots(self, rows, cols):
+        """Position of each cols entry in its row's list, -1 where the row does not list it."""
+        if not self.lists.shape[1]:
+            return np.full(np.shape(rows), -1, dtype=np.intp)
+
+        match = self.lists[rows] == np.asarray(cols)[..., None]
+        return np.where(match.any(axis=-1), match.argmax(axis=-1), -1)
+
+    def take(self, rows, cols):
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))
+        shape = rows.shape
+        rows, cols = rows.ravel(), cols.ravel()
+        values = np.empty(rows.shape, dtype=np.float64)
+
+        slots = self.slots(rows, cols)
+        stored = slots >= 0
+        values[stored] = self.data[rows[stored], slots[stored]]
+
+        missing = ~stored
+        if self.symmetric and missing.any():
+            where = np.flatnonzero(missing)
+            mirrored = self.slots(cols[where], rows[where])
+            found = mirrored >= 0
+            values[where[found]] = self.data[cols[where[found]], mirrored[found]]
+            missing[where[found]] = False
+
+        if missing.any():
+            values[missing] = self._unstored(rows[missing], cols[missing])
+        values[rows == cols] = 0.0
+        return values.reshape(shape)[()]
+
+    def rows(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        if self.base is None:
+            values = np.full((len(indices), self.n), self.fill, dtype=np.float64)
+        else:
+            values = self.fill * np.asarray(self.base[indices], dtype=np.float64)
+
+        np.put_along_axis(values, self.lists[indices], self.data[indices], axis=1)
+        values[np.arange(len(indices)), indices] = 0.0
+        return values
+
+    def _unstored(self, rows, cols):
+        if self.base is None:
+            return self.fill
+        return self.fill * np.asarray(self.base[rows, cols], dtype=np.float64)
+
+    def relabel(self, lists, labels, seed=None):
+        """
+        Carry the stored values over to new candidate lists after vertices were added or
+        swap-removed: vertex v of the new lists was vertex labels[v] before, and labels[v] >= n
+        marks a new vertex, whose edges start at seed[other end] (or fill).
+        """
+        n = self.n
+        rows = np.broadcast_to(np.arange(len(lists))[:, None], lists.shape)
+        old_rows, old_cols = labels[rows], labels[lists]
+
+        known = (old_rows < n) & (old_cols < n)
+        data = np.empty(lists.shape, dtype=self.data.dtype)
+        data[known] = self.take(old_rows[known], old_cols[known])
+
+        new = ~known
+        if seed is None:
+            data[new] = self.fill
+        else:
+            data[new] = np.asarray(seed)[np.where(old_rows[new] < n, old_rows[new], old_cols[new])]
+
+        self.lists = np.array(lists, dtype=np.intp)
+        self.data = data
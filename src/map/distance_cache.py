@@ -0,0 +1,67 @@
+"""
+On-disk cache of Graph distance matrices and neighbour lists, memory-mapped by later runs:
+
+    graph = Graph(0, distance_cache=DistanceCache("~/.cache/aco"))
+
+Entries are .npy files named after a hash of the coordinates and metric. They are written under a
+temporary name and renamed into place, so a concurrent run never maps a partial file. Distances
+are mapped read-only, so every process on a host shares one copy of the pages. Neighbour lists
+are mapped copy-on-write, because the graph edits them in place as vertices come and go.
+"""
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+# bump when the stored layout changes, so older entries are no longer matched
+FORMAT = 1
+
+
+def coordinates_key(xs, ys, metric):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{FORMAT}:{metric}:{len(xs)}:".encode())
+    digest.update(np.ascontiguousarray(xs, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(ys, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+class DistanceCache:
+    def __init__(self, directory):
+        # absolute, so worker processes resolve the same files
+        self.directory = os.path.abspath(os.path.expanduser(os.fspath(directory)))
+
+    def path(self, key, name):
+        return os.path.join(self.directory, f"{key}.{name}.npy")
+
+    def load(self, key, name, mode="r"):
+        """The array stored under (key, name), memory-mapped with mode, or None when there is none."""
+        try:
+            mapped = np.load(self.path(key, name), mmap_mode=mode)
+        except (FileNotFoundError, ValueError):
+            # missing, or unreadable (e.g. truncated by a crash) - computed and stored again
+            return None
+        # a plain ndarray over the map, so results of indexing it are ordinary arrays too
+        return mapped.view(np.ndarray)
+
+    def store(self, key, name, array, mode="r"):
+        """Write array under (key, name) and return it mapped back from the file."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temporary, self.path(key, name))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+        return self.load(key, name, mode)
+
+    def fetch(self, key, name, compute, mode="r"):
+        """The stored array, or compute() stored and mapped on a miss."""
+        array = self.load(key, name, mode)
+        if array is None:
+            array = self.store(key, name, compute(), mode)
+        return array
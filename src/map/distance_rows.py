@@ -0,0 +1,131 @@
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from src.map.metrics import pair_distances
+
+# whole rows kept by default: 256 rows of a 20k-vertex graph are 20 MB of float32
+CACHE_ROWS = 256
+
+
+class DistanceRows:
+    """
+    n x n distances of a Graph computed from its coordinates on demand, for graphs too large to
+    hold a matrix. Supports the indexing forms of SymmetricMatrix: element gathers m[rows, cols]
+    (and scalar m[i, j]) are computed directly; whole rows m[i] come from an LRU cache of at most
+    cache_rows read-only float32 rows, while row blocks m[rows] are computed without caching.
+    The graph clears the cache whenever its vertices change.
+    """
+    def __init__(self, graph, cache_rows=CACHE_ROWS):
+        self.graph = graph
+        self.cache_rows = cache_rows
+        self._rows = OrderedDict()
+
+    @property
+    def n(self):
+        return self.graph.num_vertices
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def size(self):
+        return self.n * self.n
+
+    @property
+    def dtype(self):
+        return np.dtype(np.float32)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if type(i) is int and type(j) is int:
+                return self.distance(i, j)
+            return self.take(i, j)
+
+        if np.ndim(key) == 0:
+            return self.row(int(key))
+
+        return self.rows(key)
+
+    def distance(self, i, j):
+        # plain-int fast path for scalar lookups in Python loops (2-opt)
+        graph = self.graph
+        if i == j:
+            return 0.0
+        if graph.metric == "euclidean":
+            return math.hypot(graph.xs[i] - graph.xs[j], graph.ys[i] - graph.ys[j])
+        return float(pair_distances(graph.metric, graph.xs[i], graph.ys[i], graph.xs[j], graph.ys[j]))
+
+    def take(self, rows, cols):
+        graph = self.graph
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp))
+
+        values = np.asarray(pair_distances(graph.metric, graph.xs[rows], graph.ys[rows], graph.xs[cols], graph.ys[cols]))
+        # GEO puts a point 1 km from itself
+        values[rows == cols] = 0.0
+        return values[()]
+
+    def row(self, i):
+        row = self._rows.get(i)
+        if row is not None:
+            self._rows.move_to_end(i)
+            return row
+
+        row = self.rows(np.array([i]))[0]
+        row.flags.writeable = False
+
+        self._rows[i] = row
+        if len(self._rows) > self.cache_rows:
+            self._rows.popitem(last=False)
+        return row
+
+    def rows(self, indices):
+        # bulk sweeps (neighbour lists) would only evict the rows worth keeping
+        graph = self.graph
+        indices = np.asarray(indices, dtype=np.intp)
+
+        values = pair_distances(graph.metric, graph.xs[indices, None], graph.ys[indices, None], graph.xs, graph.ys)
+        values[np.arange(len(indices)), indices] = 0.0
+        return values.astype(np.float32)
+
+    def clear(self):
+        self._rows.clear()
+
+
+class HeuristicRows:
+    """eta^beta = (1 / d)^beta over a DistanceRows, 0 wherever the distance is 0; same indexing forms, float64 values."""
+    def __init__(self, distances, beta=1.0):
+        self.distances = distances
+        self.beta = beta
+
+    @property
+    def n(self):
+        return self.distances.n
+
+    @property
+    def shape(self):
+        return self.distances.shape
+
+    def __len__(self):
+        return self.distances.n
+
+    def __getitem__(self, key):
+        return self.power(self.distances[key])
+
+    def power(self, distances):
+        distances = np.asarray(distances, dtype=np.float64)
+        heuristic = np.zeros_like(distances)
+        np.divide(1.0, distances, out=heuristic, where=distances > 0)
+
+        if self.beta != 1.0:
+            powered = heuristic ** self.beta
+            # keep the diagonal at 0 even for beta == 0
+            powered[heuristic == 0] = 0.0
+            heuristic = powered
+        return heuristic[()]
@@ -1,51 +1,524 @@
-import random
+import numpy as np
 
-from src.map.vertice import Vertice
+from src.map.vertice import Vertices
+from src.map.symmetric_matrix import SymmetricMatrix
+from src.map.resize import append_vertex, swap_remove_vertex
+from src.map.metrics import PLANAR_METRICS, check_metric, pair_distances
+from src.map.spatial_index import GridIndex
+from src.map.distance_rows import DistanceRows, HeuristicRows
+from src.map.distance_cache import coordinates_key
 from src.config import CENTER_WIDTH, SCREEN_HEIGHT
 
+# (width, height) extents of random vertex placement when no bounds are given - the UI canvas
+DEFAULT_BOUNDS = (CENTER_WIDTH - 20, SCREEN_HEIGHT - 20)
+
+# vertex count from which neighbour queries go through a GridIndex instead of distance rows
+SPATIAL_INDEX_THRESHOLD = 1000
+
+# vertex count from which AcoEngine runs its graph matrix-free (see Graph.matrix_free)
+MATRIX_FREE_THRESHOLD = 5000
+
+
+def fit_display(xs, ys, bounds=DEFAULT_BOUNDS, force=False):
+    """
+    (offset_x, offset_y, scale) mapping coordinates onto a bounds-sized canvas with the aspect
+    ratio kept, or None when they already lie on it (unless force).
+    """
+    if len(xs) == 0:
+        return None
+
+    min_x, max_x = float(np.min(xs)), float(np.max(xs))
+    min_y, max_y = float(np.min(ys)), float(np.max(ys))
+    if not force and min_x >= 0 and min_y >= 0 and max_x <= bounds[0] and max_y <= bounds[1]:
+        return None
+
+    scale = min(bounds[0] / max(max_x - min_x, 1e-12), bounds[1] / max(max_y - min_y, 1e-12))
+    return (min_x, min_y, scale)
+
+
+def to_canvas(display, xs, ys):
+    if display is None:
+        return xs, ys
+    offset_x, offset_y, scale = display
+    return (xs - offset_x) * scale, (ys - offset_y) * scale
+
+
+def from_canvas(display, x, y):
+    if display is None:
+        return x, y
+    offset_x, offset_y, scale = display
+    return x / scale + offset_x, y / scale + offset_y
+
 
 class Graph:
-    def __init__(self, num_vertices):
+    def __init__(self, num_vertices, symmetric=False, bounds=None, rng=None, matrix_free=False, distance_cache=None):
         self.best_path = None
         self.best_path_length = float('inf')
 
         self.last_iteration_paths = []
 
-        self.num_vertices = num_vertices
+        # random placement draws integer coordinates from [0, width) x [0, height)
+        self.bounds = tuple(bounds) if bounds is not None else DEFAULT_BOUNDS
+
+        # struct-of-arrays coordinates; Graph.vertices hands out Vertice views over them
+        rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        width, height = self.bounds
+        self.xs = rng.integers(0, width, num_vertices).astype(np.float64)
+        self.ys = rng.integers(0, height, num_vertices).astype(np.float64)
+
+        # bumped whenever distances are recomputed so cached derivatives know when to refresh
+        self.version = 0
 
-        self.vertices = [
-            Vertice(random.randint(0, CENTER_WIDTH - 20), random.randint(0, SCREEN_HEIGHT - 20))
-            for _ in range(num_vertices)
-        ]
+        # symmetric mode keeps distances/heuristics as condensed upper triangles (SymmetricMatrix)
+        self.symmetric = symmetric
+        # matrix-free mode computes distances and heuristics from the coordinates on demand
+        # (DistanceRows, HeuristicRows) instead of holding n x n matrices; explicit graphs stay dense
+        self.matrix_free = matrix_free
+
+        # how distances follow from coordinates (see metrics.METRICS), or "explicit" for a given matrix
+        self.metric = "euclidean"
+        self._explicit = None
+        # display-only (offset_x, offset_y, scale) onto the canvas for instances in their own units (see fit_display)
+        self.display = None
+
+        # set when coordinates were replaced wholesale and distances wait for calculate_distances()
+        self._stale = False
+
+        # DistanceCache: distances and neighbour lists are mapped from it instead of computed when
+        # it already holds them for these coordinates and metric; distance_file is the mapped
+        # distances' path while distance_matrix still is that file (for worker processes)
+        self.distance_cache = distance_cache
+        self.distance_file = None
+
+        self.distance_matrix = np.zeros((0, 0))
+        self.heuristic_matrix = np.zeros((0, 0))
+        self._heuristic_cache = {}
+
+        # k nearest neighbours per vertex, (n, k) sorted by distance; None disables candidate lists
+        self.candidate_list_size = None
+        self.candidate_lists = None
+
+        # GridIndex over xs/ys, built on first use once num_vertices >= spatial_index_threshold
+        self.spatial_index_threshold = SPATIAL_INDEX_THRESHOLD
+        self._spatial_index = None
 
-        self.distance_matrix = []
         self.calculate_distances()
-        
+
+
+    @property
+    def num_vertices(self):
+        return len(self.xs)
+
+    @property
+    def vertices(self):
+        return Vertices(self)
+
+    @vertices.setter
+    def vertices(self, vertices):
+        vertices = list(vertices)
+        self.set_vertices([v.x for v in vertices], [v.y for v in vertices])
+
+    @property
+    def last_iteration_paths(self):
+        # (tour, length) lists are built from the recorded arrays only when someone reads them
+        if self._last_iteration_paths is None:
+            tours, lengths = self.last_iteration
+            self._last_iteration_paths = list(zip(tours.tolist(), lengths.tolist()))
+        return self._last_iteration_paths
+
+    @last_iteration_paths.setter
+    def last_iteration_paths(self, paths):
+        self._last_iteration_paths = list(paths)
+        self.last_iteration = None
+
+    def record_iteration(self, tours, lengths):
+        """Keep an iteration's (m, n+1) tours and (m,) lengths; last_iteration_paths lists them on demand."""
+        self.last_iteration = (tours, lengths)
+        self._last_iteration_paths = None
+
+    def set_vertices(self, xs, ys, metric=None):
+        """Replace every vertex; call calculate_distances()/rebuild() afterwards."""
+        xs = np.array(xs, dtype=np.float64).ravel()
+        ys = np.array(ys, dtype=np.float64).ravel()
+        if xs.shape != ys.shape:
+            raise ValueError("xs and ys must have the same length")
+
+        if metric is not None:
+            self.metric = check_metric(metric)
+        elif self.metric == "explicit":
+            self.metric = "euclidean"
+        self._explicit = None
+
+        self.xs, self.ys = xs, ys
+        self._spatial_index = None
+        self._stale = True
+
+    def set_explicit_distances(self, matrix):
+        """Use a given (n, n) distance matrix instead of a metric; coordinates then only place vertices on screen."""
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.shape != (self.num_vertices, self.num_vertices):
+            raise ValueError(f"expected a {self.num_vertices}x{self.num_vertices} distance matrix, got {matrix.shape}")
+
+        np.fill_diagonal(matrix, 0.0)
+        self.metric = "explicit"
+        self._explicit = matrix
+        self._stale = True
+
+    def is_symmetric(self):
+        """Whether d[i, j] == d[j, i] everywhere; only an explicit matrix (e.g. an ATSP instance) can break it."""
+        return self.metric != "explicit" or bool(np.allclose(self._explicit, self._explicit.T))
+
+    def add_vertices(self, xs, ys):
+        """
+        Append vertices in bulk and return their indices. Once distances are computed this is
+        incremental: O(n) per vertex for distances, candidate lists and the best tour.
+        """
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        if xs.shape != ys.shape:
+            raise ValueError("xs and ys must have the same length")
+
+        start = self.num_vertices
+        if self._stale:
+            self.xs = np.concatenate([self.xs, xs])
+            self.ys = np.concatenate([self.ys, ys])
+        else:
+            for x, y in zip(xs.tolist(), ys.tolist()):
+                self.add_vertex(x, y)
+
+        return np.arange(start, self.num_vertices)
+
+    def remove_vertices(self, indices):
+        """
+        Remove vertices in bulk by swap-remove (see remove_vertex), highest index first so the
+        remaining indices stay valid; incremental once distances are computed.
+        """
+        n = self.num_vertices
+        indices = np.asarray(indices, dtype=np.intp).ravel()
+        if indices.size and (indices.min() < -n or indices.max() >= n):
+            raise IndexError("vertex index out of range")
+
+        for index in sorted(set((indices % max(n, 1)).tolist()), reverse=True):
+            self.remove_vertex(index)
+
+    def add_vertex(self, x, y):
+        """Insert one vertex in O(n) and cheapest-insert it into the best tour; returns its index."""
+        if self.metric == "explicit":
+            raise ValueError("vertices of an explicit distance matrix cannot be added")
+
+        v = self.num_vertices
+        self.xs = np.append(self.xs, x)
+        self.ys = np.append(self.ys, y)
+        if self._spatial_index is not None:
+            self._spatial_index.insert(x, y)
+
+        if self._stale:
+            return v
+
+        distances = pair_distances(self.metric, self.xs[:v], self.ys[:v], x, y)
+        if isinstance(self.distance_matrix, DistanceRows):
+            self.distance_matrix.clear()
+        else:
+            heuristic = np.zeros_like(distances)
+            np.divide(1.0, distances, out=heuristic, where=distances > 0)
+
+            self.distance_matrix = append_vertex(self.distance_matrix, distances)
+            self.distance_file = None
+            self.heuristic_matrix = append_vertex(self.heuristic_matrix, heuristic)
+            for beta, powered in self._heuristic_cache.items():
+                values = heuristic ** beta
+                values[heuristic == 0] = 0.0
+                self._heuristic_cache[beta] = append_vertex(powered, values)
+
+        self._insert_candidates(v, distances)
+        self._insert_into_best_path(v)
+        self.last_iteration_paths = []
+        self.version += 1
+
+        return v
+
+    def remove_vertex(self, index):
+        """
+        Remove one vertex in O(n) by swap-remove: the last vertex takes over its index.
+        The best tour drops the vertex and reconnects its neighbours.
+        """
+        last = self.num_vertices - 1
+        if not 0 <= index <= last:
+            raise IndexError("vertex index out of range")
+        if self.metric == "explicit":
+            raise ValueError("vertices of an explicit distance matrix cannot be removed")
+
+        # before the coordinates move: on-demand distances follow them
+        if not self._stale:
+            self._remove_from_best_path(index, last)
+
+        self.xs[index] = self.xs[last]
+        self.ys[index] = self.ys[last]
+        self.xs = self.xs[:last]
+        self.ys = self.ys[:last]
+        # swap-remove renumbers a vertex; rebuilt on the next query
+        self._spatial_index = None
+
+        if self._stale:
+            return
+
+        if isinstance(self.distance_matrix, DistanceRows):
+            self.distance_matrix.clear()
+        else:
+            self.distance_matrix = swap_remove_vertex(self.distance_matrix, index)
+            self.distance_file = None
+            self.heuristic_matrix = swap_remove_vertex(self.heuristic_matrix, index)
+            for beta, powered in self._heuristic_cache.items():
+                self._heuristic_cache[beta] = swap_remove_vertex(powered, index)
+
+        self._remove_candidates(index, last)
+        self.last_iteration_paths = []
+        self.version += 1
+
+    def _insert_candidates(self, v, distances):
+        if self.candidate_list_size is None:
+            return
+
+        lists = self.candidate_lists
+        width = max(0, min(self.candidate_list_size, v))
+        if lists is None or width == 0 or lists.shape[1] != width:
+            # list width still growing (n <= k) - cheap to rebuild outright
+            self.build_candidate_lists()
+            return
+
+        # existing vertices whose k-th neighbour is farther than the new vertex
+        kth = self.distance_matrix[np.arange(v), lists[:, -1]]
+        for i in np.flatnonzero(distances < kth).tolist():
+            row = lists[i]
+            pos = np.searchsorted(self.distance_matrix[i, row], distances[i], side="right")
+            lists[i, pos + 1:] = row[pos:-1].copy()
+            lists[i, pos] = v
+
+        self.candidate_lists = np.vstack([lists, self._nearest_rows(np.array([v]), width)])
+
+    def _remove_candidates(self, index, last):
+        if self.candidate_list_size is None:
+            return
+
+        lists = self.candidate_lists
+        width = max(0, min(self.candidate_list_size, last - 1))
+        if lists is None or width == 0 or lists.shape[1] != width:
+            self.build_candidate_lists()
+            return
+
+        stale = (lists == index).any(axis=1)
+        lists[lists == last] = index
+        lists[index] = lists[last]
+        stale[index] = stale[last]
+
+        lists = lists[:last]
+        rows = np.flatnonzero(stale[:last])
+        if rows.size:
+            lists[rows] = self._nearest_rows(rows, width)
+        self.candidate_lists = lists
+
+    def _insert_into_best_path(self, v):
+        if not self.best_path:
+            return
+
+        tour = np.asarray(self.best_path[:-1], dtype=np.intp)
+        following = np.roll(tour, -1)
+        d = self.distance_matrix
+        costs = d[tour, v] + d[v, following] - d[tour, following]
+
+        pos = int(np.argmin(costs))
+        order = tour.tolist()
+        order.insert(pos + 1, v)
+
+        self.best_path = order + [order[0]]
+        self.best_path_length += float(costs[pos])
+
+    def _remove_from_best_path(self, index, last):
+        if not self.best_path:
+            return
+
+        order = list(self.best_path[:-1])
+        if len(order) <= 1:
+            self.best_path = None
+            self.best_path_length = float('inf')
+            return
+
+        pos = order.index(index)
+        prev, following = order[pos - 1], order[(pos + 1) % len(order)]
+        d = self.distance_matrix
+        self.best_path_length += float(d[prev, following] - d[prev, index] - d[index, following])
+
+        del order[pos]
+        order = [index if v == last else v for v in order]
+        self.best_path = order + [order[0]]
 
     def calculate_distances(self):
-        matrix = {}
+        xs, ys = self.xs, self.ys
+        self._stale = False
+        self.distance_file = None
+
+        if self.matrix_free and self.metric != "explicit":
+            self.distance_matrix = DistanceRows(self)
+            self.heuristic_matrix = HeuristicRows(self.distance_matrix)
+            self._heuristic_cache = {}
+            self.build_candidate_lists()
+            self.version += 1
+            return
 
-        for i, vertice_a in enumerate(self.vertices):
-            matrix[i] = {}
+        if self.metric == "explicit":
+            matrix = SymmetricMatrix.from_dense(self._explicit) if self.symmetric else self._explicit.copy()
+            values = matrix.data if self.symmetric else matrix
+        elif self._cache_key() is not None:
+            matrix = self._cached_distances()
+            values = matrix.data if self.symmetric else matrix
+        else:
+            matrix = self._compute_distances()
+            values = matrix.data if self.symmetric else matrix
 
-            for j, vertice_b in enumerate(self.vertices):
-                if i == j:
-                    matrix[i][j] = 0.0
-                else:
-                    matrix[i][j] = vertice_a.distance_to(vertice_b)
+        # eta = 1/d, with 0 wherever the distance is 0 (diagonal, duplicated points)
+        heuristic_values = np.zeros(values.shape)
+        np.divide(1.0, values, out=heuristic_values, where=values > 0)
 
         self.distance_matrix = matrix
-    
+        if self.symmetric:
+            self.heuristic_matrix = SymmetricMatrix(len(xs), data=heuristic_values)
+        else:
+            self.heuristic_matrix = heuristic_values
+        self._heuristic_cache = {}
+        self.build_candidate_lists()
+        self.version += 1
+
+    def _compute_distances(self):
+        xs, ys = self.xs, self.ys
+        if self.symmetric:
+            return self._condensed_distances(xs, ys, self.metric)
+
+        matrix = pair_distances(self.metric, xs[:, None], ys[:, None], xs[None, :], ys[None, :])
+        # GEO puts a point 1 km from itself
+        np.fill_diagonal(matrix, 0.0)
+        return matrix
+
+    def _cache_key(self):
+        """distance_cache key of the current coordinates and metric, or None when nothing is cached."""
+        if self.distance_cache is None or self.metric == "explicit" or self.num_vertices < 2:
+            return None
+        return coordinates_key(self.xs, self.ys, self.metric)
+
+    def _cached_distances(self):
+        """Distances mapped read-only from distance_cache, computed and stored there first on a miss."""
+        key = self._cache_key()
+        name = "condensed" if self.symmetric else "dense"
+
+        def compute():
+            matrix = self._compute_distances()
+            return matrix.data if self.symmetric else matrix
+
+        values = self.distance_cache.fetch(key, name, compute)
+        self.distance_file = self.distance_cache.path(key, name)
+        return SymmetricMatrix(self.num_vertices, data=values) if self.symmetric else values
+
+    @staticmethod
+    def _condensed_distances(xs, ys, metric="euclidean"):
+        """Fill the condensed upper triangle one column (all i < j for a fixed j) at a time."""
+        n = len(xs)
+        matrix = SymmetricMatrix(n)
+
+        for j in range(1, n):
+            start = j * (j - 1) // 2
+            matrix.data[start:start + j] = pair_distances(metric, xs[:j], ys[:j], xs[j], ys[j])
+
+        return matrix
+
+    def set_candidate_list_size(self, k):
+        self.candidate_list_size = k
+        self.build_candidate_lists()
+        self.version += 1
+
+    def build_candidate_lists(self):
+        if self.candidate_list_size is None:
+            self.candidate_lists = None
+            return
+
+        self.candidate_lists = self.nearest_neighbours(self.candidate_list_size)
+
+    def spatial_index(self):
+        """
+        GridIndex over the vertices for k-nearest and radius queries, or None below
+        spatial_index_threshold and for metrics the coordinates cannot rank (geo, explicit).
+        """
+        if self.metric not in PLANAR_METRICS or self.num_vertices < self.spatial_index_threshold:
+            return None
+
+        if self._spatial_index is None or len(self._spatial_index) != self.num_vertices:
+            self._spatial_index = GridIndex(self.xs, self.ys)
+        return self._spatial_index
+
+    def nearest_neighbours(self, k):
+        """(n, k) indices of each vertex's k nearest other vertices, closest first."""
+        n = self.num_vertices
+        k = max(0, min(k, n - 1))
+
+        if k == 0:
+            return np.zeros((n, 0), dtype=np.intp)
+
+        key = self._cache_key()
+        if key is not None:
+            # copy-on-write: candidate list edits stay private to this process
+            return self.distance_cache.fetch(key, f"neighbours-{k}", lambda: self._compute_neighbours(k), mode="c")
+        return self._compute_neighbours(k)
+
+    def _compute_neighbours(self, k):
+        n = self.num_vertices
+        index = self.spatial_index()
+        if index is not None:
+            return index.neighbours(k)
+
+        neighbours = np.empty((n, k), dtype=np.intp)
+
+        # row blocks keep the temporary at block x n even for condensed storage
+        block = max(1, min(n, 2**22 // max(n, 1)))
+        for start in range(0, n, block):
+            indices = np.arange(start, min(start + block, n))
+            neighbours[indices] = self._nearest_rows(indices, k)
+
+        return neighbours
+
+    def _nearest_rows(self, indices, k):
+        index = self.spatial_index()
+        if index is not None:
+            rows = [index.query(self.xs[i], self.ys[i], k, exclude=i) for i in indices.tolist()]
+            return np.array(rows, dtype=np.intp).reshape(len(indices), k)
+
+        distances = np.array(self.distance_matrix[indices], dtype=np.float64)
+        distances[np.arange(len(indices)), indices] = np.inf
+
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+        return np.take_along_axis(nearest, order, axis=1)
+
+    def get_heuristic(self, beta):
+        """Return eta**beta, computed once per beta value."""
+        powered = self._heuristic_cache.get(beta)
+
+        if powered is None and isinstance(self.heuristic_matrix, HeuristicRows):
+            powered = HeuristicRows(self.distance_matrix, beta)
+            self._heuristic_cache = {beta: powered}
+        elif powered is None:
+            heuristic = self.heuristic_matrix.data if self.symmetric else self.heuristic_matrix
+            values = heuristic ** beta
+            # keep the diagonal at 0 even for beta == 0
+            values[heuristic == 0] = 0.0
+
+            powered = SymmetricMatrix(self.heuristic_matrix.n, data=values) if self.symmetric else values
+            self._heuristic_cache = {beta: powered}
+
+        return powered
+
     def get_edge_grade(self, i, j):
-        d = self.distance_matrix[i][j]
+        return self.heuristic_matrix[i, j]
 
-        if d <= 0:
-            return 0.0
-        
-        return 1 / d
-    
     def rebuild(self):
         self.calculate_distances()
         self.last_iteration_paths = []
         self.best_path = None
-        self.best_path_length = float('inf')
\ No newline at end of file
+        self.best_path_length = float('inf')
@@ -0,0 +1,57 @@
+import numpy as np
+
+# TSPLIB's earth radius (km) and pi for GEO distances
+GEO_RADIUS = 6378.388
+GEO_PI = 3.141592
+
+# "euclidean" - plain float distances (the canvas default); the rest follow the TSPLIB
+# EDGE_WEIGHT_TYPEs of the same name, so tour lengths match published optima
+METRICS = ("euclidean", "euc_2d", "ceil_2d", "att", "geo")
+
+# metrics that never decrease as the Euclidean distance grows, so a spatial index over the raw
+# coordinates ranks neighbours the same way (GEO coordinates are angles, not positions)
+PLANAR_METRICS = ("euclidean", "euc_2d", "ceil_2d", "att")
+
+
+def check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"unknown metric {metric!r}, expected one of {', '.join(METRICS)}")
+    return metric
+
+
+def _geo_radians(values):
+    """TSPLIB GEO coordinates are DDD.MM (degrees, minutes)."""
+    degrees = np.trunc(values)
+    minutes = values - degrees
+    return GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def pair_distances(metric, x1, y1, x2, y2):
+    """Distances between the points (x1, y1) and (x2, y2), broadcast like numpy arithmetic."""
+    if metric == "geo":
+        # x is the latitude, y the longitude
+        lat1, lon1 = _geo_radians(np.asarray(x1, dtype=np.float64)), _geo_radians(np.asarray(y1, dtype=np.float64))
+        lat2, lon2 = _geo_radians(np.asarray(x2, dtype=np.float64)), _geo_radians(np.asarray(y2, dtype=np.float64))
+        q1 = np.cos(lon1 - lon2)
+        q2 = np.cos(lat1 - lat2)
+        q3 = np.cos(lat1 + lat2)
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(GEO_RADIUS * np.arccos(cosine) + 1.0)
+
+    dx = np.subtract(x1, x2, dtype=np.float64)
+    dy = np.subtract(y1, y2, dtype=np.float64)
+    squared = dx * dx + dy * dy
+
+    if metric == "euclidean":
+        return np.sqrt(squared)
+    if metric == "euc_2d":
+        return np.floor(np.sqrt(squared) + 0.5)
+    if metric == "ceil_2d":
+        return np.ceil(np.sqrt(squared))
+    if metric == "att":
+        # pseudo-Euclidean: nint(r), bumped up when it rounded below r
+        r = np.sqrt(squared / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1.0, t)
+
+    raise ValueError(f"metric {metric!r} has no coordinate formula")
@@ -1,48 +1,301 @@
+from collections import deque
 
+import numpy as np
+
+from src.map.symmetric_matrix import SymmetricMatrix
+from src.map.candidate_matrix import CandidateMatrix
+from src.map.resize import append_vertex, swap_remove_vertex
 
 
 class PheromoneMatrix:
-    def __init__(self, vertex_count, evaporation_rate):
+    # fold the lazy evaporation scale into the stored values before the unscaled values can overflow
+    FOLD_THRESHOLD = 1e-30
+
+    def __init__(self, vertex_count, evaporation_rate, dtype=np.float64, symmetric=False, candidates=None):
 
         self.vertex_count = vertex_count
         self.evaporation_rate = evaporation_rate
-        self.current = self.init_pheromones(1.0)
-        self.pending = self.init_pheromones(0.0)
+        self.dtype = np.dtype(dtype)
+        # symmetric: one condensed cell per undirected edge, so (i, j) and (j, i) share their trail
+        self.symmetric = symmetric
+        # (n, k) candidate lists: store trails for those edges only (CandidateMatrix, O(n k) memory);
+        # every other edge stays at the level of the last reset, evaporated along with the rest
+        self.candidates = None if candidates is None else np.array(candidates, dtype=np.intp)
+
+        # bumped on every update so cached derivatives (choice info, UI layers) know when to refresh
+        self.version = 0
+        # last version at which every cell may have changed; later versions only touched logged edges
+        self.full_version = 0
+        self._change_log = deque(maxlen=32)
+
+        # true pheromone level = raw * scale; evaporation only shrinks scale
+        self.raw = self.init_pheromones(1.0)
+        self.scale = 1.0
+
+        # bounds on the true levels (MAX-MIN), applied lazily - see set_bounds; (0, inf) is unbounded
+        self.tau_min = 0.0
+        self.tau_max = float('inf')
+
+        # sparse touched-edge buffer of deposits for the current iteration
+        self._pending_rows = []
+        self._pending_cols = []
+        self._pending_deltas = []
+
+    @property
+    def current(self):
+        """Stored pheromone levels (dense or SymmetricMatrix); folds any lazy evaporation first so they are writable as-is."""
+        self.fold()
+        return self.raw
+
+    @property
+    def pending(self):
+        """Dense view of the buffered deposits (built on demand, for inspection only)."""
+        matrix = self.init_pheromones(0.0)
+        rows, cols, deltas = self._pending_arrays()
+        self._add_at(matrix, rows, cols, deltas)
+        return matrix
+
+    @property
+    def raw_floor(self):
+        """tau_min in stored units: whoever reads raw directly sees max(raw, raw_floor)."""
+        return self.tau_min / self.scale
+
+    def levels(self):
+        """True pheromone levels without folding the scale; treat the result as read-only."""
+        if self.scale == 1.0 and self.tau_min == 0.0:
+            return self.raw
+
+        scale, floor = self.scale, self.tau_min
+        if self.candidates is not None:
+            return CandidateMatrix(
+                self.raw.lists, np.maximum(self.raw.data * scale, floor), max(self.raw.fill * scale, floor), symmetric=self.symmetric
+            )
+        if self.symmetric:
+            return SymmetricMatrix(self.vertex_count, data=np.maximum(self.raw.data * scale, floor))
+
+        levels = np.maximum(self.raw * scale, floor)
+        np.fill_diagonal(levels, 0.0)
+        return levels
 
     def init_pheromones(self, lvl):
-        matrix = {}
-        
-        for i in range(self.vertex_count):
-            matrix[i] = {}
-            for j in range(self.vertex_count):
-                if i != j:
-                    matrix[i][j] = lvl
-                else:
-                  matrix[i][j] = 0.0
-        
+        if self.candidates is not None:
+            return CandidateMatrix(self.candidates, fill=lvl, symmetric=self.symmetric, dtype=self.dtype)
+        if self.symmetric:
+            return SymmetricMatrix(self.vertex_count, lvl, dtype=self.dtype)
+
+        matrix = np.full((self.vertex_count, self.vertex_count), lvl, dtype=self.dtype)
+        np.fill_diagonal(matrix, 0.0)
+
         return matrix
-    
-    def reset_pending(self):
-        for i in range(self.vertex_count):
-            for j in range(self.vertex_count):
 
-                self.pending[i][j] = 0.0
+    @property
+    def _values(self):
+        """The stored cells as one flat-or-square ndarray, for whole-matrix fills, clips and scaling."""
+        return self.raw if isinstance(self.raw, np.ndarray) else self.raw.data
+
+    def _fill(self, lvl):
+        self._values.fill(lvl)
+        if self.candidates is not None:
+            self.raw.fill = lvl
+        elif not self.symmetric:
+            np.fill_diagonal(self.raw, 0.0)
+
+    @staticmethod
+    def _add_at(matrix, rows, cols, deltas):
+        if isinstance(matrix, (SymmetricMatrix, CandidateMatrix)):
+            matrix.add_at(rows, cols, deltas)
+        else:
+            np.add.at(matrix, (rows, cols), deltas)
+
+    def reset_pending(self):
+        self._pending_rows = []
+        self._pending_cols = []
+        self._pending_deltas = []
 
     def apply_pending(self):
-        n = self.vertex_count
-        pm = self.current
-        pend = self.pending
+        """Evaporate (lazily, by scale) and add the buffered deposits - cost scales with the edges walked."""
+        self.evaporate()
+        self.deposit_pending()
 
-        for i in range(self.vertex_count):
-            for j in range(self.vertex_count):
-                self.current[i][j] *= self.evaporation_rate
+    def evaporate(self):
+        """One evaporation step; O(1) except for the rare fold or a zero rate."""
+        if self.evaporation_rate > 0.0:
+            self.scale *= self.evaporation_rate
+            if self.tau_min > 0.0:
+                # cells resting on the floor no longer shrink with the rest
+                self._mark_full_change()
+        else:
+            self._fill(0.0)
+            self.scale = 1.0
+            self._mark_full_change()
 
-        for i in range(self.vertex_count):
-            for j in range(self.vertex_count):
-                self.current[i][j] += self.pending[i][j]
+        if self.scale < self.FOLD_THRESHOLD:
+            self.fold()
 
-                self.pending[i][j] = 0.0
+    def deposit_pending(self):
+        """Add the buffered deposits and clear the buffer."""
+        rows, cols, deltas = self._pending_arrays()
+        bounded = len(rows) and (self.tau_min > 0.0 or self.tau_max < np.inf)
+
+        if bounded:
+            # a deposit lands on top of the floor, not on the (lazily floored) stored value
+            self.raw[rows, cols] = np.maximum(self.raw[rows, cols], self.raw_floor)
+        self._add_at(self.raw, rows, cols, deltas / self.scale)
+        if bounded:
+            self.raw[rows, cols] = np.minimum(self.raw[rows, cols], self.tau_max / self.scale)
+
+        self.reset_pending()
+        self._mark_edges_changed(rows, cols)
 
     def add_pending(self, i, j, delta):
-        self.pending[i][j] += delta
+        self._pending_rows.append(i)
+        self._pending_cols.append(j)
+        self._pending_deltas.append(delta)
+
+    def add_pending_edges(self, rows, cols, deltas):
+        """Vectorized add_pending for many (possibly repeated) edges at once."""
+        self._pending_rows.append(np.asarray(rows, dtype=np.intp).ravel())
+        self._pending_cols.append(np.asarray(cols, dtype=np.intp).ravel())
+        self._pending_deltas.append(np.asarray(deltas, dtype=np.float64).ravel())
+
+    def _pending_arrays(self):
+        if not self._pending_rows:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+
+        rows = np.concatenate([np.atleast_1d(r) for r in self._pending_rows]).astype(np.intp, copy=False)
+        cols = np.concatenate([np.atleast_1d(c) for c in self._pending_cols]).astype(np.intp, copy=False)
+        deltas = np.concatenate([np.atleast_1d(d) for d in self._pending_deltas]).astype(np.float64, copy=False)
+
+        return rows, cols, deltas
+
+    def fold(self):
+        """Multiply the lazy scale and floor into the stored values (an O(n^2) pass, needed only rarely)."""
+        if self.scale == 1.0 and self.tau_min == 0.0:
+            return
+
+        np.multiply(self._values, self.scale, out=self._values)
+        if self.candidates is not None:
+            self.raw.fill *= self.scale
+        self.scale = 1.0
+        if self.tau_min > 0.0:
+            self._clip(self.tau_min, np.inf)
+        self._mark_full_change()
+
+    def reset(self, lvl):
+        """Reinitialize every edge to lvl (e.g. MAX-MIN restarts)."""
+        self._fill(lvl)
+        self.scale = 1.0
+        self._mark_full_change()
+
+    def clamp(self, tau_min, tau_max):
+        """Bound every edge to [tau_min, tau_max] once, in place; the diagonal stays 0. See set_bounds for lasting bounds."""
+        self.fold()
+        self._clip(tau_min, tau_max)
+        self._mark_full_change()
+
+    def set_bounds(self, tau_min, tau_max):
+        """
+        Keep every true level inside [tau_min, tau_max] from now on without a pass over the matrix:
+        tau_min is a floor applied wherever levels are read, and deposits are capped at tau_max.
+        Only lowering the floor or the cap (rare - MAX-MIN bounds grow as the best tour shortens)
+        rewrites the stored values.
+        """
+        if tau_min < self.tau_min or tau_max < self.tau_max:
+            # cells resting on the old floor keep it, and cells above the new cap come down
+            self.fold()
+            self._clip(0.0, tau_max)
+
+        if (tau_min, tau_max) != (self.tau_min, self.tau_max):
+            self.tau_min, self.tau_max = tau_min, tau_max
+            self._mark_full_change()
+
+    def _clip(self, tau_min, tau_max):
+        np.clip(self._values, tau_min, tau_max, out=self._values)
+        if self.candidates is not None:
+            self.raw.fill = min(max(self.raw.fill, tau_min), tau_max)
+        elif not self.symmetric:
+            np.fill_diagonal(self.raw, 0.0)
+
+    def add_vertex(self, levels, candidates=None):
+        """
+        Append a vertex whose trails to the existing vertices start at levels (true levels, scalar
+        or per edge). Candidate storage also needs the graph's updated candidate lists.
+        """
+        seed = np.broadcast_to(np.asarray(levels, dtype=np.float64) / self.scale, (self.vertex_count,))
+        if self.candidates is not None:
+            self._relabel(candidates, np.arange(self.vertex_count + 1), seed)
+        else:
+            self.raw = append_vertex(self.raw, seed.astype(self.dtype))
+        self.vertex_count += 1
+
+        self.reset_pending()
+        self._mark_full_change()
+
+    def remove_vertex(self, index, candidates=None):
+        """Swap-remove a vertex, mirroring Graph.remove_vertex: the last vertex takes over index."""
+        if self.candidates is not None:
+            labels = np.arange(self.vertex_count - 1)
+            if index < len(labels):
+                labels[index] = self.vertex_count - 1
+            self._relabel(candidates, labels)
+        else:
+            self.raw = swap_remove_vertex(self.raw, index)
+        self.vertex_count -= 1
+
+        self.reset_pending()
+        self._mark_full_change()
+
+    def _relabel(self, candidates, labels, seed=None):
+        # a copy: the graph edits its lists in place
+        self.candidates = np.array(candidates, dtype=np.intp)
+        self.raw.relabel(self.candidates, labels, seed)
+
+    def edge_levels(self):
+        """(rows, cols, levels) of every stored undirected edge once, rows < cols, without folding the scale."""
+        n = self.vertex_count
+        if self.candidates is not None:
+            rows = np.repeat(np.arange(n), self.candidates.shape[1])
+            cols = self.candidates.ravel()
+            keys = np.unique(np.minimum(rows, cols) * n + np.maximum(rows, cols))
+            rows, cols = keys // n, keys % n
+        else:
+            rows, cols = np.triu_indices(n, k=1)
+
+        return rows, cols, np.asarray(self.levels()[rows, cols], dtype=np.float64)
+
+    def local_update(self, rows, cols, xi, tau0):
+        """ACS local decay on the walked edges: tau = (1 - xi) * tau + xi * tau0."""
+        self.raw[rows, cols] = (1.0 - xi) * self.raw[rows, cols] + xi * tau0 / self.scale
+        self._mark_edges_changed(rows, cols)
+
+    def global_update(self, rows, cols, rho, delta):
+        """ACS global update touching only the given edges: tau = (1 - rho) * tau + rho * delta."""
+        self.raw[rows, cols] = (1.0 - rho) * self.raw[rows, cols] + rho * delta / self.scale
+        self._mark_edges_changed(rows, cols)
+
+    def changes_since(self, version):
+        """
+        (rows, cols) of every edge changed after version, or None when that cannot be told
+        (a full-matrix change happened, or the log no longer reaches back that far).
+        """
+        if version < self.full_version:
+            return None
+        if version == self.version:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+        entries = [(v, rows, cols) for v, rows, cols in self._change_log if v > version]
+        if not entries or entries[0][0] != version + 1:
+            return None
+
+        rows = np.concatenate([np.atleast_1d(rows) for _, rows, _ in entries])
+        cols = np.concatenate([np.atleast_1d(cols) for _, _, cols in entries])
+        return rows, cols
+
+    def _mark_edges_changed(self, rows, cols):
+        self.version += 1
+        self._change_log.append((self.version, np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)))
 
+    def _mark_full_change(self):
+        self.version += 1
+        self.full_version = self.version
+        self._change_log.clear()
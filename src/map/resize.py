@@ -0,0 +1,87 @@
+import numpy as np
+
+from src.map.symmetric_matrix import SymmetricMatrix, condensed_index, condensed_size
+
+
+def grow_capacity(size):
+    return size + size // 4 + 8
+
+
+def _spare_buffer(array, size):
+    """The buffer array is a leading slice of, if it can hold size rows/cells, else None."""
+    base = array.base
+    if not isinstance(base, np.ndarray) or base.ndim != array.ndim or base.dtype != array.dtype:
+        return None
+    if base.__array_interface__["data"][0] != array.__array_interface__["data"][0] or base.strides != array.strides:
+        return None
+    if base.ndim == 2 and base.shape[0] != base.shape[1]:
+        return None
+
+    return base if base.shape[0] >= size else None
+
+
+def append_vertex(matrix, values, diagonal=0.0):
+    """
+    Grow a symmetric (n, n) matrix - dense or SymmetricMatrix - by one vertex whose edges to the
+    existing n vertices are values. Spare capacity is reused, so the amortized cost is O(n).
+    """
+    values = np.asarray(values)
+
+    if isinstance(matrix, SymmetricMatrix):
+        n = matrix.n
+        size = condensed_size(n)
+
+        buffer = _spare_buffer(matrix.data, size + n)
+        if buffer is None:
+            buffer = np.empty(grow_capacity(size + n), dtype=matrix.data.dtype)
+            buffer[:size] = matrix.data
+
+        # column-major layout: the new vertex's edges are the next n cells
+        buffer[size:size + n] = values
+        matrix.data = buffer[:size + n]
+        matrix.n = n + 1
+        return matrix
+
+    n = len(matrix)
+    buffer = _spare_buffer(matrix, n + 1)
+    if buffer is None:
+        capacity = grow_capacity(n + 1)
+        buffer = np.empty((capacity, capacity), dtype=matrix.dtype)
+        buffer[:n, :n] = matrix
+
+    grown = buffer[:n + 1, :n + 1]
+    grown[n, :n] = values
+    grown[:n, n] = values
+    grown[n, n] = diagonal
+    return grown
+
+
+def swap_remove_vertex(matrix, index):
+    """
+    Drop vertex index from a symmetric matrix in O(n): the last vertex's row and column move into
+    its slot, so only the last vertex is relabelled (to index).
+    """
+    if isinstance(matrix, SymmetricMatrix):
+        last = matrix.n - 1
+        start = condensed_size(last)
+        if not matrix.data.flags.writeable:
+            # read-only storage (a memory-mapped cache file) - edit a private copy
+            matrix.data = matrix.data.copy()
+
+        if index != last:
+            others = np.arange(last)
+            others = others[others != index]
+            matrix.data[condensed_index(others, index)] = matrix.data[start + others]
+
+        matrix.data = matrix.data[:start]
+        matrix.n = last
+        return matrix
+
+    last = len(matrix) - 1
+    if not matrix.flags.writeable:
+        matrix = np.array(matrix)
+    if index != last:
+        matrix[index, :] = matrix[last, :]
+        matrix[:, index] = matrix[:, last]
+
+    return matrix[:last, :last]
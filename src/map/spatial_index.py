@@ -0,0 +1,151 @@
+import numpy as np
+
+
+class GridIndex:
+    """
+    Uniform grid over 2-D points for k-nearest and radius queries without a distance matrix.
+
+    Cells are sized for about per_cell points and stored CSR-style: the points of cell c are
+    order[starts[c]:starts[c + 1]], and cells are numbered row by row, so one row of a block
+    of cells is a single slice. Points inserted after a build go to a small overflow that every
+    query scans; it is folded in by a rebuild once it outgrows a quarter of the grid.
+    """
+    def __init__(self, xs, ys, per_cell=8):
+        self.per_cell = per_cell
+        self.build(xs, ys)
+
+    def build(self, xs, ys):
+        self.xs = np.array(xs, dtype=np.float64).ravel()
+        self.ys = np.array(ys, dtype=np.float64).ravel()
+        self.overflow = []
+
+        n = len(self.xs)
+        if n:
+            self.x0, self.y0 = float(self.xs.min()), float(self.ys.min())
+            width = float(self.xs.max()) - self.x0
+            height = float(self.ys.max()) - self.y0
+        else:
+            self.x0 = self.y0 = 0.0
+            width = height = 0.0
+
+        # about per_cell points per cell over the bounding box (a line of points gets a 1-cell-high grid)
+        area = max(width, 1e-12) * max(height, 1e-12) if width > 0 and height > 0 else max(width, height, 1e-12) ** 2
+        self.cell = max(np.sqrt(area * self.per_cell / max(n, 1)), 1e-12)
+        self.nx = int(width / self.cell) + 1
+        self.ny = int(height / self.cell) + 1
+
+        cells = self._cells(self.xs, self.ys)
+        self.order = np.argsort(cells, kind="stable")
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.nx * self.ny + 1))
+
+    def __len__(self):
+        return len(self.xs)
+
+    def _cell_coords(self, xs, ys):
+        # points outside the built extent (later inserts) land in the border cells; that only
+        # moves them closer in cell terms, so every distance bound below stays valid
+        cx = np.clip(np.floor((np.asarray(xs) - self.x0) / self.cell), 0, self.nx - 1).astype(np.intp)
+        cy = np.clip(np.floor((np.asarray(ys) - self.y0) / self.cell), 0, self.ny - 1).astype(np.intp)
+        return cx, cy
+
+    def _cells(self, xs, ys):
+        cx, cy = self._cell_coords(xs, ys)
+        return cy * self.nx + cx
+
+    def _block(self, cx, cy, r):
+        """Indices of the points in the (2r+1)^2 cells around (cx, cy), overflow included."""
+        x_lo, x_hi = max(cx - r, 0), min(cx + r, self.nx - 1)
+        parts = [
+            self.order[self.starts[row * self.nx + x_lo]:self.starts[row * self.nx + x_hi + 1]]
+            for row in range(max(cy - r, 0), min(cy + r, self.ny - 1) + 1)
+        ]
+        if self.overflow:
+            parts.append(np.asarray(self.overflow, dtype=np.intp))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.intp)
+
+    def _covers_all(self, cx, cy, r):
+        return cx - r <= 0 and cy - r <= 0 and cx + r >= self.nx - 1 and cy + r >= self.ny - 1
+
+    def insert(self, x, y):
+        """Add a point and return its index; amortized O(1) index work on top of the coordinate append."""
+        index = len(self.xs)
+        self.xs = np.append(self.xs, x)
+        self.ys = np.append(self.ys, y)
+        self.overflow.append(index)
+
+        if len(self.overflow) > max(64, index // 4):
+            self.build(self.xs, self.ys)
+        return index
+
+    def query(self, x, y, k, exclude=None):
+        """Indices of the k points nearest to (x, y), closest first (exclude: one index to skip)."""
+        n = len(self.xs) - (exclude is not None)
+        k = max(0, min(k, n))
+        if k == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        (cx,), (cy,) = self._cell_coords([x], [y])
+        r = 1
+        while True:
+            candidates = self._block(cx, cy, r)
+            if exclude is not None:
+                candidates = candidates[candidates != exclude]
+
+            if len(candidates) >= k:
+                d2 = (self.xs[candidates] - x) ** 2 + (self.ys[candidates] - y) ** 2
+                nearest = np.argpartition(d2, k - 1)[:k]
+                nearest = nearest[np.argsort(d2[nearest], kind="stable")]
+                # anything outside the block is at least r cells away
+                if d2[nearest[-1]] <= (r * self.cell) ** 2 or self._covers_all(cx, cy, r):
+                    return candidates[nearest]
+            r += 1
+
+    def query_radius(self, x, y, radius):
+        """Indices of the points within radius of (x, y), closest first."""
+        (cx,), (cy,) = self._cell_coords([x], [y])
+        candidates = self._block(cx, cy, int(np.ceil(radius / self.cell)))
+
+        d2 = (self.xs[candidates] - x) ** 2 + (self.ys[candidates] - y) ** 2
+        inside = d2 <= radius * radius
+        candidates, d2 = candidates[inside], d2[inside]
+        return candidates[np.argsort(d2, kind="stable")]
+
+    def neighbours(self, k):
+        """
+        (n, k) indices of every point's k nearest other points, closest first, in O(n k):
+        each cell's points are answered together from the block of cells around it.
+        """
+        if self.overflow:
+            self.build(self.xs, self.ys)
+
+        n = len(self.xs)
+        k = max(0, min(k, n - 1))
+        result = np.empty((n, k), dtype=np.intp)
+        if k == 0:
+            return result
+
+        xs, ys = self.xs, self.ys
+        for c in np.flatnonzero(np.diff(self.starts)).tolist():
+            pending = self.order[self.starts[c]:self.starts[c + 1]]
+            cx, cy = c % self.nx, c // self.nx
+
+            r = 1
+            while pending.size:
+                candidates = self._block(cx, cy, r)
+                if len(candidates) > k:
+                    d2 = (xs[pending, None] - xs[candidates]) ** 2 + (ys[pending, None] - ys[candidates]) ** 2
+                    d2[pending[:, None] == candidates[None, :]] = np.inf
+
+                    nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+                    distances = np.take_along_axis(d2, nearest, axis=1)
+                    ranked = np.argsort(distances, axis=1, kind="stable")
+                    nearest = np.take_along_axis(nearest, ranked, axis=1)
+
+                    done = np.take_along_axis(distances, ranked[:, -1:], axis=1)[:, 0] <= (r * self.cell) ** 2
+                    if self._covers_all(cx, cy, r):
+                        done[:] = True
+                    result[pending[done]] = candidates[nearest[done]]
+                    pending = pending[~done]
+                r += 1
+
+        return result
@@ -0,0 +1,138 @@
+import numpy as np
+
+
+def condensed_size(n):
+    return n * (n - 1) // 2
+
+
+def condensed_index(rows, cols):
+    """
+    Position of the undirected edge (i, j), i != j, in the condensed array.
+    Column-major upper triangle: (i, j) with i < j lives at j*(j-1)/2 + i, so vertex n's
+    edges are exactly the n entries appended after the first n*(n-1)/2.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    cols = np.asarray(cols, dtype=np.intp)
+    lo = np.minimum(rows, cols)
+    hi = np.maximum(rows, cols)
+    return hi * (hi - 1) // 2 + lo
+
+
+class SymmetricMatrix:
+    """
+    n x n symmetric matrix with a constant diagonal, stored as a condensed upper triangle.
+    Supports the indexing forms the engine uses on dense arrays: m[i] (row), m[rows] (row block),
+    m[i][j] and m[rows, cols] (element gather with broadcasting), and m[rows, cols] = values.
+    """
+    def __init__(self, n, fill=0.0, dtype=np.float64, diagonal=0.0, data=None):
+        self.n = n
+        self.diagonal = diagonal
+
+        if data is None:
+            data = np.full(condensed_size(n), fill, dtype=dtype)
+        self.data = data
+
+    @classmethod
+    def from_dense(cls, matrix, diagonal=0.0):
+        matrix = np.asarray(matrix)
+        n = len(matrix)
+        rows, cols = np.triu_indices(n, k=1)
+        data = np.empty(condensed_size(n), dtype=matrix.dtype)
+        data[condensed_index(rows, cols)] = matrix[rows, cols]
+        return cls(n, diagonal=diagonal, data=data)
+
+    @property
+    def shape(self):
+        return (self.n, self.n)
+
+    @property
+    def size(self):
+        return self.n * self.n
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = key
+            if type(i) is int and type(j) is int:
+                # plain-int fast path for scalar lookups in Python loops (2-opt)
+                if i == j:
+                    return self.data.dtype.type(self.diagonal)
+                if i > j:
+                    i, j = j, i
+                return self.data[j * (j - 1) // 2 + i]
+            return self.take(i, j)
+
+        if np.ndim(key) == 0:
+            return self.row(int(key))
+
+        return self.rows(key)
+
+    def __setitem__(self, key, values):
+        rows, cols = key
+        rows, cols, values = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp), np.asarray(values)
+        )
+        off_diagonal = rows != cols
+        self.data[condensed_index(rows[off_diagonal], cols[off_diagonal])] = values[off_diagonal]
+
+    def take(self, rows, cols):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        rows, cols = np.broadcast_arrays(rows, cols)
+
+        same = rows == cols
+        index = np.array(condensed_index(rows, cols))
+        index[same] = 0
+
+        if self.data.size:
+            values = self.data[index]
+        else:
+            values = np.zeros(index.shape, dtype=self.data.dtype)
+
+        if np.ndim(values) == 0:
+            return self.data.dtype.type(self.diagonal) if same else values
+
+        values[same] = self.diagonal
+        return values
+
+    def row(self, i):
+        return self.take(i, np.arange(self.n))
+
+    def rows(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        return self.take(indices[:, None], np.arange(self.n)[None, :])
+
+    def add_at(self, rows, cols, values):
+        """Unbuffered add; (i, j) and (j, i) hit the same cell, the diagonal is ignored."""
+        rows, cols, values = np.broadcast_arrays(
+            np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp), np.asarray(values)
+        )
+        off_diagonal = rows != cols
+        np.add.at(self.data, condensed_index(rows[off_diagonal], cols[off_diagonal]), values[off_diagonal])
+
+    def to_dense(self):
+        matrix = np.full((self.n, self.n), self.diagonal, dtype=self.data.dtype)
+        rows, cols = np.triu_indices(self.n, k=1)
+        values = self.data[condensed_index(rows, cols)]
+        matrix[rows, cols] = values
+        matrix[cols, rows] = values
+        return matrix
+
+    def copy(self):
+        return SymmetricMatrix(self.n, diagonal=self.diagonal, data=self.data.copy())
+
+    def max(self):
+        if self.n == 0:
+            raise ValueError("max of an empty matrix")
+        return max(self.data.max(), self.diagonal) if self.data.size else self.diagonal
+
+    def min(self):
+        if self.n == 0:
+            raise ValueError("min of an empty matrix")
+        return min(self.data.min(), self.diagonal) if self.data.size else self.diagonal
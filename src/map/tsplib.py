@@ -0,0 +1,211 @@
+"""
+TSPLIB (.tsp) reader for symmetric and asymmetric TSP instances:
+
+    instance = read_tsplib("data/berlin52.tsp")
+    graph = instance.build_graph()
+
+Coordinates (NODE_COORD_SECTION with EUC_2D, CEIL_2D, ATT or GEO) and weight matrices
+(EXPLICIT, EDGE_WEIGHT_SECTION as a full matrix or any row/column triangle) are converted a
+chunk at a time, so no Python loop runs per number. The graph keeps the instance's own
+coordinates and metric; only its display transform maps them onto the canvas.
+"""
+import itertools
+
+import numpy as np
+
+from src.map.graph import Graph, fit_display
+
+# EDGE_WEIGHT_TYPE -> Graph.metric
+EDGE_WEIGHT_TYPES = {
+    "EUC_2D": "euc_2d",
+    "CEIL_2D": "ceil_2d",
+    "ATT": "att",
+    "GEO": "geo",
+    "EXPLICIT": "explicit",
+}
+
+# lines (or weight values) parsed per numpy call
+CHUNK_LINES = 65536
+
+# EDGE_WEIGHT_FORMAT -> (triangle, diagonal included); a column-wise triangle lists the same
+# cells as the row-wise opposite triangle, and weights are symmetric, so they share a layout
+TRIANGLE_FORMATS = {
+    "UPPER_ROW": ("upper", False),
+    "LOWER_ROW": ("lower", False),
+    "UPPER_DIAG_ROW": ("upper", True),
+    "LOWER_DIAG_ROW": ("lower", True),
+    "UPPER_COL": ("lower", False),
+    "LOWER_COL": ("upper", False),
+    "UPPER_DIAG_COL": ("lower", True),
+    "LOWER_DIAG_COL": ("upper", True),
+}
+
+
+class TsplibInstance:
+    def __init__(self, name, metric, xs, ys, weights=None, comment=""):
+        self.name = name
+        self.comment = comment
+        self.metric = metric
+        # for explicit instances, display coordinates (DISPLAY_DATA_SECTION or a circle layout)
+        self.xs = xs
+        self.ys = ys
+        # (n, n) distances for EXPLICIT instances, else None
+        self.weights = weights
+
+    @property
+    def dimension(self):
+        return len(self.xs)
+
+    def build_graph(self, symmetric=False, bounds=None):
+        """A Graph with the instance's coordinates and metric, scaled onto bounds for display only; call rebuild() (or hand it to AcoEngine) before use."""
+        graph = Graph(0, symmetric, bounds)
+
+        if self.weights is None:
+            graph.set_vertices(self.xs, self.ys, self.metric)
+        else:
+            if symmetric and not np.array_equal(self.weights, self.weights.T):
+                raise ValueError("asymmetric weights need symmetric=False")
+            graph.set_vertices(self.xs, self.ys)
+            graph.set_explicit_distances(self.weights)
+
+        graph.display = fit_display(self.xs, self.ys, graph.bounds, force=True)
+        return graph
+
+
+def read_tsplib(path, chunk_lines=CHUNK_LINES):
+    header = {}
+    coords = None
+    display = None
+    weights = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            keyword, _, value = line.partition(":")
+            keyword = keyword.strip().upper()
+
+            if keyword == "EOF":
+                break
+            if keyword == "NODE_COORD_SECTION":
+                coords = _read_coords(f, _dimension(header), chunk_lines)
+            elif keyword == "DISPLAY_DATA_SECTION":
+                display = _read_coords(f, _dimension(header), chunk_lines)
+            elif keyword == "EDGE_WEIGHT_SECTION":
+                weights = _read_weights(f, _dimension(header), header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX"), chunk_lines)
+            elif keyword in ("FIXED_EDGES_SECTION", "TOUR_SECTION"):
+                # not used by the solver; these sections end with -1
+                for skipped in f:
+                    if skipped.strip() == "-1":
+                        break
+            elif keyword.endswith("_SECTION"):
+                raise ValueError(f"unsupported TSPLIB section {keyword}")
+            else:
+                header[keyword] = value.strip()
+
+    problem_type = header.get("TYPE", "TSP").split()[0].upper()
+    if problem_type not in ("TSP", "ATSP"):
+        raise ValueError(f"unsupported TSPLIB problem type {problem_type}")
+
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "").upper()
+    metric = EDGE_WEIGHT_TYPES.get(edge_weight_type)
+    if metric is None:
+        raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {edge_weight_type or '(missing)'}")
+
+    if metric == "explicit":
+        if weights is None:
+            raise ValueError("EXPLICIT instance without EDGE_WEIGHT_SECTION")
+        points = display if display is not None else coords
+        xs, ys = points if points is not None else circle_layout(len(weights))
+    else:
+        if coords is None:
+            raise ValueError("missing NODE_COORD_SECTION")
+        xs, ys = coords
+
+    return TsplibInstance(header.get("NAME", ""), metric, xs, ys, weights, header.get("COMMENT", ""))
+
+
+def circle_layout(n):
+    angles = 2.0 * np.pi * np.arange(n) / max(n, 1)
+    return np.cos(angles), np.sin(angles)
+
+
+def _dimension(header):
+    try:
+        return int(header["DIMENSION"])
+    except (KeyError, ValueError):
+        raise ValueError("DIMENSION must be given before the data sections") from None
+
+
+def _read_lines(f, count, chunk_lines):
+    """Up to count non-blank lines from f, in lists of at most chunk_lines."""
+    while count > 0:
+        chunk = [line for line in itertools.islice(f, min(count, chunk_lines)) if line.strip()]
+        if not chunk:
+            break
+        count -= len(chunk)
+        yield chunk
+
+
+def _read_coords(f, n, chunk_lines):
+    """n lines of "id x y" -> (xs, ys) ordered by node id."""
+    blocks = []
+    for chunk in _read_lines(f, n, chunk_lines):
+        values = np.array(" ".join(chunk).split(), dtype=np.float64)
+        if values.size != 3 * len(chunk):
+            raise ValueError("coordinate lines must be 'id x y'")
+        blocks.append(values.reshape(-1, 3))
+
+    table = np.concatenate(blocks) if blocks else np.zeros((0, 3))
+    if len(table) != n:
+        raise ValueError(f"expected {n} coordinates, found {len(table)}")
+
+    table = table[np.argsort(table[:, 0], kind="stable")]
+    return table[:, 1].copy(), table[:, 2].copy()
+
+
+def _read_weights(f, n, weight_format, chunk_lines):
+    weight_format = weight_format.upper()
+    if weight_format == "FULL_MATRIX":
+        count = n * n
+    elif weight_format in TRIANGLE_FORMATS:
+        count = n * (n + 1) // 2 if TRIANGLE_FORMATS[weight_format][1] else n * (n - 1) // 2
+    else:
+        raise ValueError(f"unsupported EDGE_WEIGHT_FORMAT {weight_format}")
+
+    # lines hold any number of values: split per line (stopping exactly at the section's end),
+    # convert to floats a chunk at a time
+    blocks = []
+    tokens = []
+    seen = 0
+    for line in f:
+        tokens.extend(line.split())
+        if len(tokens) >= chunk_lines or seen + len(tokens) >= count:
+            blocks.append(np.array(tokens, dtype=np.float64))
+            seen += len(tokens)
+            tokens = []
+        if seen >= count:
+            break
+    if tokens:
+        blocks.append(np.array(tokens, dtype=np.float64))
+
+    values = np.concatenate(blocks) if blocks else np.zeros(0)
+    if values.size != count:
+        raise ValueError(f"expected {count} edge weights, found {values.size}")
+
+    if weight_format == "FULL_MATRIX":
+        return values.reshape(n, n)
+
+    triangle, diagonal = TRIANGLE_FORMATS[weight_format]
+    offset = 0 if diagonal else 1
+    if triangle == "upper":
+        rows, cols = np.triu_indices(n, offset)
+    else:
+        rows, cols = np.tril_indices(n, -offset)
+
+    matrix = np.zeros((n, n))
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return matrix
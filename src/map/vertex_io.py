@@ -0,0 +1,88 @@
+"""
+Bulk vertex files: x, y per line (',', ';' or whitespace separated, '#' comment lines).
+
+Regular files - the same number of fields on every line - are parsed and formatted in one
+vectorized pass; anything else falls back to a line-by-line parse. With sidecar=True the parsed
+coordinates are also kept in <file>.npy, memory-mapped on the next load while it is newer than
+the CSV.
+"""
+import os
+
+import numpy as np
+
+SEPARATORS = str.maketrans(",;", "  ")
+
+# rows formatted per string operation when saving
+SAVE_CHUNK = 100000
+
+
+def sidecar_path(path):
+    return f"{path}.npy"
+
+
+def load_points(path, sidecar=False):
+    """(xs, ys) float64 arrays of every point in path; raises ValueError on non-numeric data."""
+    path = os.fspath(path)
+    cache = sidecar_path(path)
+
+    if sidecar and os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        # read-only views of the mapped file; Graph.set_vertices copies them into its own storage
+        coords = np.load(cache, mmap_mode="r")
+        return coords[0], coords[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    xs, ys = parse_points(text)
+    if sidecar:
+        np.save(cache, np.stack([xs, ys]))
+    return xs, ys
+
+
+def parse_points(text):
+    if "#" in text:
+        text = "\n".join(line for line in text.split("\n") if not line.lstrip().startswith("#"))
+    text = text.translate(SEPARATORS)
+
+    lines = text.split("\n")
+    rows = sum(1 for line in lines if line.strip())
+    first = next((line.split() for line in lines if line.strip()), [])
+    tokens = text.split()
+
+    if len(first) >= 2 and len(tokens) == rows * len(first):
+        try:
+            table = np.array(tokens, dtype=np.float64).reshape(rows, len(first))
+            return table[:, 0].copy(), table[:, 1].copy()
+        except ValueError:
+            # e.g. a header row; the slow path reports the offending line
+            pass
+
+    return _parse_lines(lines)
+
+
+def _parse_lines(lines):
+    xs, ys = [], []
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2:
+            continue
+        xs.append(float(parts[0]))
+        ys.append(float(parts[1]))
+
+    return np.array(xs, dtype=np.float64), np.array(ys, dtype=np.float64)
+
+
+def save_points(path, xs, ys, sidecar=False):
+    """Write '# x,y' and one 'x,y' line per point, formatted a chunk of rows per string operation."""
+    path = os.fspath(path)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("# x,y\n")
+        for start in range(0, len(xs), SAVE_CHUNK):
+            pairs = np.column_stack([xs[start:start + SAVE_CHUNK], ys[start:start + SAVE_CHUNK]])
+            f.write(("%r,%r\n" * len(pairs)) % tuple(pairs.ravel().tolist()))
+
+    if sidecar:
+        np.save(sidecar_path(path), np.stack([xs, ys]))
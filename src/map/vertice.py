@@ -1,11 +1,74 @@
 import math
+from collections.abc import Sequence
+
 
 class Vertice:
+    """
+    A 2D point. Standalone instances hold their own coordinates; the ones handed out by
+    Graph.vertices are views that read (and write) row `index` of the graph's x/y arrays.
+    """
+    __slots__ = ("_graph", "_index", "_x", "_y")
+
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        self._graph = None
+        self._index = None
+        self._x = x
+        self._y = y
+
+    @classmethod
+    def view(cls, graph, index):
+        vertice = cls.__new__(cls)
+        vertice._graph = graph
+        vertice._index = index
+        return vertice
+
+    @property
+    def x(self):
+        return self._x if self._graph is None else self._graph.xs[self._index]
+
+    @x.setter
+    def x(self, value):
+        if self._graph is None:
+            self._x = value
+        else:
+            self._graph.xs[self._index] = value
+
+    @property
+    def y(self):
+        return self._y if self._graph is None else self._graph.ys[self._index]
+
+    @y.setter
+    def y(self, value):
+        if self._graph is None:
+            self._y = value
+        else:
+            self._graph.ys[self._index] = value
 
     def distance_to(self, other_vertice):
         dx = self.x - other_vertice.x
         dy = self.y - other_vertice.y
-        return math.sqrt(dx*dx + dy*dy)
\ No newline at end of file
+        return math.sqrt(dx*dx + dy*dy)
+
+
+class Vertices(Sequence):
+    """Read-only sequence of Vertice views over a graph's coordinate arrays."""
+    __slots__ = ("_graph",)
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __len__(self):
+        return len(self._graph.xs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [Vertice.view(self._graph, i) for i in range(*index.indices(len(self)))]
+
+        n = len(self)
+        index = int(index)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("vertex index out of range")
+
+        return Vertice.view(self._graph, index)
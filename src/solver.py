@@ -0,0 +1,150 @@
+"""
+Headless solver: runs AcoEngine without pygame, e.g. for batch workers.
+
+    python -m src.solver --vertices 500 --iterations 200 --variant mmas --seed 1
+    python -m src.solver --input data/csvtest.csv --output tour.txt --json
+    python -m src.solver --input berlin52.tsp --variant mmas --local-search all
+    python -m src.solver --input usa13509.tsp --distance-cache ~/.cache/aco --workers 4
+"""
+import argparse
+import json
+import sys
+import time
+
+from src.algorithm.aco_engine import AcoEngine
+from src.map.distance_cache import DistanceCache
+from src.map.graph import DEFAULT_BOUNDS, Graph
+from src.map.tsplib import read_tsplib
+from src.map.vertex_io import load_points
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.solver", description="Solve a TSP instance with ant colony optimization.")
+
+    problem = parser.add_argument_group("problem")
+    problem.add_argument("--input", help="TSPLIB .tsp file, or CSV file with x,y per line; a random layout is generated when omitted")
+    problem.add_argument("--sidecar", action="store_true", help="cache a CSV input's parsed coordinates in <input>.npy for repeat runs")
+    problem.add_argument("--vertices", type=int, default=100, help="random layout size (default: 100)")
+    problem.add_argument("--width", type=float, default=None, help="random layout width")
+    problem.add_argument("--height", type=float, default=None, help="random layout height")
+    problem.add_argument("--seed", type=int, default=None, help="seed for the layout and the ants")
+    problem.add_argument("--distance-cache", metavar="DIR", default=None,
+                         help="memory-map distances and neighbour lists stored in DIR by earlier runs, storing them there on the first")
+
+    colony = parser.add_argument_group("colony")
+    colony.add_argument("--ants", type=int, default=50)
+    colony.add_argument("--alpha", type=float, default=1.0)
+    colony.add_argument("--beta", type=float, default=2.0)
+    colony.add_argument("--evaporation", type=float, default=0.9, help="pheromone retention per iteration (default: 0.9)")
+    colony.add_argument("--variant", choices=["as", "mmas", "acs"], default="as")
+    colony.add_argument("--candidates", type=int, default=15, help="candidate list size; 0 disables candidate lists")
+    colony.add_argument("--local-search", choices=["all", "best"], default=None)
+    colony.add_argument("--workers", type=int, default=1)
+    colony.add_argument("--symmetric", action="store_true", help="condensed upper-triangle storage")
+
+    run = parser.add_argument_group("run")
+    run.add_argument("--iterations", type=int, default=100, help="iteration budget (default: 100)")
+    run.add_argument("--stagnation-policy", choices=["stop", "reinitialize", "restart"], default=None,
+                     help="what to do once the colony stagnates")
+    run.add_argument("--stagnation-limit", type=int, default=None, help="stagnating after this many iterations without improvement")
+    run.add_argument("--min-branching", type=float, default=None, help="stagnating once the lambda-branching factor drops to this")
+    run.add_argument("--min-diversity", type=float, default=None, help="stagnating once tour diversity drops to this")
+    run.add_argument("--report-every", type=int, default=0, help="print progress every N iterations")
+    run.add_argument("--output", help="write the best tour (one vertex index per line) to this file")
+    run.add_argument("--json", action="store_true", help="print the final summary as JSON")
+    run.add_argument("--timings", action="store_true", help="collect per-phase timings and include them in the summary")
+
+    return parser
+
+
+def build_engine(args):
+    graph = None
+    if args.input and args.input.lower().endswith(".tsp"):
+        graph = read_tsplib(args.input).build_graph(args.symmetric)
+    elif args.input:
+        xs, ys = load_points(args.input, args.sidecar)
+        graph = Graph(0, args.symmetric)
+        graph.set_vertices(xs, ys)
+
+    bounds = None
+    if args.width is not None or args.height is not None:
+        bounds = (args.width or DEFAULT_BOUNDS[0], args.height or DEFAULT_BOUNDS[1])
+
+    return AcoEngine(
+        alpha=args.alpha,
+        beta=args.beta,
+        evaporation_rate=args.evaporation,
+        num_vertices=graph.num_vertices if graph is not None else args.vertices,
+        num_ants=args.ants,
+        graph=graph,
+        candidate_list_size=args.candidates or None,
+        workers=args.workers,
+        local_search=args.local_search,
+        variant=args.variant,
+        symmetric=args.symmetric,
+        bounds=bounds,
+        seed=args.seed,
+        timing=args.timings,
+        distance_cache=DistanceCache(args.distance_cache) if args.distance_cache else None,
+        stagnation_policy=args.stagnation_policy,
+        stagnation_limit=args.stagnation_limit,
+        stagnation_branching=args.min_branching,
+        stagnation_diversity=args.min_diversity
+    )
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    engine = build_engine(args)
+
+    if engine.graph.num_vertices < 2:
+        print("need at least 2 vertices", file=sys.stderr)
+        engine.close()
+        return 1
+
+    start = time.perf_counter()
+    iterations = 0
+    try:
+        while iterations < args.iterations and not engine.stopped:
+            stats = engine.run_iteration()
+            iterations += 1
+            if args.report_every and iterations % args.report_every == 0:
+                print(f"iteration {iterations}: best {stats['best_length']:.2f}, avg {stats['avg_length']:.2f}, "
+                      f"branching {stats['branching']:.2f}, diversity {stats['diversity']:.2f}")
+    finally:
+        engine.close()
+    elapsed = time.perf_counter() - start
+
+    # a restart policy may have moved the best tour aside
+    best_path, best_length = engine.graph.best_path, engine.graph.best_path_length
+    if engine.best_before_restart is not None and engine.best_before_restart[1] < best_length:
+        best_path, best_length = engine.best_before_restart
+
+    if args.output and best_path:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.writelines(f"{v}\n" for v in best_path[:-1])
+
+    summary = {
+        "vertices": engine.graph.num_vertices,
+        "iterations": iterations,
+        "best_length": best_length,
+        "seconds": elapsed,
+        "stagnation_events": engine.stagnation_events,
+    }
+    if args.timings:
+        summary["phases"] = engine.timers.summary()
+
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(f"best length {summary['best_length']:.2f} after {iterations} iterations "
+              f"on {summary['vertices']} vertices ({elapsed:.2f}s)")
+        for phase, stats in summary.get("phases", {}).items():
+            print(f"  {phase:>12}: mean {stats['mean_ms']:.3f} ms, p50 {stats['p50_ms']:.3f}, "
+                  f"p95 {stats['p95_ms']:.3f}, max {stats['max_ms']:.3f} ({stats['count']} samples)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import sys
 import os
@@ -9,6 +10,7 @@ if project_root not in sys.path:
 
 
 from src.algorithm.aco_engine import AcoEngine
+from src.map.graph import Graph
 
 class TestAcoEngine:
     def test_initialization_with_default_graph(self):
@@ -113,4 +115,364 @@ class TestAcoEngine:
         assert engine.alpha == 2.5
         assert engine.beta == 1.8
         assert engine.evaporation_rate == 0.05
-        assert engine.num_ants == 100
\ No newline at end of file
+        assert engine.num_ants == 100
+
+    def test_candidate_list_size_is_applied_to_graph(self):
+        """Test that the engine configures candidate lists on its graph"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=1.0,
+            evaporation_rate=0.1,
+            num_vertices=10,
+            num_ants=5,
+            candidate_list_size=4
+        )
+
+        assert engine.candidate_list_size == 4
+        assert engine.graph.candidate_lists.shape == (10, 4)
+
+        engine.run_iteration()
+        for path, _ in engine.graph.last_iteration_paths:
+            assert sorted(path[:-1]) == list(range(10))
+
+    def test_run_iteration_in_both_construction_modes(self):
+        """Test batched (default) and per-Ant construction both produce full tours"""
+        for construction in ("batch", "ants"):
+            engine = AcoEngine(
+                alpha=1.0,
+                beta=2.0,
+                evaporation_rate=0.5,
+                num_vertices=8,
+                num_ants=6,
+                construction=construction
+            )
+
+            stats = engine.run_iteration()
+
+            assert stats["paths_count"] == 6
+            assert engine.graph.best_path_length == stats["min_length"]
+            assert engine.pheromone_matrix.version == 1
+            for path, _ in engine.graph.last_iteration_paths:
+                assert sorted(path[:-1]) == list(range(8))
+
+    def test_per_ant_construction_is_reproducible_from_seed(self):
+        """Test per-Ant construction draws from the engine's seeded generator"""
+        runs = []
+        for _ in range(2):
+            engine = AcoEngine(1.0, 2.0, 0.5, 12, 5, construction="ants", seed=11)
+            for _ in range(3):
+                engine.run_iteration()
+            runs.append((engine.graph.best_path, engine.graph.last_iteration_paths))
+
+        assert runs[0] == runs[1]
+
+    def test_default_construction_is_batch(self):
+        """Test that the batched colony is used by default"""
+        engine = AcoEngine(alpha=1.0, beta=1.0, evaporation_rate=0.1, num_vertices=3, num_ants=2)
+
+        assert engine.construction == "batch"
+
+    def test_mmas_keeps_pheromones_within_bounds(self):
+        """Test MAX-MIN mode starts at tau_max and keeps every edge inside [tau_min, tau_max]"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.9,
+            num_vertices=12,
+            num_ants=6,
+            variant="mmas"
+        )
+
+        off_diagonal = ~np.eye(12, dtype=bool)
+        assert np.allclose(engine.pheromone_matrix.current[off_diagonal], engine.tau_max)
+
+        for _ in range(5):
+            engine.run_iteration()
+            values = engine.pheromone_matrix.current[off_diagonal]
+            assert values.min() >= engine.tau_min - 1e-12
+            assert values.max() <= engine.tau_max + 1e-12
+            assert engine.tau_max == pytest.approx(1.0 / ((1.0 - 0.9) * engine.graph.best_path_length))
+
+    def test_mmas_deposits_only_along_best_tour(self):
+        """Test MAX-MIN mode reinforces a single tour per iteration"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.5,
+            num_vertices=10,
+            num_ants=8,
+            variant="mmas"
+        )
+        engine.pheromone_matrix.reset(1.0)
+        engine.tau_min, engine.tau_max = 0.0, float('inf')
+        engine.mmas_bounds = lambda best_length: (0.0, float('inf'))
+
+        engine.run_iteration()
+
+        iteration_best = min(engine.graph.last_iteration_paths, key=lambda pl: pl[1])[0]
+        walked = set(zip(iteration_best[:-1], iteration_best[1:]))
+        current = engine.pheromone_matrix.current
+        for i in range(10):
+            for j in range(10):
+                if i == j:
+                    continue
+                if (i, j) in walked:
+                    assert current[i][j] > 0.5
+                else:
+                    assert current[i][j] == pytest.approx(0.5)
+
+    def test_mmas_reinitializes_on_stagnation(self):
+        """Test MAX-MIN mode resets trails to tau_max after the stagnation limit"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.5,
+            num_vertices=6,
+            num_ants=4,
+            variant="mmas",
+            mmas_stagnation_limit=1
+        )
+        engine.run_iteration()
+
+        # nothing can beat an impossible best, so the next iteration counts as stagnant
+        engine.graph.best_path_length = 0.0
+        engine.run_iteration()
+
+        off_diagonal = ~np.eye(6, dtype=bool)
+        assert np.allclose(engine.pheromone_matrix.current[off_diagonal], engine.tau_max)
+        assert engine.iterations_since_improvement == 0
+
+    def test_acs_updates_only_walked_edges(self):
+        """Test ACS touches only walked edges and keeps the choice table in sync"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.9,
+            num_vertices=10,
+            num_ants=3,
+            variant="acs"
+        )
+        off_diagonal = ~np.eye(10, dtype=bool)
+        assert np.allclose(engine.pheromone_matrix.current[off_diagonal], engine.tau0)
+
+        engine.run_iteration()
+
+        walked = set()
+        for path, _ in engine.graph.last_iteration_paths:
+            walked.update(zip(path[:-1], path[1:]))
+
+        current = engine.pheromone_matrix.current
+        for i in range(10):
+            for j in range(10):
+                if i != j and (i, j) not in walked:
+                    assert current[i][j] == engine.tau0
+
+        best = engine.graph.best_path
+        for a, b in zip(best[:-1], best[1:]):
+            assert current[a][b] > engine.tau0
+
+        expected = (current ** 1.0) * engine.graph.get_heuristic(2.0)
+        table = engine.choice_info.get(engine.graph, engine.pheromone_matrix, 1.0, 2.0)
+        assert np.allclose(table, expected)
+
+    def test_acs_requires_serial_batched_construction(self):
+        """Test ACS rejects the per-Ant and multiprocess colonies"""
+        with pytest.raises(ValueError):
+            AcoEngine(alpha=1.0, beta=1.0, evaporation_rate=0.9, num_vertices=5, num_ants=2,
+                      variant="acs", construction="ants")
+
+    @pytest.mark.parametrize("variant", ["as", "mmas", "acs"])
+    def test_symmetric_storage_runs_every_variant(self, variant):
+        """Test every variant runs on condensed storage and keeps one trail per edge"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.9,
+            num_vertices=10,
+            num_ants=6,
+            candidate_list_size=4,
+            variant=variant,
+            local_search="best",
+            symmetric=True
+        )
+
+        for _ in range(5):
+            stats = engine.run_iteration()
+
+        levels = engine.pheromone_matrix.levels()
+        assert stats["paths_count"] == 6
+        assert np.isfinite(stats["best_length"])
+        assert levels[2, 7] == levels[7, 2]
+        assert len(engine.graph.best_path) == 11
+
+    @pytest.mark.parametrize("variant", ["as", "mmas", "acs"])
+    def test_vertices_can_be_edited_during_a_run(self, variant):
+        """Test inserting and removing vertices keeps trails, the best tour and the next iteration consistent"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.5,
+            num_vertices=12,
+            num_ants=5,
+            candidate_list_size=4,
+            variant=variant
+        )
+        for _ in range(3):
+            engine.run_iteration()
+        trail = float(engine.pheromone_matrix.levels()[2, 5])
+
+        added = engine.add_vertices([100, 300], [120, 310])
+        assert added.tolist() == [12, 13]
+        assert engine.pheromone_matrix.vertex_count == 14
+        assert sorted(engine.graph.best_path[:-1]) == list(range(14))
+        assert engine.pheromone_matrix.levels()[2, 5] == pytest.approx(trail)
+        assert engine.pheromone_matrix.levels()[12, 3] > 0.0
+
+        engine.remove_vertices([0])
+        assert engine.graph.num_vertices == engine.pheromone_matrix.vertex_count == 13
+        assert sorted(engine.graph.best_path[:-1]) == list(range(13))
+
+        stats = engine.run_iteration()
+        assert stats["paths_count"] == 5
+        assert np.isfinite(stats["best_length"])
+
+    def test_top_tours_published_once_per_iteration(self):
+        """Test the engine ranks the iteration's top_k tours and drops them on vertex edits"""
+        engine = AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=10, num_ants=8, top_k=3)
+
+        engine.run_iteration()
+        lengths = sorted(length for _, length in engine.graph.last_iteration_paths)
+        assert [length for _, length in engine.top_tours] == lengths[:3]
+
+        engine.add_vertices([1.0], [1.0])
+        assert engine.top_tours == []
+
+    def test_convergence_signals_are_reported(self):
+        """Test every iteration reports branching, diversity and idle iterations"""
+        engine = AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=12, num_ants=6)
+
+        stats = engine.run_iteration()
+
+        assert 1.0 <= stats["branching"] <= engine.candidate_list_size
+        assert 0.0 <= stats["diversity"] <= 1.0
+        assert stats["idle_iterations"] == engine.idle_iterations
+        assert stats["stagnated"] is False
+
+    def test_stop_policy_ends_the_run(self):
+        """Test the stop policy flags the engine once no improvement was seen for the limit"""
+        engine = AcoEngine(
+            alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=6, num_ants=4,
+            stagnation_policy="stop", stagnation_limit=3
+        )
+
+        for _ in range(200):
+            stats = engine.run_iteration()
+            if engine.stopped:
+                break
+
+        assert engine.stopped
+        assert stats["stagnated"] is True
+        assert stats["idle_iterations"] >= 3
+        assert engine.stagnation_events == 1
+
+    def test_stop_policy_outlasts_mmas_trail_restarts(self):
+        """Test MAX-MIN's own restarts do not reset the idle count the stagnation policy watches"""
+        engine = AcoEngine(
+            alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=6, num_ants=4, variant="mmas",
+            mmas_stagnation_limit=2, stagnation_policy="stop", stagnation_limit=5
+        )
+        engine.run_iteration()
+
+        # nothing can beat an impossible best, so every further iteration is idle
+        engine.graph.best_path_length = 0.0
+        for _ in range(20):
+            stats = engine.run_iteration()
+            if engine.stopped:
+                break
+
+        assert engine.stopped
+        assert stats["idle_iterations"] == 5
+        assert engine.iterations_since_improvement < engine.mmas_stagnation_limit
+
+    def test_reinitialize_policy_resets_trails_and_keeps_best(self):
+        """Test reinitialization restores uniform trails without losing the best tour"""
+        engine = AcoEngine(
+            alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=8, num_ants=4,
+            stagnation_policy="reinitialize", stagnation_branching=100.0
+        )
+
+        stats = engine.run_iteration()
+        levels = engine.pheromone_matrix.levels()
+
+        assert stats["stagnated"] is True
+        assert not engine.stopped
+        assert levels[0, 1] == levels[2, 5] == 1.0
+        assert engine.graph.best_path is not None
+
+    def test_restart_policy_keeps_previous_best_aside(self):
+        """Test a restart clears the run state but remembers the best tour found before it"""
+        engine = AcoEngine(
+            alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=8, num_ants=4, variant="mmas",
+            stagnation_policy="restart", stagnation_diversity=1.0
+        )
+
+        engine.run_iteration()
+
+        path, length = engine.best_before_restart
+        assert sorted(path[:-1]) == list(range(8))
+        assert np.isfinite(length)
+        assert engine.graph.best_path is None
+        assert engine.iteration == 0
+        assert engine.pheromone_matrix.levels()[0, 1] == pytest.approx(engine.tau_max)
+
+    def test_switches_to_matrix_free_above_threshold(self):
+        """Test large graphs run without n x n matrices, with trails on candidate edges only"""
+        engine = AcoEngine(
+            alpha=1.0, beta=3.0, evaporation_rate=0.9, num_vertices=120, num_ants=6, variant="mmas",
+            local_search="best", candidate_list_size=8, matrix_free_threshold=100, seed=3
+        )
+        for _ in range(3):
+            engine.run_iteration()
+        engine.add_vertices([5.0], [5.0])
+        engine.remove_vertices([0])
+        engine.run_iteration()
+
+        graph = engine.graph
+        path = graph.best_path
+        dense = np.hypot(graph.xs[:, None] - graph.xs, graph.ys[:, None] - graph.ys)
+        assert engine.matrix_free
+        assert not isinstance(graph.distance_matrix, np.ndarray)
+        assert engine.pheromone_matrix.raw.data.shape == (120, 8)
+        assert sorted(path[:-1]) == list(range(120))
+        assert graph.best_path_length == pytest.approx(dense[path[:-1], path[1:]].sum())
+
+    def test_matrix_free_needs_candidate_lists(self):
+        """Test small graphs stay dense and matrix-free mode without candidate lists is rejected"""
+        assert not AcoEngine(1.0, 2.0, 0.5, 20, 4).matrix_free
+        assert not AcoEngine(1.0, 2.0, 0.5, 20, 4, candidate_list_size=None, matrix_free_threshold=10).matrix_free
+
+        with pytest.raises(ValueError):
+            AcoEngine(1.0, 2.0, 0.5, 20, 4, candidate_list_size=None, matrix_free=True)
+
+    def test_prebuilt_graph_sizes_the_pheromones(self):
+        """Test a passed graph, not num_vertices, decides the pheromone matrix size"""
+        engine = AcoEngine(1.0, 2.0, 0.5, 5, 4, graph=Graph(12, rng=1), seed=1)
+        engine.run_iteration()
+
+        assert engine.pheromone_matrix.levels().shape == (12, 12)
+        assert sorted(engine.graph.best_path[:-1]) == list(range(12))
+
+    def test_best_path_recovers_after_an_empty_iteration(self):
+        """Test iterations over fewer than 2 vertices record no best path that later tours cannot beat"""
+        engine = AcoEngine(1.0, 2.0, 0.5, 0, 4, seed=2)
+        engine.run_iteration()
+        assert engine.graph.best_path is None
+
+        engine.add_vertices([0.0], [0.0])
+        engine.run_iteration()
+        assert engine.graph.best_path_length == float('inf')
+
+        engine.add_vertices([3.0, 3.0], [0.0, 4.0])
+        engine.run_iteration()
+        assert sorted(engine.graph.best_path[:-1]) == [0, 1, 2]
+        assert engine.graph.best_path_length == pytest.approx(12.0)
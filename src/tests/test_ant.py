@@ -1,6 +1,8 @@
 import os
 import sys
 
+import numpy as np
+
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
 if project_root not in sys.path:
@@ -81,4 +83,56 @@ class TestAnt:
         assert path[0] == path[-1]
         
         # Length should be positive
-        assert length > 0.0
\ No newline at end of file
+        assert length > 0.0
+
+    def test_find_tour_samples_from_shared_choice_info(self):
+        """Test that a supplied choice table drives the edge selection"""
+        graph = Graph(4)
+        pheromone_matrix = PheromoneMatrix(4, 0.1)
+
+        # only the edges 0->1->2->3->0 carry any weight
+        choice_info = np.zeros((4, 4))
+        for i in range(4):
+            choice_info[i][(i + 1) % 4] = 1.0
+
+        ant = Ant()
+        path, _ = ant.find_tour(graph, pheromone_matrix, alpha=1.0, beta=1.0, choice_info=choice_info)
+
+        start = path[0]
+        assert path == [(start + k) % 4 for k in range(5)]
+
+    def test_find_tour_with_candidate_lists_visits_all_vertices(self):
+        """Test that restricting choices to candidate lists still builds a full tour"""
+        graph = Graph(12)
+        graph.set_candidate_list_size(2)
+        pheromone_matrix = PheromoneMatrix(12, 0.1)
+
+        ant = Ant()
+        path, length = ant.find_tour(graph, pheromone_matrix, alpha=1.0, beta=2.0)
+
+        assert len(path) == 13
+        assert path[0] == path[-1]
+        assert sorted(path[:-1]) == list(range(12))
+        assert length > 0.0
+
+    def test_choose_next_vertice_falls_back_to_best_remaining(self):
+        """Test that the best unvisited vertex is taken once every candidate is used"""
+        graph = Graph(4)
+        graph.set_candidate_list_size(1)
+        pheromone_matrix = PheromoneMatrix(4, 0.1)
+
+        ant = Ant()
+        ant.find_tour(graph, pheromone_matrix, alpha=1.0, beta=1.0)
+
+        ant.choice_info = np.array([
+            [0.0, 0.1, 0.9, 0.5],
+            [0.1, 0.0, 0.2, 0.3],
+            [0.9, 0.2, 0.0, 0.4],
+            [0.5, 0.3, 0.4, 0.0],
+        ])
+        ant.visited = np.array([True, False, False, False])
+        nearest = graph.candidate_lists[0][0]
+        ant.visited[nearest] = True
+
+        expected = max((v for v in range(4) if not ant.visited[v]), key=lambda v: ant.choice_info[0][v])
+        assert ant.choose_next_vertice(0) == expected
@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.benchmark import clustered_points, compare, data_instances, main, run_suite, uniform_points, unmatched_cases
+
+
+class TestBenchmark:
+    def test_generators_are_seeded_and_bounded(self):
+        """Test generated instances are reproducible and stay inside the bounds"""
+        for generate in (uniform_points, clustered_points):
+            xs, ys = generate(200, seed=3, bounds=(100, 50))
+            again, _ = generate(200, seed=3, bounds=(100, 50))
+
+            assert np.array_equal(xs, again)
+            assert 0 <= xs.min() and xs.max() < 100
+            assert 0 <= ys.min() and ys.max() < 50
+
+    def test_data_instances_skip_unreadable_files(self, tmp_path):
+        """Test CSVs that do not parse or hold fewer than 2 points are skipped"""
+        (tmp_path / "good.csv").write_text("0,0\n3,4\n")
+        (tmp_path / "one.csv").write_text("1,1\n")
+        (tmp_path / "bad.csv").write_text("lorem ipsum\n")
+
+        names = [name for name, _, _ in data_instances(str(tmp_path))]
+        assert names == ["good.csv"]
+
+    def test_suite_reports_every_case(self):
+        """Test each instance x ant count yields throughput, phase timings, memory and best length"""
+        report = run_suite(["uniform"], [12, 20], [3, 5], iterations=2, seed=1, options={"variant": "as"})
+
+        assert len(report["results"]) == 4
+        result = report["results"][0]
+        assert (result["n"], result["ants"]) == (12, 3)
+        assert result["iterations_per_sec"] > 0
+        assert result["peak_memory_mb"] > 0
+        assert np.isfinite(result["best_length"])
+        assert {"construction", "deposit", "evaporation"} <= set(result["phase_ms"])
+
+    def test_compare_flags_regressions(self):
+        """Test compare flags slower, larger or worse cases beyond the threshold only"""
+        base = {"instance": "uniform", "n": 20, "ants": 5, "variant": "as",
+                "iterations_per_sec": 100.0, "peak_memory_mb": 10.0, "best_length": 50.0}
+        current = dict(base, iterations_per_sec=80.0, peak_memory_mb=10.5, best_length=60.0)
+
+        regressions = compare({"results": [current]}, {"results": [base]}, threshold=0.1)
+
+        assert sorted(r["metric"] for r in regressions) == ["best_length", "iterations_per_sec"]
+        assert compare({"results": [base]}, {"results": [base]}) == []
+
+    def test_main_writes_json_and_compares(self, tmp_path, capsys):
+        """Test the CLI writes a JSON report and exits non-zero on a regression"""
+        output = tmp_path / "report.json"
+        argv = ["--instances", "uniform", "--sizes", "10", "--ants", "3", "--iterations", "2"]
+
+        assert main(argv + ["--output", str(output)]) == 0
+        report = json.loads(output.read_text())
+        assert report["results"][0]["n"] == 10
+
+        report["results"][0]["best_length"] /= 2
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(report))
+
+        assert main(argv + ["--compare", str(baseline)]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
+    def test_compare_matches_cases_by_their_options(self):
+        """Test cases run with different result-changing options are not compared, and repeats are rejected"""
+        base = {"instance": "uniform", "n": 20, "ants": 5, "variant": "as",
+                "iterations_per_sec": 100.0, "peak_memory_mb": 10.0, "best_length": 50.0}
+        improved = dict(base, local_search="best", iterations_per_sec=20.0)
+
+        assert compare({"results": [improved]}, {"results": [base]}) == []
+        assert len(compare({"results": [improved]}, {"results": [dict(base, local_search="best")]})) == 1
+
+        with pytest.raises(ValueError):
+            compare({"results": [base]}, {"results": [base, dict(base)]})
+        with pytest.raises(ValueError):
+            run_suite(["uniform"], [12, 12], [3], iterations=1, seed=1, options={})
+
+    def test_unmatched_cases_fail_the_comparison(self, tmp_path, capsys):
+        """Test cases missing from either report are listed, and a missing baseline case fails the CLI"""
+        base = {"instance": "uniform", "n": 20, "ants": 5,
+                "iterations_per_sec": 100.0, "peak_memory_mb": 10.0, "best_length": 50.0}
+        renamed = dict(base, instance="clustered")
+        missing, new = unmatched_cases({"results": [renamed]}, {"results": [base]})
+        assert [case.split("/")[0] for case in missing] == ["uniform"]
+        assert [case.split("/")[0] for case in new] == ["clustered"]
+
+        argv = ["--instances", "uniform", "--sizes", "10", "--ants", "3", "--iterations", "2"]
+        output = tmp_path / "report.json"
+        main(argv + ["--output", str(output)])
+        report = json.loads(output.read_text())
+        report["results"].append(dict(report["results"][0], n=99))
+        output.write_text(json.dumps(report))
+
+        assert main(argv + ["--compare", str(output)]) == 1
+        assert "MISSING uniform/99/3" in capsys.readouterr().out
+
+        with pytest.raises(SystemExit):
+            main(["--sizes", "10", "10"])
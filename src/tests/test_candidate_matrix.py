@@ -0,0 +1,87 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.candidate_matrix import CandidateMatrix
+from src.map.pheromone_matrix import PheromoneMatrix
+
+# vertex 0 lists 1 and 2, vertex 1 lists 0 and 3, ...
+LISTS = np.array([[1, 2], [0, 3], [3, 0], [2, 1]])
+
+
+class TestCandidateMatrix:
+    def test_reads_stored_edges_and_fill(self):
+        """Test gathers, rows and scalar reads see stored values, fill elsewhere and 0 on the diagonal"""
+        matrix = CandidateMatrix(LISTS, np.arange(8, dtype=np.float64).reshape(4, 2), fill=-1.0)
+
+        assert matrix[0, 2] == 1.0 and matrix[2, 0] == 5.0
+        assert matrix[0, 3] == -1.0 and matrix[1, 1] == 0.0
+        assert np.array_equal(matrix[np.array([[0], [3]]), np.array([1, 3])], [[0.0, -1.0], [7.0, 0.0]])
+        assert np.array_equal(matrix[1], [2.0, 0.0, -1.0, 3.0])
+        assert np.array_equal(matrix[[0, 1]][1], matrix[1])
+
+    def test_symmetric_writes_reach_both_copies(self):
+        """Test symmetric edges are written to each listing row and read back through the mirror"""
+        matrix = CandidateMatrix(LISTS, fill=1.0, symmetric=True)
+
+        matrix.add_at(np.array([0, 1]), np.array([1, 3]), np.array([2.0, 5.0]))
+        matrix[np.array([0]), np.array([2])] = 9.0
+
+        assert matrix[0, 1] == matrix[1, 0] == 3.0
+        # 3 does not list 1: its read falls back to 1's copy
+        assert matrix[1, 3] == matrix[3, 1] == 6.0
+        assert matrix[2, 0] == 9.0
+        assert matrix[0, 3] == 1.0
+
+    def test_base_scales_unstored_cells(self):
+        """Test a choice table reads fill * base outside the lists"""
+        base = np.arange(16, dtype=np.float64).reshape(4, 4)
+        matrix = CandidateMatrix(LISTS, np.full((4, 2), 7.0), fill=0.5, base=base)
+
+        assert matrix[0, 3] == 1.5 and matrix[0, 1] == 7.0
+        assert np.array_equal(matrix[2], [7.0, 4.5, 0.0, 7.0])
+
+
+class TestCandidatePheromones:
+    def test_updates_keep_unstored_level(self):
+        """Test evaporation, deposits, clamps and resets act on the stored edges and the fill level alike"""
+        pm = PheromoneMatrix(4, 0.5, candidates=LISTS)
+        pm.add_pending_edges([0, 0], [1, 3], [1.0, 1.0])
+        pm.apply_pending()
+
+        levels = pm.levels()
+        assert levels[0, 1] == 1.5 and levels[0, 3] == 0.5
+        assert pm.raw.data.nbytes == 8 * 8
+
+        pm.clamp(0.75, 1.0)
+        assert pm.levels()[0, 1] == 1.0 and pm.levels()[2, 1] == 0.75
+        pm.reset(2.0)
+        assert pm.levels()[0, 1] == pm.levels()[3, 0] == 2.0 and pm.levels()[1, 1] == 0.0
+
+    def test_vertex_edits_relabel_trails(self):
+        """Test adding and swap-removing vertices carries trails over to the new candidate lists"""
+        pm = PheromoneMatrix(4, 0.9, candidates=LISTS)
+        pm.raw[np.array([0, 1]), np.array([1, 3])] = [5.0, 6.0]
+
+        # vertex 4 joins next to 1: 1 and 4 list each other, 4 starts at seed levels
+        grown = np.array([[1, 2], [4, 3], [3, 0], [2, 1], [1, 0]])
+        pm.add_vertex([0.25, 8.0, 0.25, 0.25], grown)
+        assert pm.vertex_count == 5
+        assert pm.levels()[0, 1] == 5.0 and pm.levels()[4, 1] == pm.levels()[1, 4] == 8.0
+
+        # removing 0 moves 4 into its slot
+        shrunk = np.array([[1, 2], [0, 3], [3, 1], [2, 1]])
+        pm.remove_vertex(0, shrunk)
+        assert pm.vertex_count == 4
+        assert pm.levels()[0, 1] == 8.0 and pm.levels()[1, 3] == 6.0
+
+        rows, cols, levels = pm.edge_levels()
+        assert np.all(rows < cols) and len(rows) == len(set(zip(rows.tolist(), cols.tolist())))
+        assert levels[(rows == 0) & (cols == 1)] == pytest.approx(8.0)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.choice_info import ChoiceInfo
+from src.map.graph import Graph
+from src.map.pheromone_matrix import PheromoneMatrix
+from src.map.vertice import Vertice
+
+
+class TestChoiceInfo:
+    def _graph(self):
+        graph = Graph(3)
+        graph.vertices = [Vertice(0, 0), Vertice(3, 4), Vertice(6, 0)]
+        graph.calculate_distances()
+        return graph
+
+    def test_compute_combines_pheromone_and_heuristic(self):
+        """Test choice info equals tau^alpha * eta^beta"""
+        graph = self._graph()
+        pm = PheromoneMatrix(3, 0.5)
+        pm.current[0][1] = 4.0
+
+        table = ChoiceInfo.compute(graph, pm, alpha=0.5, beta=2.0)
+
+        assert table[0][1] == pytest.approx(2.0 * (1 / 5.0) ** 2)
+        assert table[0][2] == pytest.approx((1 / 6.0) ** 2)
+        assert table[1][1] == 0.0
+
+    def test_get_reuses_table_until_inputs_change(self):
+        """Test the table is rebuilt only when alpha, beta or pheromones change"""
+        graph = self._graph()
+        pm = PheromoneMatrix(3, 0.5)
+        choice_info = ChoiceInfo()
+
+        table = choice_info.get(graph, pm, 1.0, 1.0)
+        assert choice_info.get(graph, pm, 1.0, 1.0) is table
+
+        # slider moved
+        changed = choice_info.get(graph, pm, 2.0, 1.0)
+        assert changed is not table
+        assert choice_info.get(graph, pm, 2.0, 1.0) is changed
+
+        # pheromone update - only the walked edge is patched, in place
+        pm.add_pending(0, 1, 1.0)
+        pm.apply_pending()
+        patched = choice_info.get(graph, pm, 2.0, 1.0)
+        assert patched is changed
+        assert np.allclose(patched, ChoiceInfo.compute(graph, pm, 2.0, 1.0))
+
+    def test_get_rebuilds_after_graph_recalculation(self):
+        """Test recalculating distances invalidates the cached table"""
+        graph = self._graph()
+        pm = PheromoneMatrix(3, 0.5)
+        choice_info = ChoiceInfo()
+
+        table = choice_info.get(graph, pm, 1.0, 1.0)
+        graph.calculate_distances()
+
+        assert choice_info.get(graph, pm, 1.0, 1.0) is not table
+
+    def test_get_patches_edge_local_updates_in_place(self):
+        """Test an edge-local pheromone update patches the cached table in place"""
+        graph = self._graph()
+        pm = PheromoneMatrix(3, 0.5)
+        choice_info = ChoiceInfo()
+
+        table = choice_info.get(graph, pm, 1.0, 1.0)
+        pm.local_update([0], [1], 0.5, 3.0)
+
+        updated = choice_info.get(graph, pm, 1.0, 1.0)
+
+        assert updated is table
+        assert table[0][1] == pytest.approx(2.0 / 5.0)
+        assert choice_info.get(graph, pm, 1.0, 1.0) is table
+
+    def test_get_rebuilds_after_full_matrix_change(self):
+        """Test a full-matrix change rebuilds the table instead of patching it"""
+        graph = self._graph()
+        pm = PheromoneMatrix(3, 0.5)
+        choice_info = ChoiceInfo()
+
+        table = choice_info.get(graph, pm, 1.0, 1.0)
+        pm.reset(2.0)
+        pm.local_update([0], [1], 0.5, 3.0)
+
+        updated = choice_info.get(graph, pm, 1.0, 1.0)
+
+        assert updated is not table
+        assert updated[1][2] == pytest.approx(2.0 / 5.0)
@@ -1,12 +1,16 @@
 import os
 import sys
 
+import numpy as np
+import pytest
+
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from src.algorithm.colony import Colony
+from src.algorithm.choice_info import ChoiceInfo
+from src.algorithm.colony import Colony, construct_tours, top_tours
 from src.map.graph import Graph
 from src.map.pheromone_matrix import PheromoneMatrix
 
@@ -120,4 +124,112 @@ class TestColony:
         assert first_best > 0
         assert second_best > 0
         assert len(first_run) == 10
-        assert len(second_run) == 10
\ No newline at end of file
+        assert len(second_run) == 10
+
+    def test_find_paths_batched_returns_tour_array(self):
+        """Test batched construction returns an (m, n+1) array of closed permutations"""
+        graph = Graph(6)
+        pheromone_matrix = PheromoneMatrix(6, 0.1)
+        colony = Colony(4, rng=np.random.default_rng(0))
+
+        tours, lengths = colony.find_paths_batched(graph, pheromone_matrix, alpha=1.0, beta=2.0)
+
+        assert tours.shape == (4, 7)
+        assert lengths.shape == (4,)
+        for tour, length in zip(tours, lengths):
+            assert tour[0] == tour[-1]
+            assert sorted(tour[:-1]) == list(range(6))
+            expected = sum(graph.distance_matrix[a][b] for a, b in zip(tour[:-1], tour[1:]))
+            assert length == pytest.approx(expected)
+
+    def test_find_paths_batched_with_candidate_lists(self):
+        """Test batched construction with candidate lists and fallback still yields permutations"""
+        graph = Graph(15)
+        graph.set_candidate_list_size(2)
+        pheromone_matrix = PheromoneMatrix(15, 0.1)
+        colony = Colony(8, rng=np.random.default_rng(1))
+
+        tours, _ = colony.find_paths_batched(graph, pheromone_matrix, alpha=1.0, beta=1.0)
+
+        for tour in tours:
+            assert sorted(tour[:-1]) == list(range(15))
+
+    def test_find_paths_batched_deposits_and_records_best(self):
+        """Test batched construction deposits 1/d per walked edge and tracks best tours"""
+        graph = Graph(5)
+        pheromone_matrix = PheromoneMatrix(5, 0.1)
+        colony = Colony(3, rng=np.random.default_rng(2))
+
+        tours, lengths = colony.find_paths_batched(graph, pheromone_matrix, alpha=1.0, beta=1.0)
+
+        expected = np.zeros((5, 5))
+        for tour in tours:
+            for a, b in zip(tour[:-1], tour[1:]):
+                expected[a][b] += graph.get_edge_grade(a, b)
+        assert np.allclose(pheromone_matrix.pending, expected)
+
+        assert graph.best_path_length == pytest.approx(lengths.min())
+        assert graph.best_path == tours[int(np.argmin(lengths))].tolist()
+        assert len(graph.last_iteration_paths) == 3
+
+    def test_construct_tours_follows_dominant_edges(self):
+        """Test the row-wise roulette only picks edges with weight"""
+        n = 4
+        choice_info = np.zeros((n, n))
+        for i in range(n):
+            choice_info[i][(i + 1) % n] = 1.0
+        distance_matrix = np.ones((n, n)) - np.eye(n)
+
+        tours, lengths = construct_tours(choice_info, distance_matrix, None, 5, np.random.default_rng(3))
+
+        for tour in tours:
+            assert list(tour) == [(tour[0] + k) % n for k in range(n + 1)]
+        assert np.allclose(lengths, 4.0)
+
+    def test_construct_tours_greedy_with_q0_one(self):
+        """Test q0 = 1 always takes the highest choice value among open vertices"""
+        choice_info = np.array([
+            [0.0, 5.0, 1.0, 2.0],
+            [1.0, 0.0, 3.0, 9.0],
+            [4.0, 1.0, 0.0, 2.0],
+            [1.0, 1.0, 8.0, 0.0],
+        ])
+        distance_matrix = np.ones((4, 4)) - np.eye(4)
+
+        tours, _ = construct_tours(choice_info, distance_matrix, None, 20, np.random.default_rng(5), q0=1.0)
+
+        for tour in tours:
+            current = tour[0]
+            visited = {current}
+            for nxt in tour[1:-1]:
+                best = max((v for v in range(4) if v not in visited), key=lambda v: choice_info[current][v])
+                assert nxt == best
+                visited.add(nxt)
+                current = nxt
+
+    def test_construct_tours_reports_every_step(self):
+        """Test on_step sees every walked edge, including the closing one"""
+        graph = Graph(5)
+        steps = []
+
+        tours, _ = construct_tours(
+            ChoiceInfo.compute(graph, PheromoneMatrix(5, 0.1), 1.0, 1.0),
+            graph.distance_matrix, None, 3, np.random.default_rng(6),
+            on_step=lambda src, dst: steps.append((src.copy(), dst.copy()))
+        )
+
+        assert len(steps) == 5
+        for step, (src, dst) in enumerate(steps):
+            assert list(src) == list(tours[:, step])
+            assert list(dst) == list(tours[:, step + 1])
+
+    def test_top_tours_shortest_first(self):
+        """Test top_tours returns the k shortest tours in order, and all of them when k exceeds the count"""
+        tours = np.arange(12).reshape(6, 2)
+        lengths = np.array([5.0, 1.0, 4.0, 2.0, 6.0, 3.0])
+
+        top = top_tours(tours, lengths, 3)
+        assert top == [([2, 3], 1.0), ([6, 7], 2.0), ([10, 11], 3.0)]
+
+        assert [length for _, length in top_tours(tours, lengths, 10)] == sorted(lengths.tolist())
+        assert top_tours(tours[:0], lengths[:0], 3) == []
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.parallel_colony import ParallelColony
+from src.map.distance_cache import DistanceCache
+from src.map.graph import Graph
+from src.map.pheromone_matrix import PheromoneMatrix
+
+
+def cached_graph(cache, xs, ys, symmetric=False, metric=None):
+    graph = Graph(0, symmetric, distance_cache=cache)
+    graph.set_vertices(xs, ys, metric)
+    graph.candidate_list_size = 4
+    graph.calculate_distances()
+    return graph
+
+
+class TestDistanceCache:
+    def test_second_graph_maps_the_stored_matrix(self, tmp_path):
+        """Test a graph with the same coordinates maps the stored distances and neighbour lists read-only"""
+        cache = DistanceCache(tmp_path)
+        rng = np.random.default_rng(1)
+        xs, ys = rng.random(30) * 100, rng.random(30) * 100
+
+        first = cached_graph(cache, xs, ys)
+        second = cached_graph(cache, xs, ys)
+        reference = cached_graph(None, xs, ys)
+
+        assert len(os.listdir(tmp_path)) == 2
+        assert second.distance_file == first.distance_file
+        assert not second.distance_matrix.flags.writeable
+        assert np.array_equal(second.distance_matrix, reference.distance_matrix)
+        assert np.array_equal(second.candidate_lists, reference.candidate_lists)
+
+    def test_layout_and_metric_are_part_of_the_key(self, tmp_path):
+        """Test dense, condensed and other-metric matrices are stored as separate entries"""
+        cache = DistanceCache(tmp_path)
+        xs, ys = np.arange(6.0) * 7, np.arange(6.0) ** 2
+
+        dense = cached_graph(cache, xs, ys)
+        condensed = cached_graph(cache, xs, ys, symmetric=True)
+        rounded = cached_graph(cache, xs, ys, metric="euc_2d")
+
+        assert len({dense.distance_file, condensed.distance_file, rounded.distance_file}) == 3
+        assert np.allclose(condensed.distance_matrix.to_dense(), dense.distance_matrix)
+        assert np.array_equal(rounded.distance_matrix, np.floor(dense.distance_matrix + 0.5))
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_edits_copy_instead_of_writing_the_file(self, tmp_path, symmetric):
+        """Test vertex edits on a mapped graph work on private copies and leave the cache intact"""
+        cache = DistanceCache(tmp_path)
+        rng = np.random.default_rng(2)
+        xs, ys = rng.random(12) * 50, rng.random(12) * 50
+        graph = cached_graph(cache, xs, ys, symmetric)
+        stored = {name: (tmp_path / name).read_bytes() for name in os.listdir(tmp_path)}
+
+        graph.remove_vertex(2)
+        graph.add_vertex(3.0, 4.0)
+
+        assert graph.distance_file is None
+        assert graph.distance_matrix[10, 11] == pytest.approx(np.hypot(graph.xs[10] - 3.0, graph.ys[10] - 4.0))
+        assert {name: (tmp_path / name).read_bytes() for name in os.listdir(tmp_path)} == stored
+
+    def test_workers_map_the_file(self, tmp_path):
+        """Test the process-pool colony hands workers the cache file instead of a shared-memory copy"""
+        graph = cached_graph(DistanceCache(tmp_path), np.arange(9.0) ** 1.5, np.arange(9.0) % 3 * 10)
+        colony = ParallelColony(4, workers=2, rng=np.random.default_rng(0))
+
+        try:
+            tours, lengths = colony.find_paths_batched(graph, PheromoneMatrix(9, 0.5), alpha=1.0, beta=2.0)
+
+            assert colony._blocks["distance"].spec[0] == graph.distance_file
+            for tour, length in zip(tours, lengths):
+                assert sorted(tour[:-1]) == list(range(9))
+                assert length == pytest.approx(graph.distance_matrix[tour[:-1], tour[1:]].sum())
+        finally:
+            colony.close()
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.graph import Graph
+
+
+def dense_pair(seed=2, n=40, metric=None):
+    dense = Graph(n, rng=seed)
+    lazy = Graph(n, rng=seed, matrix_free=True)
+    if metric is not None:
+        for graph in (dense, lazy):
+            graph.set_vertices(graph.xs, graph.ys, metric)
+            graph.calculate_distances()
+    return dense, lazy
+
+
+class TestDistanceRows:
+    @pytest.mark.parametrize("metric", [None, "euc_2d", "geo"])
+    def test_matches_dense_matrix(self, metric):
+        """Test scalar, gather, row and row-block lookups match the dense distances and heuristics"""
+        dense, lazy = dense_pair(metric=metric)
+        d, m = dense.distance_matrix, lazy.distance_matrix
+        rows, cols = np.array([[0], [5]]), np.array([3, 5, 39])
+
+        assert m[4, 7] == pytest.approx(d[4, 7]) and m[4, 4] == 0.0
+        assert np.allclose(m[rows, cols], d[rows, cols])
+        assert np.allclose(m[6], d[6], rtol=1e-6) and m[6].dtype == np.float32
+        assert np.allclose(m[[1, 2]], d[[1, 2]], rtol=1e-6)
+        assert np.allclose(lazy.get_heuristic(2.0)[rows, cols], dense.get_heuristic(2.0)[rows, cols])
+        assert np.allclose(lazy.heuristic_matrix[3], dense.heuristic_matrix[3], rtol=1e-6)
+
+    def test_row_cache_is_bounded_and_follows_edits(self):
+        """Test only cache_rows rows are kept and vertex edits drop them"""
+        graph = Graph(30, rng=3, matrix_free=True)
+        distances = graph.distance_matrix
+        distances.cache_rows = 4
+
+        for i in range(10):
+            distances[i]
+        assert list(distances._rows) == [6, 7, 8, 9]
+        assert distances[9] is distances[9]
+
+        graph.add_vertex(1.0, 2.0)
+        assert not distances._rows and len(distances[9]) == 31
+        # swap-remove moves the new vertex into slot 0
+        graph.remove_vertex(0)
+        assert graph.xs[0] == 1.0 and not distances._rows
+        assert distances[0][5] == pytest.approx(np.hypot(1.0 - graph.xs[5], 2.0 - graph.ys[5]))
+
+    def test_incremental_edits_match_dense(self):
+        """Test candidate lists and the best tour stay exact through inserts and removals without a matrix"""
+        dense, lazy = dense_pair(seed=4, n=25)
+        for graph in (dense, lazy):
+            graph.set_candidate_list_size(5)
+            graph.best_path = list(range(25)) + [0]
+            graph.best_path_length = float(graph.distance_matrix[np.arange(25), np.roll(np.arange(25), -1)].sum())
+
+            graph.add_vertices([3.0, 400.0], [7.0, 120.0])
+            graph.remove_vertices([2, 10])
+
+        assert np.array_equal(lazy.xs, dense.xs)
+        assert lazy.best_path == dense.best_path
+        assert lazy.best_path_length == pytest.approx(dense.best_path_length)
+        rows = np.arange(25)[:, None]
+        d = dense.distance_matrix
+        assert np.allclose(d[rows, lazy.candidate_lists], d[rows, dense.candidate_lists])
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.engine_runner import EngineRunner, summarize_pheromones
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_engine(num_vertices=12, seed=0):
+    return AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.9, num_vertices=num_vertices, num_ants=8, seed=seed)
+
+
+class TestEngineRunner:
+    def test_snapshot_is_read_only_copy(self):
+        """Test snapshots copy coordinates and tours out of the engine and cannot be mutated"""
+        runner = EngineRunner(make_engine())
+        runner.step()
+        runner.flush()
+        snapshot = runner.snapshot
+
+        assert snapshot.iteration == 1
+        assert snapshot.best_path == tuple(runner.engine.graph.best_path)
+        assert [length for _, length in snapshot.top_paths] == sorted(length for _, length in snapshot.top_paths)
+        with pytest.raises(ValueError):
+            snapshot.xs[0] = -1.0
+        with pytest.raises(AttributeError):
+            snapshot.iteration = 5
+
+        runner.engine.add_vertices([1.0], [1.0])
+        assert snapshot.num_vertices == 12
+
+    def test_commands_run_in_order(self):
+        """Test configure, call and step are applied in the order they were queued"""
+        runner = EngineRunner(make_engine())
+        runner.configure(alpha=0.5, beta=3.0)
+        runner.call(lambda engine: engine.add_vertices([5.0], [5.0]))
+        runner.step()
+        runner.flush()
+
+        assert runner.snapshot.alpha == 0.5
+        assert runner.snapshot.beta == 3.0
+        assert runner.snapshot.num_vertices == 13
+        assert len(runner.snapshot.best_path) == 14
+
+    def test_reset_replaces_engine(self):
+        """Test reset builds the new engine from the old one and restarts the iteration count"""
+        runner = EngineRunner(make_engine())
+        runner.step()
+        runner.reset(lambda old: make_engine(num_vertices=5, seed=1))
+        runner.flush()
+
+        assert runner.snapshot.iteration == 0
+        assert runner.snapshot.num_vertices == 5
+        assert runner.snapshot.best_path is None
+
+    def test_pacing_does_not_catch_up(self):
+        """Test a stalled runner resumes at its rate instead of running the missed iterations"""
+        clock = FakeClock()
+        runner = EngineRunner(make_engine(), iterations_per_second=10, clock=clock)
+        runner.start()
+
+        runner.tick()
+        assert runner.iteration == 1
+
+        # a long stall: ten intervals pass, the late iteration runs and the schedule restarts from now
+        clock.now = 1.0
+        for _ in range(5):
+            runner.tick()
+        assert runner.iteration == 3
+
+        clock.now = 1.1
+        runner.tick()
+        assert runner.iteration == 4
+
+    def test_start_needs_two_vertices(self):
+        """Test start is ignored on a board with fewer than two vertices"""
+        runner = EngineRunner(make_engine(num_vertices=1))
+        runner.start()
+        runner.tick()
+
+        assert not runner.snapshot.running
+        assert runner.iteration == 0
+
+    def test_worker_thread(self):
+        """Test the threaded runner iterates until stopped and publishes its final state"""
+        runner = EngineRunner(make_engine(), iterations_per_second=1000)
+        runner.start_thread()
+        try:
+            runner.start()
+            assert runner.flush(timeout=5.0)
+            for _ in range(500):
+                if runner.snapshot.iteration >= 3:
+                    break
+                time.sleep(0.01)
+            runner.stop()
+            assert runner.flush(timeout=5.0)
+
+            snapshot = runner.snapshot
+            assert not snapshot.running
+            assert snapshot.iteration >= 3
+            assert snapshot.iteration == runner.iteration
+        finally:
+            runner.close()
+
+    def test_pheromone_summary_keeps_strongest(self):
+        """Test the summary keeps the strongest edges, weakest first, with the range over all edges"""
+        engine = make_engine(num_vertices=6)
+        levels = np.arange(36, dtype=np.float64).reshape(6, 6)
+        levels = levels + levels.T
+        np.fill_diagonal(levels, 0.0)
+        engine.pheromone_matrix.raw[:] = levels
+
+        summary = summarize_pheromones(engine.pheromone_matrix, edge_limit=3)
+        expected = np.sort(levels[np.triu_indices(6, k=1)])
+
+        assert summary.levels.tolist() == expected[-3:].tolist()
+        assert summary.levels.tolist() == levels[summary.rows, summary.cols].tolist()
+        assert summary.min_level == expected[0]
+        assert summary.max_level == expected[-1]
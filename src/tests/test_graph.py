@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import os
 import sys
@@ -39,13 +40,12 @@ class TestGraph:
         """Test distance matrix has correct structure"""
         graph = Graph(3)
         
-        # Should be dict of dicts
-        assert isinstance(graph.distance_matrix, dict)
-        assert len(graph.distance_matrix) == 3
+        # Should be a dense (n, n) array
+        assert isinstance(graph.distance_matrix, np.ndarray)
+        assert graph.distance_matrix.shape == (3, 3)
         
         # Each row should have 3 columns
         for i in range(3):
-            assert i in graph.distance_matrix
             assert len(graph.distance_matrix[i]) == 3
             
             # Diagonal should be 0
@@ -180,4 +180,182 @@ class TestGraph:
         
         # Edge grade should be 1/10 = 0.1
         edge_grade = graph.get_edge_grade(0, 1)
-        assert edge_grade == pytest.approx(0.1)
\ No newline at end of file
+        assert edge_grade == pytest.approx(0.1)
+
+    def test_heuristic_matrix_is_inverse_distance(self):
+        """Test heuristic matrix caches 1/d with a zero diagonal"""
+        graph = Graph(2)
+        graph.vertices = [Vertice(0, 0), Vertice(6, 8)]
+        graph.calculate_distances()
+
+        assert graph.heuristic_matrix[0][1] == pytest.approx(0.1)
+        assert graph.heuristic_matrix[1][0] == pytest.approx(0.1)
+        assert graph.heuristic_matrix[0][0] == 0.0
+
+    def test_get_heuristic_caches_powered_matrix(self):
+        """Test eta**beta is computed once per beta and refreshed on recalculation"""
+        graph = Graph(2)
+        graph.vertices = [Vertice(0, 0), Vertice(3, 4)]
+        graph.calculate_distances()
+
+        powered = graph.get_heuristic(2.0)
+        assert powered[0][1] == pytest.approx(0.04)
+        assert powered[1][1] == 0.0
+        assert graph.get_heuristic(2.0) is powered
+
+        # beta == 0 must not turn the diagonal into 1
+        assert graph.get_heuristic(0.0)[0][0] == 0.0
+
+        graph.calculate_distances()
+        assert graph.get_heuristic(2.0) is not powered
+
+    def test_duplicate_vertices_have_zero_heuristic(self):
+        """Test coincident vertices do not divide by zero"""
+        graph = Graph(2)
+        graph.vertices = [Vertice(5, 5), Vertice(5, 5)]
+        graph.calculate_distances()
+
+        assert graph.distance_matrix[0][1] == 0.0
+        assert graph.get_edge_grade(0, 1) == 0.0
+
+    def test_candidate_lists_hold_nearest_neighbours(self):
+        """Test candidate lists contain the k nearest vertices sorted by distance"""
+        graph = Graph(4)
+        graph.vertices = [Vertice(0, 0), Vertice(1, 0), Vertice(3, 0), Vertice(10, 0)]
+        graph.set_candidate_list_size(2)
+        graph.calculate_distances()
+
+        assert graph.candidate_lists.shape == (4, 2)
+        assert list(graph.candidate_lists[0]) == [1, 2]
+        assert list(graph.candidate_lists[1]) == [0, 2]
+        assert list(graph.candidate_lists[3]) == [2, 1]
+
+    def test_candidate_lists_clamped_to_vertex_count(self):
+        """Test candidate list size never exceeds n - 1 and never contains the vertex itself"""
+        graph = Graph(3)
+        graph.set_candidate_list_size(10)
+
+        assert graph.candidate_lists.shape == (3, 2)
+        for i in range(3):
+            assert i not in graph.candidate_lists[i]
+
+    def test_candidate_lists_disabled_by_default(self):
+        """Test a plain graph has no candidate lists"""
+        graph = Graph(5)
+
+        assert graph.candidate_list_size is None
+        assert graph.candidate_lists is None
+
+    def test_symmetric_graph_matches_dense(self):
+        """Test condensed storage yields the same distances, heuristics and candidate lists"""
+        dense = Graph(12)
+        condensed = Graph(12, symmetric=True)
+        condensed.vertices = dense.vertices
+        condensed.calculate_distances()
+
+        dense.set_candidate_list_size(4)
+        condensed.set_candidate_list_size(4)
+
+        assert condensed.distance_matrix.data.size == 12 * 11 // 2
+        assert np.allclose(condensed.distance_matrix.to_dense(), dense.distance_matrix)
+        assert np.allclose(condensed.get_heuristic(2.0).to_dense(), dense.get_heuristic(2.0))
+        assert np.array_equal(condensed.candidate_lists, dense.candidate_lists)
+
+    def test_coordinates_are_contiguous_arrays(self):
+        """Test coordinates live in float64 x/y arrays and vertices are views over them"""
+        graph = Graph(4)
+
+        assert isinstance(graph.xs, np.ndarray) and graph.xs.dtype == np.float64
+        assert graph.xs.shape == graph.ys.shape == (4,)
+        assert graph.vertices[2].x == graph.xs[2]
+        assert graph.vertices[-1].y == graph.ys[3]
+        with pytest.raises(IndexError):
+            graph.vertices[4]
+
+    def test_add_and_remove_vertices_in_bulk(self):
+        """Test bulk append returns new indices and bulk removal swap-removes highest index first"""
+        graph = Graph(0)
+
+        added = graph.add_vertices([0, 1, 2, 3], [10, 11, 12, 13])
+        assert np.array_equal(added, [0, 1, 2, 3])
+        assert graph.num_vertices == 4
+
+        graph.remove_vertices([0, 2])
+        graph.calculate_distances()
+
+        assert np.array_equal(graph.xs, [3, 1])
+        assert np.array_equal(graph.ys, [13, 11])
+        assert graph.distance_matrix[0][1] == pytest.approx(np.hypot(2, 2))
+
+        with pytest.raises(ValueError):
+            graph.add_vertices([1, 2], [3])
+        with pytest.raises(IndexError):
+            graph.remove_vertices([5])
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_incremental_edits_match_full_rebuild(self, symmetric):
+        """Test add_vertex/remove_vertex keep distances and candidate lists equal to a recompute"""
+        graph = Graph(30, symmetric=symmetric)
+        graph.set_candidate_list_size(5)
+
+        rng = np.random.default_rng(1)
+        for x, y in rng.integers(0, 500, size=(6, 2)).tolist():
+            graph.add_vertex(x, y)
+        graph.remove_vertices([0, 17, 35])
+        graph.add_vertices([250.5], [40.25])
+
+        reference = Graph(0, symmetric=symmetric)
+        reference.set_vertices(graph.xs, graph.ys)
+        reference.candidate_list_size = 5
+        reference.calculate_distances()
+
+        dense = graph.distance_matrix.to_dense() if symmetric else graph.distance_matrix
+        expected = reference.distance_matrix.to_dense() if symmetric else reference.distance_matrix
+        assert graph.num_vertices == 34
+        assert np.allclose(dense, expected)
+        assert np.allclose(np.asarray(graph.get_heuristic(2.0)[np.arange(34)]),
+                           np.asarray(reference.get_heuristic(2.0)[np.arange(34)]))
+
+        # same neighbour distances (ties may order differently)
+        rows = np.arange(34)[:, None]
+        assert np.allclose(dense[rows, graph.candidate_lists], expected[rows, reference.candidate_lists])
+
+    def test_best_path_is_repaired_by_cheapest_insertion(self):
+        """Test inserting and removing vertices keeps the best tour valid with an exact length"""
+        graph = Graph(0)
+        graph.add_vertices([0, 10, 10, 0], [0, 0, 10, 10])
+        graph.best_path = [0, 1, 2, 3, 0]
+        graph.best_path_length = 40.0
+
+        # midpoint of edge 1-2 costs nothing extra
+        v = graph.add_vertex(10, 5)
+        assert graph.best_path == [0, 1, v, 2, 3, 0]
+        assert graph.best_path_length == pytest.approx(40.0)
+
+        # removing vertex 0 moves the last vertex (v) into slot 0
+        graph.remove_vertex(0)
+        tour = graph.best_path
+        assert sorted(tour[:-1]) == [0, 1, 2, 3] and tour[0] == tour[-1]
+        length = sum(graph.distance_matrix[a, b] for a, b in zip(tour[:-1], tour[1:]))
+        assert graph.best_path_length == pytest.approx(length)
+
+    def test_bounds_and_seed_control_random_layout(self):
+        """Test random placement stays within the given bounds and is reproducible from a seed"""
+        graph = Graph(50, bounds=(30, 10), rng=5)
+
+        assert graph.bounds == (30, 10)
+        assert graph.xs.max() < 30 and graph.ys.max() < 10
+        assert np.array_equal(graph.xs, Graph(50, bounds=(30, 10), rng=5).xs)
+
+    def test_recorded_iteration_is_listed_on_demand(self):
+        """Test an iteration's tour arrays are kept as-is and listed as (tour, length) pairs when read"""
+        graph = Graph(3, rng=1)
+        tours = np.array([[0, 1, 2, 0], [2, 1, 0, 2]])
+        lengths = np.array([12.0, 11.5])
+
+        graph.record_iteration(tours, lengths)
+        assert graph.last_iteration[0] is tours
+        assert graph.last_iteration_paths == [([0, 1, 2, 0], 12.0), ([2, 1, 0, 2], 11.5)]
+
+        graph.add_vertex(4, 4)
+        assert graph.last_iteration_paths == []
@@ -0,0 +1,117 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.local_search import improve_tours, two_opt
+from src.map.graph import Graph
+from src.map.vertice import Vertice
+
+
+def _square_graph():
+    graph = Graph(4)
+    graph.vertices = [Vertice(0, 0), Vertice(10, 0), Vertice(10, 10), Vertice(0, 10)]
+    graph.calculate_distances()
+    return graph
+
+
+class TestLocalSearch:
+    def test_two_opt_removes_crossing(self):
+        """Test 2-opt untangles a crossing tour on a square"""
+        graph = _square_graph()
+        crossing = np.array([0, 2, 1, 3, 0])
+
+        tour, length = two_opt(crossing, graph.distance_matrix, graph.nearest_neighbours(3))
+
+        assert length == pytest.approx(40.0)
+        assert tour[0] == tour[-1]
+        assert sorted(tour[:-1]) == [0, 1, 2, 3]
+
+    def test_two_opt_never_worsens_and_keeps_permutation(self):
+        """Test 2-opt on random tours keeps a valid permutation and never lengthens it"""
+        rng = np.random.default_rng(4)
+        graph = Graph(60)
+        neighbours = graph.nearest_neighbours(8)
+
+        for _ in range(5):
+            order = rng.permutation(60)
+            tour = np.append(order, order[0])
+            before = graph.distance_matrix[tour[:-1], tour[1:]].sum()
+
+            improved, length = two_opt(tour, graph.distance_matrix, neighbours)
+
+            assert sorted(improved[:-1]) == list(range(60))
+            assert improved[0] == improved[-1]
+            assert length <= before + 1e-9
+            assert length == pytest.approx(graph.distance_matrix[improved[:-1], improved[1:]].sum())
+
+    def test_two_opt_small_tours_unchanged(self):
+        """Test tours with fewer than four cities are returned as they are"""
+        graph = Graph(3)
+
+        tour, length = two_opt(np.array([0, 1, 2, 0]), graph.distance_matrix, graph.nearest_neighbours(2))
+
+        assert list(tour) == [0, 1, 2, 0]
+        assert length == pytest.approx(graph.distance_matrix[[0, 1, 2], [1, 2, 0]].sum())
+
+    def test_improve_tours_only_touches_selected_rows(self):
+        """Test improve_tours leaves rows outside indices untouched"""
+        graph = _square_graph()
+        tours = np.array([[0, 2, 1, 3, 0], [0, 2, 1, 3, 0]])
+        lengths = graph.distance_matrix[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+
+        improve_tours(tours, lengths, graph.distance_matrix, graph.nearest_neighbours(3), indices=[1])
+
+        assert list(tours[0]) == [0, 2, 1, 3, 0]
+        assert lengths[1] == pytest.approx(40.0)
+        assert lengths[0] > 40.0
+
+    def test_engine_local_search_feeds_best_path_and_deposits(self):
+        """Test improved tours drive best-path tracking and pheromone deposits"""
+        for mode in ("all", "best"):
+            engine = AcoEngine(
+                alpha=1.0,
+                beta=2.0,
+                evaporation_rate=0.5,
+                num_vertices=30,
+                num_ants=4,
+                local_search=mode
+            )
+
+            engine.run_iteration()
+
+            best = engine.graph.best_path
+            assert sorted(best[:-1]) == list(range(30))
+            assert engine.graph.best_path_length == pytest.approx(
+                sum(engine.graph.distance_matrix[a][b] for a, b in zip(best[:-1], best[1:]))
+            )
+
+            # every edge of the best tour received its deposit on top of evaporation
+            for a, b in zip(best[:-1], best[1:]):
+                assert engine.pheromone_matrix.current[a][b] >= 0.5 + engine.graph.get_edge_grade(a, b) - 1e-12
+
+    def test_engine_rejects_local_search_on_asymmetric_distances(self):
+        """Test local search is refused when an explicit matrix has d[i, j] != d[j, i]"""
+        matrix = np.array([[0, 2, 9, 10], [1, 0, 6, 4], [15, 7, 0, 8], [6, 3, 12, 0]], dtype=np.float64)
+        graph = Graph(4, rng=0)
+        graph.set_explicit_distances(matrix)
+
+        with pytest.raises(ValueError):
+            AcoEngine(1.0, 2.0, 0.5, 4, 3, graph=graph, local_search="best")
+
+        engine = AcoEngine(1.0, 2.0, 0.5, 4, 3, graph=graph)
+        engine.run_iteration()
+        best = engine.graph.best_path
+        assert engine.graph.best_path_length == pytest.approx(
+            sum(engine.graph.distance_matrix[a, b] for a, b in zip(best[:-1], best[1:]))
+        )
+
+        graph.set_explicit_distances((matrix + matrix.T) / 2)
+        AcoEngine(1.0, 2.0, 0.5, 4, 3, graph=graph, local_search="best").run_iteration()
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.engine_runner import EngineRunner
+from src.config import CENTER_WIDTH, SCREEN_HEIGHT
+from src.ui.main_panel import MainPanel
+
+
+def make_runner():
+    engine = AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.9, num_vertices=10, num_ants=5, seed=0)
+    return EngineRunner(engine)
+
+
+class TestMainPanel:
+    def test_edge_styles_keep_strongest(self):
+        """Test only the K strongest edges are styled, with alpha and width growing with the level"""
+        runner = make_runner()
+        runner.step()
+        runner.flush()
+        pheromones = runner.snapshot.pheromones
+
+        rows, cols, alphas, widths = MainPanel(max_edges=7).edge_styles(pheromones)
+
+        assert len(rows) == 7
+        assert rows.tolist() == pheromones.rows[-7:].tolist()
+        assert np.all(np.diff(alphas) >= 0)
+        assert np.all((90 <= alphas) & (alphas <= 255))
+        assert np.all((1 <= widths) & (widths <= 4))
+
+    def test_edge_layer_redrawn_on_new_pheromones(self):
+        """Test the cached edge layer is reused until the snapshot carries a new pheromone summary"""
+        runner = make_runner()
+        panel = MainPanel()
+        screen = pygame.Surface((CENTER_WIDTH, SCREEN_HEIGHT))
+        redraws = []
+        draw_edges = panel._draw_edges
+        panel._draw_edges = lambda *args: redraws.append(1) or draw_edges(*args)
+
+        panel.draw(screen, 0, runner.snapshot)
+        runner.configure(alpha=2.0)
+        runner.flush()
+        panel.draw(screen, 0, runner.snapshot)
+        assert len(redraws) == 1
+
+        runner.step()
+        runner.flush()
+        panel.draw(screen, 0, runner.snapshot)
+        assert len(redraws) == 2
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from multiprocessing import shared_memory
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.parallel_colony import ParallelColony, SharedArray
+from src.map.graph import Graph
+from src.map.pheromone_matrix import PheromoneMatrix
+
+
+class TestParallelColony:
+    def test_shared_array_roundtrip(self):
+        """Test a SharedArray can be re-attached by name and is unlinked on close"""
+        block = SharedArray((2, 3), np.float64)
+        block.array[:] = np.arange(6).reshape(2, 3)
+
+        name, shape, dtype = block.spec
+        other = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=other.buf)
+        assert view[1][2] == 5.0
+        del view
+        other.close()
+
+        block.close()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_find_paths_batched_across_workers(self):
+        """Test ants split across workers still return full tours and merge deposits"""
+        graph = Graph(9)
+        graph.set_candidate_list_size(3)
+        pheromone_matrix = PheromoneMatrix(9, 0.5)
+        colony = ParallelColony(5, workers=2, rng=np.random.default_rng(0))
+
+        try:
+            tours, lengths = colony.find_paths_batched(graph, pheromone_matrix, alpha=1.0, beta=2.0)
+
+            assert tours.shape == (5, 10)
+            for tour, length in zip(tours, lengths):
+                assert sorted(tour[:-1]) == list(range(9))
+                expected = sum(graph.distance_matrix[a][b] for a, b in zip(tour[:-1], tour[1:]))
+                assert length == pytest.approx(expected)
+
+            expected_pending = np.zeros((9, 9))
+            for tour in tours:
+                for a, b in zip(tour[:-1], tour[1:]):
+                    expected_pending[a][b] += graph.get_edge_grade(a, b)
+            assert np.allclose(pheromone_matrix.pending, expected_pending)
+
+            assert graph.best_path_length == pytest.approx(lengths.min())
+            assert len(graph.last_iteration_paths) == 5
+
+            # a recalculated graph is re-shared under new block names
+            old_names = {block.spec[0] for block in colony._blocks.values()}
+            graph.calculate_distances()
+            colony.find_paths_batched(graph, pheromone_matrix, alpha=1.0, beta=2.0)
+            assert old_names.isdisjoint(block.spec[0] for block in colony._blocks.values())
+        finally:
+            colony.close()
+
+        assert colony._blocks == {}
+
+    def test_engine_uses_parallel_colony_for_multiple_workers(self):
+        """Test AcoEngine switches to the process-pool colony when workers > 1"""
+        engine = AcoEngine(alpha=1.0, beta=1.0, evaporation_rate=0.5, num_vertices=6, num_ants=4, workers=2)
+
+        try:
+            assert isinstance(engine.colony, ParallelColony)
+            stats = engine.run_iteration()
+            assert stats["paths_count"] == 4
+        finally:
+            engine.close()
+
+    def test_symmetric_storage_is_shared_condensed(self):
+        """Test symmetric graphs ship their condensed arrays to the workers"""
+        engine = AcoEngine(
+            alpha=1.0, beta=1.0, evaporation_rate=0.5, num_vertices=7, num_ants=4, workers=2, symmetric=True
+        )
+
+        try:
+            stats = engine.run_iteration()
+            assert stats["paths_count"] == 4
+            assert engine.colony._blocks["distance"].array.shape == (21,)
+        finally:
+            engine.close()
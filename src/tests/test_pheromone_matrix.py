@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 import sys
 import os
@@ -55,8 +56,8 @@ class TestPheromoneMatrix:
         pm = PheromoneMatrix(vertex_count=2, evaporation_rate=0.5)
         
         # Set some pending values
-        pm.pending[0][1] = 3.5
-        pm.pending[1][0] = 2.1
+        pm.add_pending(0, 1, 3.5)
+        pm.add_pending(1, 0, 2.1)
         
         pm.reset_pending()
         
@@ -89,8 +90,8 @@ class TestPheromoneMatrix:
         pm.current[1][0] = 3.0
         
         # Set pending values
-        pm.pending[0][1] = 2.0
-        pm.pending[1][0] = 1.5
+        pm.add_pending(0, 1, 2.0)
+        pm.add_pending(1, 0, 1.5)
         
         pm.apply_pending()
         
@@ -124,3 +125,170 @@ class TestPheromoneMatrix:
         # Expected: (1.0 * 0.9) + 0.5 = 1.4
         assert pm.current[0][1] == pytest.approx(1.4)
         assert pm.pending[0][1] == 0.0
+
+    def test_matrices_are_contiguous_arrays(self):
+        """Test current and pending are contiguous ndarrays of the requested dtype"""
+        pm = PheromoneMatrix(vertex_count=4, evaporation_rate=0.5, dtype=np.float32)
+
+        for matrix in (pm.current, pm.pending):
+            assert isinstance(matrix, np.ndarray)
+            assert matrix.shape == (4, 4)
+            assert matrix.dtype == np.float32
+            assert matrix.flags["C_CONTIGUOUS"]
+
+    def test_apply_pending_updates_in_place(self):
+        """Test apply_pending reuses the same buffer and bumps the version"""
+        pm = PheromoneMatrix(vertex_count=3, evaporation_rate=0.5)
+        current = pm.current
+
+        pm.add_pending(0, 2, 1.0)
+        pm.apply_pending()
+        assert pm.version == 1
+
+        assert pm.current is current
+        assert pm.current[0, 2] == pytest.approx(1.5)
+        assert pm.current[2][0] == pytest.approx(0.5)
+
+    def test_reset_and_clamp(self):
+        """Test reset fills every edge and clamp bounds them, keeping a zero diagonal"""
+        pm = PheromoneMatrix(vertex_count=3, evaporation_rate=0.5)
+
+        pm.reset(2.0)
+        assert pm.current[0][1] == 2.0
+        assert pm.current[1][1] == 0.0
+
+        pm.current[0][1] = 10.0
+        pm.current[1][2] = 0.001
+        pm.clamp(0.1, 5.0)
+
+        assert pm.current[0][1] == 5.0
+        assert pm.current[1][2] == 0.1
+        assert pm.current[2][0] == 2.0
+        assert pm.current[2][2] == 0.0
+        assert pm.version == 2
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_bounds_apply_without_rewriting_the_matrix(self, symmetric):
+        """Test set_bounds floors evaporation and caps deposits while untouched cells stay as stored"""
+        pm = PheromoneMatrix(vertex_count=6, evaporation_rate=0.5, symmetric=symmetric)
+        pm.set_bounds(0.2, 1.5)
+        untouched = (np.array([2, 3, 4, 0]), np.array([3, 4, 5, 5]))
+        stored = np.array(pm.raw[untouched])
+
+        for _ in range(5):
+            pm.add_pending_edges([0, 1], [1, 2], [1.0, 1.0])
+            pm.apply_pending()
+
+        levels = pm.levels()
+        assert np.array_equal(pm.raw[untouched], stored)
+        assert np.allclose(levels[untouched], 0.2)
+        assert levels[0, 1] == pytest.approx(1.5)
+        assert levels[1, 1] == 0.0
+
+        # lowering the floor keeps the cells that were resting on it
+        pm.set_bounds(0.1, 1.5)
+        assert np.allclose(pm.levels()[untouched], 0.2)
+
+    def test_evaporation_is_lazy_until_folded(self):
+        """Test evaporation only shrinks the scale and deposits touch only walked edges"""
+        pm = PheromoneMatrix(vertex_count=3, evaporation_rate=0.5)
+        raw = pm.raw.copy()
+
+        pm.add_pending_edges([0, 0], [1, 1], [0.25, 0.25])
+        pm.apply_pending()
+
+        assert pm.scale == 0.5
+        assert pm.raw[1][2] == raw[1][2]
+        assert pm.levels()[1][2] == pytest.approx(0.5)
+        assert pm.levels()[0][1] == pytest.approx(1.0)
+
+        # reading current folds the scale into the stored values
+        assert pm.current[0][1] == pytest.approx(1.0)
+        assert pm.scale == 1.0
+
+    def test_scale_folds_before_underflow(self):
+        """Test a tiny scale is folded into the values automatically"""
+        pm = PheromoneMatrix(vertex_count=2, evaporation_rate=1e-20)
+
+        pm.apply_pending()
+        assert pm.scale == pytest.approx(1e-20)
+
+        pm.apply_pending()
+        assert pm.scale == 1.0
+        assert pm.raw[0][1] == pytest.approx(1e-40)
+
+    def test_changes_since_reports_touched_edges(self):
+        """Test the change log lists sparse updates and gives up after full changes"""
+        pm = PheromoneMatrix(vertex_count=3, evaporation_rate=0.5)
+        start = pm.version
+
+        pm.add_pending(0, 1, 1.0)
+        pm.apply_pending()
+        pm.add_pending(2, 0, 1.0)
+        pm.apply_pending()
+
+        rows, cols = pm.changes_since(start)
+        assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 1), (2, 0)]
+
+        synced = pm.version
+        pm.reset(1.0)
+        assert pm.changes_since(synced) is None
+
+    def test_symmetric_deposits_land_on_both_directions(self):
+        """Test symmetric storage keeps one trail per undirected edge"""
+        pm = PheromoneMatrix(vertex_count=4, evaporation_rate=0.5, symmetric=True)
+
+        pm.add_pending_edges(np.array([0, 2]), np.array([1, 1]), np.array([1.0, 2.0]))
+        pm.add_pending(1, 0, 1.0)
+        pm.apply_pending()
+
+        levels = pm.levels()
+        assert levels[0, 1] == pytest.approx(2.5)
+        assert levels[1, 0] == pytest.approx(2.5)
+        assert levels[1, 2] == pytest.approx(2.5)
+        assert levels[2, 3] == pytest.approx(0.5)
+        assert levels[3, 3] == 0.0
+        assert pm.raw.data.size == 6
+
+    def test_symmetric_matches_dense_on_symmetric_deposits(self):
+        """Test dense and symmetric storage agree when deposits are made in both directions"""
+        dense = PheromoneMatrix(vertex_count=5, evaporation_rate=0.8)
+        condensed = PheromoneMatrix(vertex_count=5, evaporation_rate=0.8, symmetric=True)
+
+        rows = np.array([0, 1, 2, 3, 4])
+        cols = np.array([1, 2, 3, 4, 0])
+        for _ in range(3):
+            dense.add_pending_edges(np.concatenate([rows, cols]), np.concatenate([cols, rows]), np.ones(10))
+            condensed.add_pending_edges(rows, cols, np.ones(5))
+            dense.apply_pending()
+            condensed.apply_pending()
+
+        condensed.clamp(0.1, 2.0)
+        dense.clamp(0.1, 2.0)
+
+        assert np.allclose(condensed.current.to_dense(), dense.current)
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_add_and_remove_vertex_keep_trails(self, symmetric):
+        """Test a vertex can be appended with seeded trails and swap-removed without touching other edges"""
+        pm = PheromoneMatrix(vertex_count=3, evaporation_rate=0.5, symmetric=symmetric)
+        pm.add_pending(0, 1, 4.0)
+        pm.apply_pending()
+
+        pm.add_vertex(np.array([0.25, 0.5, 0.75]))
+        levels = pm.levels()
+        assert pm.vertex_count == 4
+        assert levels[3, 1] == pytest.approx(0.5)
+        assert levels[2, 3] == pytest.approx(0.75)
+        assert levels[3, 3] == 0.0
+        assert levels[0, 1] == pytest.approx(4.5)
+
+        version = pm.version
+        pm.remove_vertex(0)
+        levels = pm.levels()
+        assert pm.version > version
+        assert pm.vertex_count == 3
+        # vertex 3 moved into slot 0
+        assert levels[0, 1] == pytest.approx(0.5)
+        assert levels[0, 2] == pytest.approx(0.75)
+        assert levels[0, 0] == 0.0
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.resize import append_vertex, swap_remove_vertex
+from src.map.symmetric_matrix import SymmetricMatrix
+
+
+def _symmetric(n, seed=0):
+    rng = np.random.default_rng(seed)
+    dense = rng.random((n, n))
+    dense = dense + dense.T
+    np.fill_diagonal(dense, 0.0)
+    return dense
+
+
+class TestResize:
+    @pytest.mark.parametrize("condensed", [False, True])
+    def test_append_then_remove_matches_dense_reference(self, condensed):
+        """Test appending and swap-removing vertices match the same edits on a dense copy"""
+        reference = _symmetric(5)
+        matrix = SymmetricMatrix.from_dense(reference) if condensed else reference.copy()
+
+        for step in range(4):
+            values = np.arange(len(reference), dtype=np.float64) + step
+            matrix = append_vertex(matrix, values)
+
+            grown = np.zeros((len(reference) + 1,) * 2)
+            grown[:-1, :-1] = reference
+            grown[-1, :-1] = grown[:-1, -1] = values
+            reference = grown
+
+        matrix = swap_remove_vertex(matrix, 2)
+        last = len(reference) - 1
+        order = [i if i != 2 else last for i in range(last)]
+        reference = reference[np.ix_(order, order)]
+
+        dense = matrix.to_dense() if condensed else matrix
+        assert np.array_equal(dense, reference)
+
+    def test_dense_append_reuses_spare_capacity(self):
+        """Test consecutive appends write into one buffer instead of reallocating"""
+        matrix = append_vertex(np.zeros((3, 3)), np.ones(3))
+        buffer = matrix.base
+
+        matrix = append_vertex(matrix, np.ones(4))
+        assert matrix.base is buffer
+        assert matrix.shape == (5, 5)
+
+        matrix = swap_remove_vertex(matrix, 0)
+        matrix = append_vertex(matrix, np.full(4, 2.0))
+        assert matrix.base is buffer
+        assert matrix[4, 0] == 2.0 and matrix[0, 4] == 2.0
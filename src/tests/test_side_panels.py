@@ -0,0 +1,40 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.engine_runner import EngineRunner
+from src.config import BEST_COLOR, LEFT_PANEL_WIDTH, SCREEN_HEIGHT, TOP_PATH_COLORS
+from src.ui.side_panels import SidePanels
+
+
+class TestSidePanels:
+    def test_panels_rebuilt_only_on_new_iteration(self):
+        """Test panel surfaces are reused across frames until the snapshot shows a new iteration"""
+        pygame.font.init()
+        runner = EngineRunner(AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.9, num_vertices=10, num_ants=5, seed=0))
+        runner.step()
+        runner.flush()
+        panels = SidePanels()
+        screen = pygame.Surface((LEFT_PANEL_WIDTH, SCREEN_HEIGHT))
+
+        panels.draw(screen, runner.snapshot, TOP_PATH_COLORS, BEST_COLOR)
+        first = panels._panels["standard"][1]
+        runner.configure(beta=3.0)
+        runner.flush()
+        panels.draw(screen, runner.snapshot, TOP_PATH_COLORS, BEST_COLOR)
+        assert panels._panels["standard"][1] is first
+
+        runner.step()
+        runner.flush()
+        panels.draw(screen, runner.snapshot, TOP_PATH_COLORS, BEST_COLOR)
+        assert panels._panels["standard"][1] is not first
+        assert len(panels._panels["standard"][1]) == 4
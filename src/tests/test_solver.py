@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.solver import load_points, main
+
+
+class TestSolver:
+    def test_engine_imports_without_pygame(self):
+        """Test the algorithm, map and solver modules load without pulling in pygame"""
+        code = (
+            "import sys\n"
+            "import src.solver, src.algorithm.aco_engine, src.map.graph\n"
+            "sys.exit('pygame' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root)
+        assert result.returncode == 0
+
+    def test_random_layout_run_prints_json_summary(self, capsys):
+        """Test a seeded random run reports a finite best length as JSON"""
+        argv = ["--vertices", "15", "--ants", "5", "--iterations", "3", "--seed", "4", "--width", "50", "--json"]
+
+        assert main(argv) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["vertices"] == 15
+        assert summary["iterations"] == 3
+        assert summary["best_length"] < float("inf")
+
+    def test_seed_makes_runs_reproducible(self, capsys):
+        """Test the same seed yields the same best length"""
+        argv = ["--vertices", "12", "--ants", "4", "--iterations", "4", "--seed", "7", "--json"]
+
+        main(argv)
+        first = json.loads(capsys.readouterr().out)["best_length"]
+        main(argv)
+        second = json.loads(capsys.readouterr().out)["best_length"]
+
+        assert first == second
+
+    def test_input_file_and_tour_output(self, tmp_path, capsys):
+        """Test points are read from a CSV and the best tour is written one index per line"""
+        points = tmp_path / "points.csv"
+        points.write_text("# x,y\n0,0\n10;0\n10 10\n0,10\nbad\n")
+        tour = tmp_path / "tour.txt"
+
+        xs, ys = load_points(points)
+        assert xs.tolist() == [0, 10, 10, 0] and ys.tolist() == [0, 0, 10, 10]
+
+        assert main(["--input", str(points), "--iterations", "5", "--ants", "4", "--output", str(tour)]) == 0
+        assert "best length 40.00" in capsys.readouterr().out
+        assert sorted(int(v) for v in tour.read_text().split()) == [0, 1, 2, 3]
+
+    def test_tsplib_input_uses_instance_metric(self, tmp_path, capsys):
+        """Test a .tsp input is solved under its EUC_2D metric (integer tour lengths)"""
+        instance = tmp_path / "square.tsp"
+        instance.write_text(
+            "NAME: square\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n"
+            "1 0 0\n2 0 1000\n3 1000 1000\n4 1000 0\nEOF\n"
+        )
+
+        assert main(["--input", str(instance), "--iterations", "5", "--ants", "4", "--seed", "0", "--json"]) == 0
+        summary = json.loads(capsys.readouterr().out)
+        assert summary["vertices"] == 4
+        assert summary["best_length"] == 4000
+
+    def test_too_few_vertices_fails(self, capsys):
+        """Test a run with fewer than 2 vertices exits with an error"""
+        assert main(["--vertices", "1"]) == 1
+        assert "at least 2" in capsys.readouterr().err
+
+    def test_distance_cache_is_reused(self, tmp_path, capsys):
+        """Test a second run with --distance-cache maps the stored matrix and finds the same tour"""
+        argv = ["--vertices", "20", "--ants", "4", "--iterations", "3", "--seed", "2", "--json",
+                "--distance-cache", str(tmp_path / "cache")]
+
+        main(argv)
+        first = json.loads(capsys.readouterr().out)
+        stored = sorted(os.listdir(tmp_path / "cache"))
+        main(argv)
+        second = json.loads(capsys.readouterr().out)
+
+        assert len(stored) == 2
+        assert sorted(os.listdir(tmp_path / "cache")) == stored
+        assert second["best_length"] == first["best_length"]
@@ -0,0 +1,116 @@
+import os
+import sys
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.colony import nearest_neighbour_tour
+from src.map.graph import Graph
+from src.map.spatial_index import GridIndex
+
+
+def brute_force(xs, ys, k):
+    d = np.hypot(xs[:, None] - xs[None, :], ys[:, None] - ys[None, :])
+    np.fill_diagonal(d, np.inf)
+    return np.sort(d, axis=1)[:, :k]
+
+
+def neighbour_distances(xs, ys, neighbours):
+    return np.hypot(xs[:, None] - xs[neighbours], ys[:, None] - ys[neighbours])
+
+
+class TestGridIndex:
+    def test_neighbours_match_brute_force(self):
+        """Test batched k-nearest queries return the exact k nearest distances, closest first"""
+        rng = np.random.default_rng(3)
+        # a dense cluster next to sparse points stretches some searches over many cells
+        xs = np.concatenate([rng.random(400) * 1000, rng.random(200) * 5])
+        ys = np.concatenate([rng.random(400) * 300, rng.random(200) * 5])
+
+        neighbours = GridIndex(xs, ys).neighbours(10)
+
+        assert neighbours.shape == (600, 10)
+        assert not (neighbours == np.arange(600)[:, None]).any()
+        assert np.allclose(neighbour_distances(xs, ys, neighbours), brute_force(xs, ys, 10))
+
+    def test_query_and_radius(self):
+        """Test single-point k-nearest and radius queries against brute force"""
+        rng = np.random.default_rng(4)
+        xs, ys = rng.random(300) * 100, rng.random(300) * 100
+        index = GridIndex(xs, ys)
+        d = np.hypot(xs - 40.0, ys - 60.0)
+
+        assert np.allclose(d[index.query(40.0, 60.0, 7)], np.sort(d)[:7])
+        assert np.array_equal(np.sort(index.query_radius(40.0, 60.0, 12.5)), np.flatnonzero(d <= 12.5))
+        assert len(index.query(40.0, 60.0, 1000)) == 300
+
+    def test_incremental_insert(self):
+        """Test inserted points, inside or outside the built extent, are found before and after the rebuild"""
+        rng = np.random.default_rng(5)
+        xs, ys = rng.random(200) * 50, rng.random(200) * 50
+        index = GridIndex(xs, ys)
+
+        for x, y in zip(rng.random(100) * 80 - 15, rng.random(100) * 80 - 15):
+            assert index.insert(x, y) == len(xs)
+            xs, ys = np.append(xs, x), np.append(ys, y)
+            assert index.query(x, y, 1)[0] == len(xs) - 1
+
+        assert np.allclose(neighbour_distances(xs, ys, index.neighbours(5)), brute_force(xs, ys, 5))
+
+    def test_degenerate_layouts(self):
+        """Test duplicated and collinear points and tiny inputs"""
+        assert GridIndex([], []).neighbours(3).shape == (0, 0)
+        assert GridIndex([1.0], [1.0]).neighbours(3).shape == (1, 0)
+
+        same = GridIndex(np.zeros(20), np.zeros(20)).neighbours(4)
+        assert same.shape == (20, 4) and not (same == np.arange(20)[:, None]).any()
+
+        xs = np.arange(50, dtype=np.float64)
+        line = GridIndex(xs, np.zeros(50)).neighbours(2)
+        assert np.allclose(np.abs(xs[line] - xs[:, None]).max(axis=1), [2.0] + [1.0] * 48 + [2.0])
+
+
+class TestGraphSpatialIndex:
+    def test_large_graphs_use_the_index(self):
+        """Test candidate lists and the nearest-neighbour tour from the index match the distance matrix"""
+        graph = Graph(300, rng=6)
+        graph.spatial_index_threshold = 100
+        graph.set_candidate_list_size(8)
+        d = graph.distance_matrix
+
+        assert graph.spatial_index() is not None
+        rows = np.arange(300)[:, None]
+        assert np.allclose(d[rows, graph.candidate_lists], brute_force(graph.xs, graph.ys, 8))
+
+        tour = nearest_neighbour_tour(d, index=graph.spatial_index())
+        expected = nearest_neighbour_tour(d)
+        assert sorted(tour[:-1].tolist()) == list(range(300))
+        assert np.isclose(d[tour[:-1], tour[1:]].sum(), d[expected[:-1], expected[1:]].sum())
+
+    def test_index_follows_vertex_edits(self):
+        """Test clicked-in vertices are inserted into the index and removals rebuild it"""
+        graph = Graph(150, rng=7)
+        graph.spatial_index_threshold = 100
+        graph.set_candidate_list_size(5)
+        index = graph.spatial_index()
+
+        v = graph.add_vertex(12.5, 7.5)
+        assert graph.spatial_index() is index and len(index) == 151
+        graph.remove_vertex(3)
+
+        rows = np.arange(150)[:, None]
+        assert np.allclose(graph.distance_matrix[rows, graph.candidate_lists], brute_force(graph.xs, graph.ys, 5))
+        assert v == 150 and graph.spatial_index() is not index
+
+    def test_small_and_geographic_graphs_skip_the_index(self):
+        """Test the index is only used above the threshold and for planar metrics"""
+        graph = Graph(50)
+        assert graph.spatial_index() is None
+
+        graph.spatial_index_threshold = 10
+        graph.set_vertices(graph.xs, graph.ys, "geo")
+        assert graph.spatial_index() is None
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.stagnation import lambda_branching, tour_diversity
+from src.map.symmetric_matrix import SymmetricMatrix
+
+
+class TestStagnation:
+    def test_branching_is_list_size_for_uniform_trails(self):
+        """Test every listed edge counts while all trails are equal"""
+        pheromones = np.ones((5, 5))
+        neighbours = np.array([[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2], [0, 1, 2]])
+
+        assert lambda_branching(pheromones, neighbours) == pytest.approx(3.0)
+
+    def test_branching_drops_to_two_on_a_converged_tour(self):
+        """Test only the two tour edges per vertex count once they dominate"""
+        n = 6
+        pheromones = np.full((n, n), 0.01)
+        tour = np.arange(n)
+        pheromones[tour, np.roll(tour, -1)] = 5.0
+        pheromones[np.roll(tour, -1), tour] = 5.0
+        neighbours = np.array([[j for j in range(n) if j != i] for i in range(n)])
+
+        assert lambda_branching(pheromones, neighbours) == pytest.approx(2.0)
+        assert lambda_branching(SymmetricMatrix.from_dense(pheromones), neighbours) == pytest.approx(2.0)
+
+    @pytest.mark.parametrize("symmetric", [False, True])
+    def test_branching_of_a_converged_run_is_two_for_either_storage(self, symmetric):
+        """Test trails deposited one way round by a real run read as two edges per vertex once converged"""
+        engine = AcoEngine(2.0, 1.0, 0.5, 10, 10, candidate_list_size=6, symmetric=symmetric, seed=4)
+        for _ in range(200):
+            stats = engine.run_iteration()
+
+        assert stats["diversity"] == pytest.approx(0.0, abs=0.05)
+        assert stats["branching"] == pytest.approx(2.0, abs=0.25)
+
+    def test_diversity_bounds(self):
+        """Test identical tours score 0 and edge-disjoint tours score 1"""
+        same = np.array([[0, 1, 2, 3, 4, 0]] * 3)
+        assert tour_diversity(same, 5) == 0.0
+
+        disjoint = np.array([[0, 1, 2, 3, 4, 0], [0, 2, 4, 1, 3, 0]])
+        assert tour_diversity(disjoint, 5) == pytest.approx(1.0)
+
+        assert tour_diversity(same[:1], 5) == 1.0
@@ -0,0 +1,68 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.symmetric_matrix import SymmetricMatrix, condensed_index, condensed_size
+
+
+class TestSymmetricMatrix:
+    def test_condensed_index_is_order_independent(self):
+        """Test (i, j) and (j, i) map to the same condensed cell"""
+        assert condensed_index(1, 3) == condensed_index(3, 1)
+        assert condensed_index(0, 1) == 0
+        assert condensed_index(0, 2) == 1
+        assert condensed_index(1, 2) == 2
+
+    def test_new_vertex_edges_are_appended(self):
+        """Test the edges of vertex n follow the n*(n-1)/2 existing cells"""
+        n = 5
+        indices = condensed_index(np.arange(n), np.full(n, n))
+        assert np.array_equal(indices, np.arange(condensed_size(n), condensed_size(n + 1)))
+
+    def test_dense_roundtrip(self):
+        """Test from_dense/to_dense and the dense-style indexing forms agree"""
+        rng = np.random.default_rng(0)
+        dense = rng.random((6, 6))
+        dense = dense + dense.T
+        np.fill_diagonal(dense, 0.0)
+
+        matrix = SymmetricMatrix.from_dense(dense)
+
+        assert matrix.data.size == condensed_size(6)
+        assert np.array_equal(matrix.to_dense(), dense)
+        assert matrix[2][4] == dense[2][4]
+        assert matrix[4, 2] == dense[4, 2]
+        assert np.array_equal(matrix[3], dense[3])
+        assert np.array_equal(matrix[[1, 5]], dense[[1, 5]])
+
+        rows = np.array([[0], [3]])
+        cols = np.array([[1, 3], [3, 5]])
+        assert np.array_equal(matrix[rows, cols], dense[rows, cols])
+
+    def test_setitem_and_add_at_share_both_directions(self):
+        """Test writes through (i, j) are visible at (j, i) and the diagonal is ignored"""
+        matrix = SymmetricMatrix(4, fill=1.0)
+
+        matrix[np.array([0, 2]), np.array([3, 2])] = np.array([5.0, 9.0])
+        matrix.add_at(np.array([1, 2, 3]), np.array([2, 1, 3]), np.array([1.0, 1.0, 7.0]))
+
+        assert matrix[3, 0] == 5.0
+        assert matrix[1, 2] == 3.0
+        assert matrix[2, 2] == 0.0
+        assert matrix[3, 3] == 0.0
+
+    def test_max_min_include_diagonal(self):
+        """Test max/min mirror a dense matrix with a zero diagonal"""
+        matrix = SymmetricMatrix(3, fill=2.0)
+        assert matrix.max() == 2.0
+        assert matrix.min() == 0.0
+
+        with pytest.raises(ValueError):
+            SymmetricMatrix(0).max()
@@ -0,0 +1,117 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.algorithm.aco_engine import AcoEngine
+from src.algorithm.timing import P2Quantile, PhaseTimers, StreamingStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTiming:
+    def test_p2_quantile_tracks_true_quantiles(self):
+        """Test the constant-memory estimates land close to the exact p50/p95"""
+        samples = np.random.default_rng(0).exponential(1.0, 20000)
+        p50, p95 = P2Quantile(0.5), P2Quantile(0.95)
+        for x in samples:
+            p50.add(x)
+            p95.add(x)
+
+        assert p50.value() == pytest.approx(np.quantile(samples, 0.5), rel=0.05)
+        assert p95.value() == pytest.approx(np.quantile(samples, 0.95), rel=0.05)
+        assert len(p50.heights) == 5
+
+    def test_streaming_stats_summary(self):
+        """Test count, mean and max are exact and reported in milliseconds"""
+        stats = StreamingStats()
+        for seconds in (0.001, 0.002, 0.003):
+            stats.add(seconds)
+
+        summary = stats.summary()
+        assert summary["count"] == 3
+        assert summary["mean_ms"] == pytest.approx(2.0)
+        assert summary["max_ms"] == pytest.approx(3.0)
+        assert summary["p50_ms"] == pytest.approx(2.0)
+
+    def test_disabled_timers_record_nothing(self):
+        """Test start/lap are no-ops and subscribers are not called while disabled"""
+        timers = PhaseTimers(enabled=False)
+        calls = []
+        timers.subscribe(lambda *args: calls.append(args))
+
+        assert timers.start() is None
+        assert timers.lap("construction", None) is None
+        timers.end_iteration(1)
+
+        assert timers.summary() == {}
+        assert calls == []
+
+    def test_laps_accumulate_and_notify_subscribers(self):
+        """Test laps are summed per phase, aggregated per iteration and pushed to subscribers"""
+        clock = FakeClock()
+        timers = PhaseTimers(enabled=True, clock=clock)
+        seen = []
+        unsubscribe = timers.subscribe(lambda iteration, timings: seen.append((iteration, dict(timings))))
+
+        t = timers.start()
+        clock.now = 0.5
+        t = timers.lap("stats", t)
+        clock.now = 2.0
+        t = timers.lap("construction", t)
+        clock.now = 2.25
+        timers.lap("stats", t)
+        timers.end_iteration(1)
+
+        assert seen == [(1, {"stats": 0.75, "construction": 1.5})]
+        assert timers.summary()["stats"]["total_ms"] == pytest.approx(750.0)
+
+        unsubscribe()
+        timers.end_iteration(2)
+        assert len(seen) == 1
+
+    @pytest.mark.parametrize("variant", ["as", "mmas", "acs"])
+    def test_engine_reports_every_phase(self, variant):
+        """Test a timed engine records one sample per phase per iteration"""
+        engine = AcoEngine(
+            alpha=1.0,
+            beta=2.0,
+            evaporation_rate=0.5,
+            num_vertices=10,
+            num_ants=4,
+            variant=variant,
+            local_search="best",
+            timing=True
+        )
+        iterations = []
+        engine.timers.subscribe(lambda iteration, timings: iterations.append(iteration))
+
+        for _ in range(3):
+            engine.run_iteration()
+
+        summary = engine.timers.summary()
+        assert iterations == [1, 2, 3]
+        assert {"choice_info", "construction", "local_search", "deposit", "stats", "iteration"} <= set(summary)
+        assert summary["iteration"]["count"] == 3
+        if variant != "acs":
+            assert summary["evaporation"]["count"] == 3
+
+    def test_engine_timing_is_off_by_default(self):
+        """Test engines built without timing=True collect no timings"""
+        engine = AcoEngine(alpha=1.0, beta=2.0, evaporation_rate=0.5, num_vertices=6, num_ants=3)
+        engine.run_iteration()
+
+        assert not engine.timers.enabled
+        assert engine.timers.summary() == {}
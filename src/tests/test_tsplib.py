@@ -0,0 +1,132 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.graph import to_canvas
+from src.map.metrics import pair_distances
+from src.map.tsplib import read_tsplib
+
+BURMA14 = """NAME: burma14
+TYPE: TSP
+COMMENT: 14-Staedte in Burma (Zaw Win)
+DIMENSION: 14
+EDGE_WEIGHT_TYPE: GEO
+EDGE_WEIGHT_FORMAT: FUNCTION
+DISPLAY_DATA_TYPE: COORD_DISPLAY
+NODE_COORD_SECTION
+   1  16.47       96.10
+   2  16.47       94.44
+   3  20.09       92.54
+   4  22.39       93.37
+   5  25.23       97.24
+   6  22.00       96.05
+   7  20.47       97.02
+   8  17.20       96.29
+   9  16.30       97.38
+  10  14.05       98.12
+  11  16.53       97.38
+  12  21.52       95.59
+  13  19.41       97.13
+  14  20.09       94.55
+EOF
+"""
+
+# weights of a 4-vertex instance, full and as the triangles the other formats list
+FULL = np.array([
+    [0, 2, 9, 10],
+    [2, 0, 6, 4],
+    [9, 6, 0, 3],
+    [10, 4, 3, 0],
+], dtype=np.float64)
+
+
+def write_explicit(tmp_path, weight_format, values):
+    text = (
+        "NAME: tiny\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+        f"EDGE_WEIGHT_FORMAT: {weight_format}\nEDGE_WEIGHT_SECTION\n"
+        + "\n".join(" ".join(str(int(v)) for v in values[i:i + 3]) for i in range(0, len(values), 3))
+        + "\nEOF\n"
+    )
+    path = tmp_path / f"{weight_format}.tsp"
+    path.write_text(text)
+    return str(path)
+
+
+class TestTsplib:
+    def test_geo_instance_matches_published_optimum(self, tmp_path):
+        """Test burma14's optimal tour has the published length 3323 under the GEO metric"""
+        path = tmp_path / "burma14.tsp"
+        path.write_text(BURMA14)
+
+        instance = read_tsplib(str(path), chunk_lines=4)
+        graph = instance.build_graph()
+        graph.calculate_distances()
+
+        tour = [0, 9, 8, 10, 7, 12, 6, 11, 5, 4, 3, 2, 13, 1, 0]
+        d = np.asarray(graph.distance_matrix)
+        assert instance.name == "burma14"
+        assert graph.metric == "geo"
+        assert sum(d[a, b] for a, b in zip(tour, tour[1:])) == 3323
+        assert np.all(np.diag(d) == 0)
+
+    def test_rounded_metrics(self):
+        """Test EUC_2D rounds, CEIL_2D rounds up and ATT uses the pseudo-Euclidean rule"""
+        assert pair_distances("euc_2d", 0, 0, 1, 1) == 1
+        assert pair_distances("euc_2d", 0, 0, 1.5, 1) == 2
+        assert pair_distances("ceil_2d", 0, 0, 1, 1) == 2
+        # sqrt(1000 / 10) = 10 exactly, sqrt(1010 / 10) ~ 10.05 rounds to 10 and is bumped to 11
+        assert pair_distances("att", 0, 0, 30, 10) == 10
+        assert pair_distances("att", 0, 0, 31, 7) == 11
+
+    @pytest.mark.parametrize("weight_format, rows, cols", [
+        ("UPPER_ROW", *np.triu_indices(4, 1)),
+        ("LOWER_DIAG_ROW", *np.tril_indices(4, 0)),
+        ("UPPER_COL", *np.tril_indices(4, -1)),
+    ])
+    def test_explicit_formats(self, tmp_path, weight_format, rows, cols):
+        """Test triangle formats expand to the full symmetric matrix"""
+        path = write_explicit(tmp_path, weight_format, FULL[rows, cols])
+
+        instance = read_tsplib(path)
+        graph = instance.build_graph()
+        graph.calculate_distances()
+
+        assert instance.metric == "explicit"
+        assert np.array_equal(graph.distance_matrix, FULL)
+        with pytest.raises(ValueError):
+            graph.add_vertex(0.0, 0.0)
+
+    def test_display_only_normalization(self, tmp_path):
+        """Test large coordinates keep their metric but are scaled onto the canvas for drawing"""
+        path = tmp_path / "wide.tsp"
+        path.write_text(
+            "NAME: wide\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n"
+            "3 100000 50000\n1 0 0\n2 30000 40000\nEOF\n"
+        )
+
+        graph = read_tsplib(str(path)).build_graph()
+        graph.calculate_distances()
+        xs, ys = to_canvas(graph.display, graph.xs, graph.ys)
+
+        assert graph.distance_matrix[0, 1] == 50000
+        assert graph.xs.tolist() == [0, 30000, 100000]
+        assert xs.min() == 0 and xs.max() <= graph.bounds[0] + 1e-9
+        assert ys.max() <= graph.bounds[1] + 1e-9
+
+    def test_rejects_unsupported_types(self, tmp_path):
+        """Test unknown edge weight types and short sections raise ValueError"""
+        path = tmp_path / "bad.tsp"
+        path.write_text("NAME: bad\nTYPE: TSP\nDIMENSION: 2\nEDGE_WEIGHT_TYPE: EUC_3D\nNODE_COORD_SECTION\n1 0 0\n2 1 1\nEOF\n")
+        with pytest.raises(ValueError):
+            read_tsplib(str(path))
+
+        path.write_text("NAME: short\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n1 0 0\n2 1 1\n")
+        with pytest.raises(ValueError):
+            read_tsplib(str(path))
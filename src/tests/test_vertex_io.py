@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.map.graph import fit_display
+from src.map.vertex_io import load_points, save_points, sidecar_path
+
+
+class TestVertexIo:
+    def test_round_trip_is_exact(self, tmp_path):
+        """Test saved coordinates load back bit for bit, comment header included"""
+        xs = np.random.default_rng(0).uniform(-1e6, 1e6, 1000)
+        ys = np.random.default_rng(1).uniform(0, 1, 1000)
+        path = tmp_path / "points.csv"
+
+        save_points(path, xs, ys)
+        loaded_xs, loaded_ys = load_points(path)
+
+        assert path.read_text().startswith("# x,y\n")
+        assert np.array_equal(loaded_xs, xs) and np.array_equal(loaded_ys, ys)
+
+    def test_irregular_lines_fall_back(self, tmp_path):
+        """Test mixed separators, extra columns and short lines still parse"""
+        path = tmp_path / "mixed.csv"
+        path.write_text("# x,y\n0,0\n10;0,7\n\n10 10\n0,10\nbad\n")
+
+        xs, ys = load_points(path)
+        assert xs.tolist() == [0, 10, 10, 0] and ys.tolist() == [0, 0, 10, 10]
+
+    def test_non_numeric_data_raises(self, tmp_path):
+        """Test text that is not coordinates raises ValueError"""
+        path = tmp_path / "words.csv"
+        path.write_text("lorem, ipsum\ndolor, sit\n")
+
+        with pytest.raises(ValueError):
+            load_points(path)
+
+    def test_sidecar_reused_until_csv_changes(self, tmp_path):
+        """Test the .npy sidecar is memory-mapped on reload and ignored once the CSV is newer"""
+        path = tmp_path / "points.csv"
+        path.write_text("1,2\n3,4\n")
+
+        load_points(path, sidecar=True)
+        assert os.path.exists(sidecar_path(path))
+        xs, _ = load_points(path, sidecar=True)
+        assert isinstance(xs, np.memmap) and xs.tolist() == [1, 3]
+
+        path.write_text("5,6\n7,8\n9,9\n")
+        stamp = os.path.getmtime(sidecar_path(path)) + 10
+        os.utime(path, (stamp, stamp))
+        xs, _ = load_points(path, sidecar=True)
+        assert xs.tolist() == [5, 7, 9]
+
+    def test_fit_display_only_for_off_canvas_points(self):
+        """Test canvas layouts keep no display transform while larger ones are scaled onto the canvas"""
+        assert fit_display(np.array([0.0, 100.0]), np.array([5.0, 50.0]), (780, 680)) is None
+
+        offset_x, offset_y, scale = fit_display(np.array([-100.0, 1460.0]), np.array([0.0, 10.0]), (780, 680))
+        assert (offset_x, offset_y) == (-100.0, 0.0)
+        assert scale == pytest.approx(0.5)
@@ -8,6 +8,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.map.graph import Graph
 from src.map.vertice import Vertice
 
 
@@ -109,4 +110,24 @@ class TestVertice:
         
         # dx = 300, dy = 400
         # distance = sqrt(300² + 400²) = sqrt(90000 + 160000) = sqrt(250000) = 500
-        assert distance == 500.0
\ No newline at end of file
+        assert distance == 500.0
+
+    def test_vertice_uses_slots(self):
+        """Test Vertice carries no per-instance __dict__"""
+        vertice = Vertice(1, 2)
+
+        assert not hasattr(vertice, "__dict__")
+        with pytest.raises(AttributeError):
+            vertice.label = "a"
+
+    def test_view_reads_and_writes_graph_arrays(self):
+        """Test a Vertice view is backed by the graph's coordinate arrays"""
+        graph = Graph(3)
+        graph.set_vertices([0, 3, 6], [0, 4, 0])
+
+        view = graph.vertices[1]
+        assert (view.x, view.y) == (3.0, 4.0)
+        assert view.distance_to(graph.vertices[0]) == 5.0
+
+        view.x = 9
+        assert graph.xs[1] == 9.0
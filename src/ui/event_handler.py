@@ -1,10 +1,17 @@
 import pygame
 import pygame_gui
+import numpy as np
 
-from src.map.vertice import Vertice
 from src.algorithm.aco_engine import AcoEngine
+from src.map.graph import Graph, fit_display, from_canvas, to_canvas
+from src.map.tsplib import read_tsplib
+from src.map.vertex_io import load_points
 
-from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT
+from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, VERTEX_SIDECARS
+
+
+# how close (in canvas pixels) a right click must land to remove a vertex
+VERTEX_PICK_RADIUS = 12
 
 
 class EventHandler:
@@ -34,34 +41,34 @@ class EventHandler:
 
                 if LEFT_PANEL_WIDTH <= mx <= LEFT_PANEL_WIDTH + CENTER_WIDTH and 0 <= my <= SCREEN_HEIGHT:
 
+                    x = mx - LEFT_PANEL_WIDTH
                     if event.button == 1:
 
-                        self.app.aco_engine.graph.vertices.append(Vertice(mx - LEFT_PANEL_WIDTH, my))
-
-                        self.app.aco_engine.graph.num_vertices += 1
+                        # incremental: keeps the learned trails and repairs the best tour
+                        self.app.runner.call(lambda engine: add_vertex_at(engine, x, my))
 
+                    elif event.button == 3:
 
-                        self.reset_simulation(self.app.aco_engine.graph)
-
-                        print(f"Added vertex at ({mx - LEFT_PANEL_WIDTH},{my})")
+                        # resolved on the worker, against the layout the edit actually applies to
+                        self.app.runner.call(lambda engine: remove_vertex_near(engine, x, my))
 
             # Sliders
             if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
                 if event.ui_element == self.sidebar.alpha_slider:
                     val = event.value
-                    self.app.aco_engine.alpha = val
+                    self.app.runner.configure(alpha=val)
                     self.sidebar.alpha_label.set_text(f"Alpha: {val:.2f}")
                 elif event.ui_element == self.sidebar.beta_slider:
                     val = event.value
-                    self.app.aco_engine.beta = val
+                    self.app.runner.configure(beta=val)
                     self.sidebar.beta_label.set_text(f"Beta: {val:.2f}")
                 elif event.ui_element == self.sidebar.evap_slider:
                     val = event.value
-                    self.app.aco_engine.evaporation_rate = val
+                    self.app.runner.configure(evaporation_rate=val)
                     self.sidebar.evap_label.set_text(f"Evaporation: {val:.2f}")
                 elif event.ui_element == self.sidebar.speed_slider:
                     val = event.value
-                    self.app.iterations_per_second = val
+                    self.app.runner.set_speed(val)
                     self.sidebar.speed_label.set_text(f"Speed: {val} it/s")
 
             # Text input finished
@@ -70,29 +77,27 @@ class EventHandler:
                     try:
                         ants = int(self.sidebar.ants_input.get_text())
                         if ants > 0 and ants <= 100:
-                            self.app.aco_engine.num_ants = ants
                             # Rebuild ants list
-                            self.reset_simulation(self.app.aco_engine.graph)
+                            self.reset_simulation(same_vertices=True, num_ants=ants)
                             print(f"Applied ants count {ants}")
                         else:
-                            self.sidebar.ants_input.set_text(str(self.app.aco_engine.num_ants))
+                            self.sidebar.ants_input.set_text(str(self.app.snapshot.num_ants))
                             print("Invalid ants count - outside range")
                     except Exception:
-                        self.sidebar.ants_input.set_text(str(self.app.aco_engine.num_ants))
+                        self.sidebar.ants_input.set_text(str(self.app.snapshot.num_ants))
                         print("Invalid ants count")
                 elif event.ui_element == self.sidebar.vertices_input:
                     try:
                         vertices = int(self.sidebar.vertices_input.get_text())
                         if vertices > 0 and vertices <= 150:
-                            self.app.aco_engine.graph.num_vertices = vertices
                             # Rebuild ants list
-                            self.reset_simulation()
+                            self.reset_simulation(num_vertices=vertices)
                             print(f"Applied vertice count {vertices}")
                         else:
-                            self.sidebar.vertices_input.set_text(str(self.app.aco_engine.graph.num_vertices))
+                            self.sidebar.vertices_input.set_text(str(self.app.snapshot.num_vertices))
                             print("Invalid vertice count - outside range")
                     except Exception:
-                        self.sidebar.vertices_input.set_text(str(self.app.aco_engine.graph.num_vertices))
+                        self.sidebar.vertices_input.set_text(str(self.app.snapshot.num_vertices))
                         print("Invalid vertice count")
 
 
@@ -100,28 +105,26 @@ class EventHandler:
             if event.type == pygame_gui.UI_BUTTON_PRESSED: 
                 if event.ui_element == self.sidebar.start_button:
                     if self._can_run():
-                        self.app.simulation_running = True
+                        self.app.runner.start()
                         print("Simulation started")
                     else:
                         print("Cannot start: need at least 2 vertices")
                 elif event.ui_element == self.sidebar.stop_button:
-                    self.app.simulation_running = False
+                    self.app.runner.stop()
                     print("Simulation stopped")
                 elif event.ui_element == self.sidebar.step_button:
                     if self._can_run():
-                        stats = self.app.aco_engine.run_iteration()
-                        self.app.iteration_count += 1
+                        self.app.runner.step()
                     else:
                         print("Cannot step: need at least 2 vertices")
                 elif event.ui_element == self.sidebar.reset_button:
-                    self.reset_simulation(self.app.aco_engine.graph)
+                    self.reset_simulation(same_vertices=True)
                     print("Simulation reset")
                 elif event.ui_element == self.sidebar.generate_button:
                     self.reset_simulation()
                     print(f"Generated problem with vertices")
                 elif event.ui_element == self.sidebar.clear_board_button:
-                    self.app.aco_engine.graph.num_vertices = 0
-                    self.reset_simulation()
+                    self.reset_simulation(num_vertices=0)
                 elif event.ui_element == self.sidebar.view_toggle_button:
                     if self.app.view_mode == "standard":
                         self.app.view_mode = "top9"
@@ -134,44 +137,121 @@ class EventHandler:
                 elif event.ui_element == self.sidebar.export_vertice_button:
                     self.app.file_manager.open_export_vertices_dialog()
 
-    def reset_simulation(self, graph = None):
-
-
-        num_ants = getattr(self.app.aco_engine, "num_ants", 50)
-        alpha = getattr(self.app.aco_engine, "alpha", 1.0)
-        beta = getattr(self.app.aco_engine, "beta", 2.0)
-        evaporation_rate = getattr(self.app.aco_engine, "evaporation_rate", 0.1)
-        num_vertices = getattr(self.app.aco_engine.graph, "num_vertices", 10)
-
-
-        if graph is None:
-            self.app.aco_engine = AcoEngine(
-                alpha=alpha,
-                beta=beta,
-                evaporation_rate=evaporation_rate,
-                num_vertices = num_vertices,
-                num_ants = num_ants
-            )
-        else:
-            self.app.aco_engine = AcoEngine(
-                alpha=alpha,
-                beta=beta,
-                evaporation_rate=evaporation_rate,
-                num_vertices = num_vertices,
-                num_ants = num_ants,
-                graph=graph
-            )
-
-        self.app.file_manager.graph = self.app.aco_engine.graph
-
-        self.app.iteration_count = 0
-        self.app.iteration_accumulator = 0.0
-        
-        self.sidebar.vertices_input.set_text(str(self.app.aco_engine.graph.num_vertices))
+    def reset_simulation(self, points=None, num_vertices=None, same_vertices=False, num_ants=None, instance=None):
+        """
+        Queue a rebuild of the engine with the current parameters: on the current layout
+        (same_vertices), on points = (xs, ys), on a TsplibInstance, or on num_vertices random vertices.
+        """
+        self.app.runner.reset(
+            lambda old: rebuild_engine(old, points, num_vertices, same_vertices, num_ants, instance)
+        )
+
+    def load_file(self, path):
+        """Queue loading a CSV or TSPLIB file; it is parsed on the engine's worker thread."""
+        self.app.runner.reset(lambda old: load_engine(old, path))
 
-    
     def _can_run(self):
-        if self.app.aco_engine.graph.num_vertices >= 2:
+        if self.app.snapshot.num_vertices >= 2:
             return True
         
-        return False
\ No newline at end of file
+        return False
+
+
+def rebuild_engine(old, points=None, num_vertices=None, same_vertices=False, num_ants=None, instance=None):
+    """A fresh AcoEngine carrying over old's parameters, workers, storage, bounds and timers; the runner closes old."""
+    if num_ants is None:
+        num_ants = getattr(old, "num_ants", 50)
+    alpha = getattr(old, "alpha", 1.0)
+    beta = getattr(old, "beta", 2.0)
+    evaporation_rate = getattr(old, "evaporation_rate", 0.1)
+    if num_vertices is None:
+        num_vertices = getattr(old.graph, "num_vertices", 10)
+    workers = getattr(old, "workers", 1)
+    symmetric = getattr(old, "symmetric", False)
+    bounds = getattr(old.graph, "bounds", None)
+    # keep the timers (and their subscribers) but start the new run with fresh aggregates
+    timers = getattr(old, "timers", None)
+    if timers is not None:
+        timers.reset()
+
+    graph = None
+    if same_vertices:
+        graph = old.graph
+    elif instance is not None:
+        graph = instance.build_graph(symmetric, bounds)
+    elif points is not None:
+        graph = Graph(0, symmetric, bounds)
+        graph.set_vertices(*points)
+        # points off the canvas are kept and scaled for display instead of dropped
+        graph.display = fit_display(graph.xs, graph.ys, graph.bounds)
+
+    return AcoEngine(
+        alpha=alpha,
+        beta=beta,
+        evaporation_rate=evaporation_rate,
+        num_vertices = graph.num_vertices if graph is not None else num_vertices,
+        num_ants = num_ants,
+        workers = workers,
+        symmetric = symmetric,
+        bounds = bounds,
+        timers = timers,
+        graph = graph
+    )
+
+
+def load_engine(old, path):
+    """rebuild_engine on the vertices of a CSV or TSPLIB file; old is kept when the file cannot be used."""
+    try:
+        if path.lower().endswith(".tsp"):
+            instance = read_tsplib(path)
+            engine = rebuild_engine(old, instance=instance)
+            print(f"Loaded {instance.name or path}: {instance.dimension} vertices, {instance.metric} distances")
+            return engine
+
+        xs, ys = load_points(path, VERTEX_SIDECARS)
+    except (OSError, ValueError) as e:
+        print(f"Failed to load file: {e}")
+        return old
+
+    if not len(xs):
+        print("No valid vertices in file")
+        return old
+
+    engine = rebuild_engine(old, points=(xs, ys))
+    print(f"Loaded {len(xs)} vertices from {path}")
+    return engine
+
+
+def add_vertex_at(engine, x, y):
+    """Add a vertex at canvas position (x, y), in the graph's own units when it has a display transform."""
+    graph = engine.graph
+    try:
+        engine.add_vertices(*([v] for v in from_canvas(graph.display, x, y)))
+    except ValueError as e:
+        print(f"Cannot add vertex: {e}")
+        return
+    print(f"Added vertex at ({x},{y})")
+
+
+def vertex_at(xs, ys, x, y, radius=VERTEX_PICK_RADIUS):
+    """Index of the vertex closest to (x, y) if it lies within radius, else None."""
+    if len(xs) == 0:
+        return None
+
+    d2 = (xs - x) ** 2 + (ys - y) ** 2
+    index = int(np.argmin(d2))
+    return index if d2[index] <= radius * radius else None
+
+
+def remove_vertex_near(engine, x, y):
+    """Remove the vertex drawn within VERTEX_PICK_RADIUS canvas pixels of (x, y), if any."""
+    graph = engine.graph
+    index = vertex_at(*to_canvas(graph.display, graph.xs, graph.ys), x, y)
+    if index is None:
+        return
+    try:
+        engine.remove_vertices([index])
+    except ValueError as e:
+        print(f"Cannot remove vertex: {e}")
+        return
+    print(f"Removed vertex {index}")
@@ -3,15 +3,17 @@ import pygame
 import pygame_gui
 from pygame_gui.windows import UIFileDialog
 
-from src.map.vertice import Vertice
-from src.config import CENTER_WIDTH, SCREEN_HEIGHT
+from src.config import VERTEX_SIDECARS
+from src.map.vertex_io import save_points
 
 
 class FileManager:
-    def __init__(self, ui_manager, graph, on_vertices_loaded):
-        self.graph = graph
+    def __init__(self, ui_manager, get_vertices, on_file_picked):
+        # get_vertices() -> (xs, ys) of the current layout; on_file_picked(path) loads a CSV or
+        # TSPLIB file (off the UI thread, so large files do not freeze the window)
+        self.get_vertices = get_vertices
         self.ui = ui_manager
-        self.on_vertices_loaded = on_vertices_loaded
+        self.on_file_picked = on_file_picked
         self.file_dialog = None
         self._dialog_mode = None 
 
@@ -22,9 +24,9 @@ class FileManager:
         self.file_dialog = UIFileDialog(
             rect=pygame.Rect(100, 50, 640, 420),
             manager=self.ui,
-            window_title="Load Vertices",
+            window_title="Load Vertices (CSV or TSPLIB)",
             allow_picking_directories=False,
-            allowed_suffixes=['.csv']
+            allowed_suffixes=['.csv', '.tsp']
         )
 
     def open_export_vertices_dialog(self):
@@ -66,42 +68,8 @@ class FileManager:
         return self.file_dialog is not None
 
     def _load_vertices_from_file(self, path: str):
-        try:
-            vertices = []
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    for sep in [",", ";"]:
-                        line = line.replace(sep, " ")
-                    parts = line.split()
-                    if len(parts) < 2:
-                        continue
-                    x = float(parts[0])
-                    y = float(parts[1])
-
-
-                    if 0 <= x <= CENTER_WIDTH - 5 and 0 <= y <= SCREEN_HEIGHT - 5:
-                        print(f"Adding vertice ({x},{y})...")
-                        vertices.append(Vertice(x, y))
-                    else:
-                        print(f"Vertice ({x},{y}) is out of bounds, skipping...")
-
-            if not vertices:
-                print("No valid vertices in file")
-                return
-
-            g = self.graph
-            g.vertices = vertices
-            g.num_vertices = len(vertices)
-
-            if callable(self.on_vertices_loaded):
-                self.on_vertices_loaded(g)
-            print(f"Loaded {len(vertices)} vertices from {path}")
-        except Exception as e:
-            print(f"Failed to load file: {e}")
+        if callable(self.on_file_picked):
+            self.on_file_picked(path)
 
     def export_vertices_to_csv(self, path: str):
         self._save_vertices_to_file(path)
@@ -115,13 +83,9 @@ class FileManager:
             if directory and not os.path.exists(directory):
                 os.makedirs(directory, exist_ok=True)
 
-            verts = getattr(self.graph, "vertices", [])
-            with open(path, "w", encoding="utf-8", newline="") as f:
-                f.write("# x,y\n")
-                for v in verts:
-
-                    f.write(f"{float(v.x)},{float(v.y)}\n")
+            xs, ys = self.get_vertices()
+            save_points(path, xs, ys, VERTEX_SIDECARS)
 
-            print(f"Exported {len(verts)} vertices to {path}")
+            print(f"Exported {len(xs)} vertices to {path}")
         except Exception as e:
             print(f"Failed to export CSV: {e}")
\ No newline at end of file
@@ -0,0 +1,15 @@
+import pygame
+
+_small_font = None
+
+
+def small_font():
+    """Shared label font, created on first use so importing the UI does not start SDL."""
+    global _small_font
+
+    if _small_font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        _small_font = pygame.font.SysFont(None, 16)
+
+    return _small_font
@@ -1,71 +1,76 @@
 import pygame
-import math
+import numpy as np
 
-from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, TOP_PATH_COLORS, BEST_COLOR, PURPLE, PADDING
+from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, TOP_PATH_COLORS, BEST_COLOR, PURPLE, PADDING, PHEROMONE_EDGE_LIMIT
 
 
 class MainPanel:
-    def __init__(self):
-        pass
+    def __init__(self, max_edges=PHEROMONE_EDGE_LIMIT):
+        # top-K culling: only the max_edges strongest trails are drawn
+        self.max_edges = max_edges
 
-    def _map_point(self, x, y, dst_w, dst_h):
-        sx = PADDING + (x / max(1, CENTER_WIDTH - 20)) * (dst_w - 2 * PADDING)
-        sy = PADDING + (y / max(1, SCREEN_HEIGHT - 20)) * (dst_h - 2 * PADDING)
-        return int(sx), int(sy)
+        # the edge layer is redrawn only when the snapshot carries a new pheromone summary
+        self.edge_layer = pygame.Surface((CENTER_WIDTH, SCREEN_HEIGHT), flags=pygame.SRCALPHA)
+        self._edge_key = None
 
-    def draw(self, target_surface, x_offset, aco):
-        """Render center visualization and blit to target_surface at x_offset,0."""
-        center_surf = pygame.Surface((CENTER_WIDTH, SCREEN_HEIGHT), flags=pygame.SRCALPHA)
-        center_surf.fill((0, 0, 0, 0))
-
-        # collect pheromones
-        ph_values = []
-        for i_dict in aco.pheromone_matrix.current.values():
-            for v in i_dict.values():
-                ph_values.append(v)
-        if not ph_values:
-            ph_values = [1.0]
-
-        max_ph = max(ph_values)
-        min_ph = min(ph_values)
+    def _map_points(self, xs, ys, dst_w, dst_h):
+        """(n, 2) int screen positions of the vertices."""
+        sx = PADDING + (xs / max(1, CENTER_WIDTH - 20)) * (dst_w - 2 * PADDING)
+        sy = PADDING + (ys / max(1, SCREEN_HEIGHT - 20)) * (dst_h - 2 * PADDING)
+        return np.stack([sx, sy], axis=1).astype(int)
+
+    def edge_styles(self, pheromones):
+        """(rows, cols, alphas, widths) of the edges to draw, weakest first."""
+        rows, cols, levels = pheromones.rows, pheromones.cols, pheromones.levels
+        if self.max_edges is not None:
+            # the summary is sorted weakest first, so the strongest K are its tail
+            keep = max(0, len(levels) - self.max_edges)
+            rows, cols, levels = rows[keep:], cols[keep:], levels[keep:]
+
+        # pheromone range over every edge, not just the drawn ones
+        max_ph, min_ph = pheromones.max_level, pheromones.min_level
         if max_ph <= 0:
             max_ph = 1.0
+        rng = max_ph - min_ph if max_ph > min_ph else 1.0
 
         # dynamic range compression (gamma + min alpha)
         gamma = 0.5  # sqrt curve
-        rng = max_ph - min_ph if max_ph > min_ph else 1.0
+        norm = np.clip((levels - min_ph) / rng, 0.0, None) ** gamma
+
+        alphas = (90 + 165 * norm).astype(int)       # 90..255 (never too dark)
+        widths = 1 + (norm * 3).astype(int)          # 1..4
+        return rows, cols, alphas, widths
 
-        # draw all edges with improved visibility
-        for i in range(aco.graph.num_vertices):
-            for j in range(i + 1, aco.graph.num_vertices):
-                pher = aco.pheromone_matrix.current.get(i, {}).get(j, 0.0)
-                # normalize in current range
-                norm = (pher - min_ph) / rng
-                # gamma adjust
-                norm = math.pow(max(0.0, norm), gamma)
-                # alpha + width mapping
-                alpha = int(90 + 165 * norm)          # 90..255 (never too dark)
-                width = 1 + int(norm * 3)             # 1..4
-                va = aco.graph.vertices[i]
-                vb = aco.graph.vertices[j]
-                p1 = self._map_point(va.x, va.y, CENTER_WIDTH, SCREEN_HEIGHT)
-                p2 = self._map_point(vb.x, vb.y, CENTER_WIDTH, SCREEN_HEIGHT)
-                col = (PURPLE[0], PURPLE[1], PURPLE[2], alpha)
-                pygame.draw.line(center_surf, col, p1, p2, width)
+    def _draw_edges(self, snapshot, points):
+        layer = self.edge_layer
+        layer.fill((0, 0, 0, 0))
+
+        rows, cols, alphas, widths = self.edge_styles(snapshot.pheromones)
+        starts = points[rows].tolist()
+        ends = points[cols].tolist()
+        line = pygame.draw.line
+        for p1, p2, alpha, width in zip(starts, ends, alphas.tolist(), widths.tolist()):
+            line(layer, (PURPLE[0], PURPLE[1], PURPLE[2], alpha), p1, p2, width)
+
+    def draw(self, target_surface, x_offset, snapshot):
+        """Render center visualization and blit to target_surface at x_offset,0."""
+        points = self._map_points(*snapshot.canvas_points(), CENTER_WIDTH, SCREEN_HEIGHT)
+
+        # a new summary object means the pheromones (or the vertices) changed since the last redraw
+        key = (snapshot.pheromones, self.max_edges)
+        if self._edge_key is None or key[0] is not self._edge_key[0] or key[1] != self._edge_key[1]:
+            self._draw_edges(snapshot, points)
+            self._edge_key = key
+        target_surface.blit(self.edge_layer, (x_offset, 0))
+
+        points = [(x + x_offset, y) for x, y in points.tolist()]
 
         # draw highlighted best overall path (green) on top
-        if getattr(aco.graph, "best_path", None):
-            pts = []
-            for vidx in aco.graph.best_path:
-                v = aco.graph.vertices[vidx]
-                pts.append(self._map_point(v.x, v.y, CENTER_WIDTH, SCREEN_HEIGHT))
+        if snapshot.best_path:
+            pts = [points[vidx] for vidx in snapshot.best_path]
             if len(pts) >= 2:
-                pygame.draw.lines(center_surf, BEST_COLOR + (255,), False, pts, 3)
+                pygame.draw.lines(target_surface, BEST_COLOR, False, pts, 3)
 
         # draw vertices on top
-        for v in aco.graph.vertices:
-            p = self._map_point(v.x, v.y, CENTER_WIDTH, SCREEN_HEIGHT)
-            pygame.draw.circle(center_surf, (230, 230, 230, 255), p, 3)
-
-        # blit to main surface
-        target_surface.blit(center_surf, (x_offset, 0))
\ No newline at end of file
+        for p in points:
+            pygame.draw.circle(target_surface, (230, 230, 230), p, 3)
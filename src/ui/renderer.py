@@ -1,6 +1,7 @@
 import pygame
 
-from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, TOP_PATH_COLORS, BEST_COLOR, SMALL_FONT
+from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SIDEBAR_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, TOP_PATH_COLORS, BEST_COLOR
+from src.ui.fonts import small_font
 
 
 class Renderer:
@@ -12,6 +13,8 @@ class Renderer:
     
     def draw(self):
         app = self.app
+        # the latest snapshot published by the engine's worker thread
+        snapshot = app.snapshot
         screen = app.screen
         screen.fill((10, 10, 10))
 
@@ -24,13 +27,13 @@ class Renderer:
         if getattr(app, "view_mode", "standard") == "top9":
             # Use combined width of previous side + main area
             full_width = LEFT_PANEL_WIDTH + CENTER_WIDTH
-            app.side_panels.draw_top9(screen, app.aco_engine, TOP_PATH_COLORS, full_width)
+            app.side_panels.draw_top9(screen, snapshot, TOP_PATH_COLORS, full_width)
         else:
-            app.side_panels.draw(screen, app.aco_engine, TOP_PATH_COLORS, BEST_COLOR)
-            app.main_panel.draw(screen, LEFT_PANEL_WIDTH, app.aco_engine)
+            app.side_panels.draw(screen, snapshot, TOP_PATH_COLORS, BEST_COLOR)
+            app.main_panel.draw(screen, LEFT_PANEL_WIDTH, snapshot)
 
-        iter_text = f"Iteration: {app.iteration_count}"
-        iter_surf = SMALL_FONT.render(iter_text, True, (220, 220, 220))
+        iter_text = f"Iteration: {snapshot.iteration}"
+        iter_surf = small_font().render(iter_text, True, (220, 220, 220))
         screen.blit(iter_surf, (LEFT_PANEL_WIDTH + CENTER_WIDTH - 80, 8))
 
         app.ui_manager.draw_ui(screen)
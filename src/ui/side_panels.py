@@ -1,7 +1,8 @@
 
 import pygame
 
-from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SCREEN_HEIGHT, SMALL_FONT
+from src.config import LEFT_PANEL_WIDTH, CENTER_WIDTH, SCREEN_HEIGHT
+from src.ui.fonts import small_font
 
 
 class SidePanels:
@@ -10,7 +11,32 @@ class SidePanels:
         self.src_h = SCREEN_HEIGHT - 20
         self.padding = 8
 
-    def _draw_path_on_surface(self, surface, aco, path, color, top_offset):
+        # panel surfaces (and the points mapped into them) are rebuilt only when the snapshot
+        # shows other tours: a new iteration, reset or edit - not on every frame
+        self._panels = {}
+        self._unit_key = None
+        self._unit_points = None
+
+    def _tours_key(self, snapshot):
+        return (snapshot.epoch, snapshot.iteration)
+
+    def _cached(self, name, key, build):
+        """Blittable (surface, position) list for name, rebuilt by build() when key changed."""
+        cached = self._panels.get(name)
+        if cached is None or cached[0] != key:
+            cached = self._panels[name] = (key, build())
+        return cached[1]
+
+    def _unit(self, snapshot):
+        """Vertex positions scaled to the unit square, shared by every panel of a snapshot."""
+        key = self._tours_key(snapshot)
+        if key != self._unit_key:
+            xs, ys = snapshot.canvas_points()
+            self._unit_points = (xs / max(1, self.src_w), ys / max(1, self.src_h))
+            self._unit_key = key
+        return self._unit_points
+
+    def _draw_path_on_surface(self, surface, snapshot, path, color, top_offset):
         """Draw path inside surface, leaving top_offset pixels free for label."""
         if not path or len(path) < 2:
             return
@@ -22,15 +48,12 @@ class SidePanels:
         draw_y0 = top_offset + pad
         draw_h = max(1, dst_h - draw_y0 - pad)
 
-        def map_point_local(x, y):
-            sx = pad + (x / max(1, self.src_w)) * (dst_w - 2 * pad)
-            sy = draw_y0 + (y / max(1, self.src_h)) * (draw_h)
-            return int(sx), int(sy)
-
-        pts = []
-        for vidx in path:
-            v = aco.graph.vertices[vidx]
-            pts.append(map_point_local(v.x, v.y))
+        path = list(path)
+        ux, uy = self._unit(snapshot)
+        pts = list(zip(
+            (pad + ux[path] * (dst_w - 2 * pad)).astype(int).tolist(),
+            (draw_y0 + uy[path] * draw_h).astype(int).tolist()
+        ))
 
         # draw segments and nodes (kept thin)
         for i in range(len(pts) - 1):
@@ -38,19 +61,22 @@ class SidePanels:
         for p in pts:
             pygame.draw.circle(surface, (240,240,240), p, 2)
 
-    def draw(self, target_surface, aco, top_path_colors, best_color):
+    def draw(self, target_surface, snapshot, top_path_colors, best_color):
         """Draw 4 stacked panels at x=0 (left column)."""
-        total_h = target_surface.get_height()
+        key = (self._tours_key(snapshot), target_surface.get_height())
+        panels = self._cached("standard", key, lambda: self._build_panels(snapshot, target_surface.get_height(), top_path_colors, best_color))
+        target_surface.blits(panels, doreturn=False)
+
+    def _build_panels(self, snapshot, total_h, top_path_colors, best_color):
+        panels = []
         panel_h = total_h // 4
 
         # label height (use font metrics + padding)
-        label_text_height = SMALL_FONT.get_height()
+        label_text_height = small_font().get_height()
         label_h = max(20, label_text_height + 8)
 
-        # fetch last iteration top paths
-        last_paths = getattr(aco.graph, "last_iteration_paths", []) or []
-        sorted_paths = sorted(last_paths, key=lambda pl: pl[1]) if last_paths else []
-        top_paths = sorted_paths[:3]
+        # last iteration's top paths, already sorted by the snapshot
+        top_paths = snapshot.top_paths[:3]
 
         # Panel 1: Best overall
         w1 = pygame.Surface((LEFT_PANEL_WIDTH, panel_h))
@@ -58,16 +84,16 @@ class SidePanels:
 
         # draw label background to avoid overlap
         pygame.draw.rect(w1, (20, 20, 30), pygame.Rect(0, 0, LEFT_PANEL_WIDTH, label_h))
-        if getattr(aco.graph, "best_path", None):
-            self._draw_path_on_surface(w1, aco, aco.graph.best_path, best_color, top_offset=label_h)
-            label = f"Best overall: {aco.graph.best_path_length:.2f}"
+        if snapshot.best_path:
+            self._draw_path_on_surface(w1, snapshot, snapshot.best_path, best_color, top_offset=label_h)
+            label = f"Best overall: {snapshot.best_length:.2f}"
         else:
             label = "Best overall: -"
         # render label centered vertically in label area
-        text_surf = SMALL_FONT.render(label, True, (220,220,220))
-        text_y = (label_h - SMALL_FONT.get_height()) // 2
+        text_surf = small_font().render(label, True, (220,220,220))
+        text_y = (label_h - small_font().get_height()) // 2
         w1.blit(text_surf, (8, text_y))
-        target_surface.blit(w1, (0, 0))
+        panels.append((w1, (0, 0)))
 
         # Panels 2..4: top 1..3 of current iteration
         for i in range(3):
@@ -81,23 +107,26 @@ class SidePanels:
             if i < len(top_paths):
                 path, length = top_paths[i]
                 color = top_path_colors[i % len(top_path_colors)]
-                self._draw_path_on_surface(wi, aco, path, color, top_offset=label_h)
+                self._draw_path_on_surface(wi, snapshot, path, color, top_offset=label_h)
                 label = f"Iter top {i+1}: {length:.2f}"
             else:
                 label = f"Iter top {i+1}: -"
 
-            text_surf = SMALL_FONT.render(label, True, (220,220,220))
-            text_y = (label_h - SMALL_FONT.get_height()) // 2
+            text_surf = small_font().render(label, True, (220,220,220))
+            text_y = (label_h - small_font().get_height()) // 2
             wi.blit(text_surf, (8, text_y))
-            target_surface.blit(wi, (0, y))
+            panels.append((wi, (0, y)))
+
+        return panels
 
-    def draw_top9(self, target_surface, aco, top_path_colors, total_width):
-        # Gather paths (prefer aco.last_iteration_paths; fallback graph)
-        last_paths = getattr(aco, "last_iteration_paths", None)
-        if last_paths is None:
-            last_paths = getattr(aco.graph, "last_iteration_paths", []) or []
-        sorted_paths = sorted(last_paths, key=lambda pl: pl[1]) if last_paths else []
-        top_paths = sorted_paths[:9]
+    def draw_top9(self, target_surface, snapshot, top_path_colors, total_width):
+        key = (self._tours_key(snapshot), total_width)
+        panels = self._cached("top9", key, lambda: self._build_top9(snapshot, total_width))
+        target_surface.blits(panels, doreturn=False)
+
+    def _build_top9(self, snapshot, total_width):
+        top_paths = snapshot.top_paths[:9]
+        panels = []
 
         # distinct colors for 9 paths
         palette = [
@@ -116,7 +145,7 @@ class SidePanels:
         rows = 3
         cell_w = total_width // cols
         cell_h = SCREEN_HEIGHT // rows
-        label_h = max(18, SMALL_FONT.get_height() + 6)
+        label_h = max(18, small_font().get_height() + 6)
 
         for idx in range(rows * cols):
             r = idx // cols
@@ -131,13 +160,15 @@ class SidePanels:
                 path, length = top_paths[idx]
                 color = palette[idx]
                 # draw path scaled to cell
-                self._draw_path_on_surface(panel, aco, path, color, top_offset=label_h)
+                self._draw_path_on_surface(panel, snapshot, path, color, top_offset=label_h)
                 text = f"{idx+1}. {length:.2f}"
             else:
                 text = f"{idx+1}. -"
 
             panel.blit(
-                SMALL_FONT.render(text, True, (230,230,230)),
-                (6, (label_h - SMALL_FONT.get_height()) // 2)
+                small_font().render(text, True, (230,230,230)),
+                (6, (label_h - small_font().get_height()) // 2)
             )
-            target_surface.blit(panel, (x, y))
\ No newline at end of file
+            panels.append((panel, (x, y)))
+
+        return panels
\ No newline at end of file